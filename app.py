@@ -1,12 +1,27 @@
 # v1.4 - 대동세무고 교육과정 관리 시스템
 import streamlit as st
 import pandas as pd
-import json
+import numpy as np
 from pathlib import Path
-import io
+import uuid
 
-from parser import parse_curriculum_file, parse_allocation_file, build_yearly_view, build_guidance_2027, parse_teacher_form
+from parser import (build_yearly_views, update_yearly_views, guidance_rows, view_years, guidance_years,
+                    build_guidance, default_template, parse_teacher_form, build_index)
 from storage import load_edits, save_edits
+from parse_cache import cached_parse
+from incremental import (reparse_curriculum, reparse_allocation, same_layout, subject_diff, teacher_diff,
+                         DIFF_COLUMNS)
+from snapshot import load_data, newest_data_file
+import timing
+from derived_cache import cached_table, new_version, edits_digest
+from demand import demand_supply, semester_view
+from assign import propose, deficits_from, dept_subjects, MIN_LOAD, MAX_LOAD
+from scenario import Scenario, ScenarioEngine, balance_table
+from curriculum_diff import subject_table, credit_table
+from export import export_sheets, write_workbook
+from search_index import SearchIndex
+from school import list_schools, load_profile, data_path, default_profile
+from district import load_summaries, summary_frame, aggregate, school_balance, signature
 
 st.set_page_config(
     page_title="대동세무고 교육과정 관리",
@@ -14,6 +29,8 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded",
 )
+# 성능 진단 켜기·기록은 세션마다 따로 (timing.bind)
+timing.bind(st.session_state.setdefault("timing_session", uuid.uuid4().hex))
 
 # ── CSS ──────────────────────────────────────────────────────────────────────
 st.markdown("""
@@ -49,14 +66,11 @@ div[data-testid="stMetricValue"] { color: #e2e8f0 !important; font-size: 1.6rem
 .stDataFrame { border: 1px solid #2a3448; border-radius: 8px; overflow: hidden; }
 iframe[title="st_aggrid"] { border-radius: 8px; }
 
-/* 탭 */
-div[data-testid="stTabs"] button {
-    color: #94a3b8 !important; font-size: 0.82rem;
-    border-bottom: 2px solid transparent !important;
-}
-div[data-testid="stTabs"] button[aria-selected="true"] {
-    color: #3b82f6 !important; border-bottom-color: #3b82f6 !important;
+/* 화면 선택 (탭 대신 쓰는 가로 라디오) */
+.st-key-view div[role="radiogroup"] {
+    gap: 4px 20px; border-bottom: 1px solid #2a3448; padding-bottom: 6px;
 }
+.st-key-view label p { color: #94a3b8 !important; font-size: 0.82rem; }
 
 /* 버튼 */
 .stButton > button {
@@ -105,12 +119,62 @@ if "edits" not in st.session_state:
     st.session_state.edits = load_edits()
 if "teacher_form" not in st.session_state:
     st.session_state.teacher_form = None
+if "data_version" not in st.session_state:
+    st.session_state.data_version = new_version()   # 교육과정·교사 데이터가 바뀔 때마다 새로 발급
+
+# ── 학교 선택 (data/schools/ 에 학교별 양식이 있을 때) ─────────────────────────
+SCHOOLS = list_schools()
+PROFILES = cached_table("school_profiles", "schools", tuple(SCHOOLS),
+                        lambda: {sid: load_profile(sid) for sid in SCHOOLS})
+school_id = st.session_state.get("school_id") or None
+if school_id not in PROFILES:
+    school_id = None
+profile = PROFILES.get(school_id)            # None 이면 기본 양식 (parser.py 상수)
+LAYOUT = profile or default_profile()
+YEARS_ALL = LAYOUT.school_years              # 교과배정표 학년도 (교사 수급·상치교과)
+VIEW_YEARS = view_years(YEARS_ALL)           # 학년도 선택 (운영 현황·편성표)
+GUIDE_YEARS = guidance_years(YEARS_ALL)      # 편성 가이드 대상 학년도
+if st.session_state.get("loaded_school") != school_id:
+    # 학교를 바꾸면 그 학교 데이터를 다시 불러옴
+    st.session_state.loaded_school = school_id
+    for _k in ("curriculum", "teachers", "dept_groups", "yearly_view", "guidance", "teacher_form"):
+        st.session_state[_k] = None
+    for _k in ("curriculum_index", "cross_proposal", "school_year", "cross_yr", "sheet_state", "last_diff",
+               "data_source"):
+        st.session_state.pop(_k, None)
+
+
+def scoped_edits():
+    """선택한 학교의 편집 데이터 — 기본 학교는 edits 전체, 그 밖의 학교는 edits["schools"][학교 id]"""
+    root = st.session_state.edits
+    return root.setdefault("schools", {}).setdefault(school_id, {}) if school_id else root
+
+
+DEFAULT_DATA = Path(__file__).parent / "data" / "curriculum_data.json"
+# 세션 키 → 데이터 파일 표 이름 (앞쪽 우선, guidance_2027 은 이전 형식)
+LAZY_TABLES = {"teachers": ("teachers",), "dept_groups": ("dept_groups",), "guidance": ("guidance", "guidance_2027")}
+
+
+def session_table(key):
+    """기본 데이터에서 아직 읽지 않은 표를 처음 쓸 때 읽음 — 스냅샷이면 그 표 블록만"""
+    if st.session_state.get(key) is None and st.session_state.get("data_source"):
+        names = LAZY_TABLES[key]
+        d = load_data(st.session_state.data_source, tables=list(names))
+        st.session_state[key] = next((d[n] for n in names if d.get(n) is not None), None)
+    value = st.session_state.get(key)
+    return value if value is not None else ([] if key == "guidance" else {})
+
 
 # ── 사이드바 ──────────────────────────────────────────────────────────────────
 with st.sidebar:
     st.markdown("## 📚 대동세무고\n### 교육과정 관리 시스템")
     st.markdown("---")
 
+    if SCHOOLS:
+        st.selectbox("🏫 학교", [""] + SCHOOLS, key="school_id",
+                     format_func=lambda sid: PROFILES[sid].name if sid else "기본 (대동세무고)")
+        st.markdown("---")
+
     st.markdown("#### 📂 데이터 불러오기")
     st.caption("엑셀 파일을 업로드하거나 저장된 데이터를 사용합니다.")
 
@@ -136,84 +200,118 @@ with st.sidebar:
 
     if st.button("🔄 데이터 파싱", type="primary", use_container_width=True):
         if curr_file and alloc_file:
-            with st.spinner("파싱 중..."):
+            with st.spinner("파싱 중..."), timing.stage("parse_button"):
                 try:
-                    curriculum = parse_curriculum_file(curr_file)
-                    teachers, dept_groups = parse_allocation_file(alloc_file)
-                    yearly_view = {
-                        str(sy): build_yearly_view(sy, curriculum)
-                        for sy in [2025, 2026, 2027]
-                    }
-                    guidance = build_guidance_2027(curriculum)
-
-                    # 교원양식이 있으면 우선 적용
-                    if teacher_file:
-                        tf = parse_teacher_form(teacher_file)
-                        # 교원양식 데이터로 기존 teachers 덮어쓰기
-                        for yr_k, t_list in tf.items():
-                            teachers[yr_k] = t_list
-                        st.session_state.teacher_form = tf
-
+                    # 시트 지문이 같은 시트는 이전 파싱 결과 재사용 (수정본 재업로드 시 바뀐 시트만 파싱)
+                    prev = st.session_state.get("sheet_state") or {}
+                    prev_c, prev_a = prev.get("curriculum"), prev.get("allocation")
+                    curriculum, c_state, c_years = reparse_curriculum(curr_file.getvalue(), prev_c, profile)
+                    raw_teachers, dept_groups, a_state, a_years = reparse_allocation(
+                        alloc_file.getvalue(), prev_a, profile)
+                    partial = (same_layout(prev_c, profile) and st.session_state.yearly_view is not None
+                               and st.session_state.curriculum is prev_c["data"])
+
+                    if partial and not c_years:
+                        index = st.session_state.get("curriculum_index") or build_index(curriculum, profile)
+                        yearly_view = st.session_state.yearly_view
+                        guidance = st.session_state.guidance
+                    elif partial:
+                        # 바뀐 입학년도(코호트) 항목만 다시 만들고 나머지 학년도 목록은 그대로
+                        index = build_index(curriculum, profile)
+                        yearly_view = {sy: list(items) for sy, items in st.session_state.yearly_view.items()}
+                        for ey in sorted(c_years):
+                            update_yearly_views(yearly_view, curriculum, ey, index)
+                        guidance = guidance_rows(GUIDE_YEARS[0], curriculum, index)
+                    else:
+                        index = build_index(curriculum, profile)
+                        yearly_view = build_yearly_views(VIEW_YEARS, curriculum, index)
+                        guidance = guidance_rows(GUIDE_YEARS[0], curriculum, index)
+
+                    # 교원양식이 있으면 우선 적용 (교과배정표 결과는 상태에 그대로 두고 복사본에 덮어쓰기)
+                    teachers = dict(raw_teachers)
+                    tf = cached_parse(parse_teacher_form, teacher_file) if teacher_file else None
+                    if tf:
+                        teachers.update(tf)
+                    st.session_state.teacher_form = tf
+
+                    if same_layout(prev_a, profile) and same_layout(prev_c, profile):
+                        diff = (subject_diff(prev_c["data"], curriculum, c_years)
+                                + teacher_diff(prev_a["data"], raw_teachers, a_years))
+                        st.session_state.last_diff = pd.DataFrame(diff, columns=DIFF_COLUMNS)
+                    else:
+                        st.session_state.last_diff = None
+
+                    changed = (not partial or c_years or a_years
+                               or teachers != st.session_state.teachers)
+                    st.session_state.sheet_state = {"curriculum": c_state, "allocation": a_state}
+                    st.session_state.data_source = None      # 업로드 데이터 — 나중에 읽을 표 없음
                     st.session_state.curriculum = curriculum
+                    st.session_state.curriculum_index = index
                     st.session_state.teachers = teachers
                     st.session_state.dept_groups = dept_groups
                     st.session_state.yearly_view = yearly_view
                     st.session_state.guidance = guidance
+                    if changed:
+                        st.session_state.data_version = new_version()
                     n_teachers = sum(len(v) for v in teachers.values())
                     st.success(f"✅ 파싱 완료!\n과목 {len(curriculum)}개 · 교사 {n_teachers}명")
+                    if partial:
+                        parts = [f"{y}입학" for y in sorted(c_years)] + [f"{y}학년도" for y in sorted(a_years)]
+                        st.caption(f"다시 파싱한 시트: {', '.join(parts) if parts else '없음 (변경 없음)'}")
                 except Exception as e:
                     st.error(f"파싱 오류: {e}")
         else:
             st.warning("두 파일 모두 업로드해주세요.")
 
-    # 기본 데이터 로드 (파일 없을 때)
-    default_path = Path(__file__).parent / "data" / "curriculum_data.json"
+    last_diff = st.session_state.get("last_diff")
+    if last_diff is not None:
+        with st.expander(f"📝 변경 내역 ({len(last_diff)}건)", expanded=not last_diff.empty):
+            if last_diff.empty:
+                st.caption("이전 업로드와 같은 내용입니다.")
+            else:
+                st.dataframe(last_diff, hide_index=True, use_container_width=True)
+
+    # 기본 데이터 로드 (파일 없을 때) — JSON·바이너리 스냅샷 중 최근에 만든 파일
+    default_path = data_path(school_id) if school_id else newest_data_file(DEFAULT_DATA)
     # 교원양식 단독 업로드 (교육과정 없이도)
     if teacher_file and st.session_state.curriculum is not None:
         if st.button("교원 정보만 갱신", use_container_width=True):
-            tf = parse_teacher_form(teacher_file)
-            st.session_state.teachers = {**st.session_state.teachers, **tf}
+            tf = cached_parse(parse_teacher_form, teacher_file)
+            st.session_state.teachers = {**session_table("teachers"), **tf}
             st.session_state.teacher_form = tf
+            st.session_state.data_version = new_version()
             st.success("✅ 교원 정보 갱신 완료!")
 
     if st.session_state.curriculum is None and default_path.exists():
-        with open(default_path, encoding="utf-8") as f:
-            d = json.load(f)
+        # 첫 화면(운영 현황)에 필요한 표만 읽고 교사·교과군·가이드는 처음 쓸 때 읽음 (session_table)
+        d = load_data(default_path, tables=["curriculum", "yearly_view"])
         st.session_state.curriculum = d.get("curriculum", [])
-        st.session_state.teachers = d.get("teachers", {})
-        st.session_state.dept_groups = d.get("dept_groups", {})
         st.session_state.yearly_view = d.get("yearly_view", {})
-        st.session_state.guidance = d.get("guidance_2027", [])
+        for _k in LAZY_TABLES:
+            st.session_state[_k] = None
+        st.session_state.data_source = str(default_path)
+        st.session_state.data_version = new_version()
 
     st.markdown("---")
     st.markdown("#### ⚙️ 학년도 선택")
     school_year = st.selectbox(
-        "", [2025, 2026, 2027], index=1,
+        "", VIEW_YEARS, index=min(1, len(VIEW_YEARS) - 1),
         format_func=lambda y: f"{y}학년도",
         key="school_year"
     )
 
+    export_box = None
     if st.session_state.curriculum:
         st.markdown("---")
         st.markdown("#### 💾 저장")
         if st.button("변경사항 저장", use_container_width=True):
-            save_edits(st.session_state.edits)
-            st.success("저장 완료!")
-
-        # CSV 내보내기
-        edits = st.session_state.edits
-        cross_rows = edits.get("cross_teaching", {}).get(str(school_year), [])
-        if cross_rows:
-            df_export = pd.DataFrame(cross_rows)
-            csv_buf = io.StringIO()
-            df_export.to_csv(csv_buf, index=False, encoding="utf-8-sig")
-            st.download_button(
-                "📥 상치교과 CSV 다운로드",
-                data=csv_buf.getvalue().encode("utf-8-sig"),
-                file_name=f"상치교과_{school_year}.csv",
-                mime="text/csv",
-                use_container_width=True,
-            )
+            if save_edits(st.session_state.edits):
+                st.success("저장 완료!")
+            else:
+                st.error("저장 실패 — 다른 사용자가 먼저 수정한 항목이 있을 수 있습니다. 새로고침 후 다시 저장하세요.")
+
+        # 엑셀 내보내기 — 자리만 잡아 두고 데이터 버전이 정해진 뒤(아래) 채움
+        export_box = st.container()
 
     st.markdown("---")
     st.caption("대동세무고등학교 교육과정 관리 시스템 v1.0")
@@ -236,31 +334,78 @@ if st.session_state.curriculum is None:
         - 📚 입학연도별 교육과정 편성표
         - 👩‍🏫 교사 수급 분석
         - 🔄 상치교과 관리 (수기 편집·저장)
-        - 🗺️ 2027학년도 편성 가이드
+        - 🗺️ 학년도별 편성 가이드 (고1 예측 포함)
         """)
     st.stop()
 
 # ── 메인 탭 ──────────────────────────────────────────────────────────────────
 SY = str(school_year)
 curriculum = st.session_state.curriculum
-teachers_all = st.session_state.teachers or {}
-dept_groups_all = st.session_state.dept_groups or {}
+curr_index = st.session_state.get("curriculum_index")
+if curr_index is None or curr_index.curriculum is not curriculum:
+    curr_index = st.session_state.curriculum_index = build_index(curriculum, profile)
 yearly_view_all = st.session_state.yearly_view or {}
-guidance = st.session_state.guidance or []
-edits = st.session_state.edits
+edits_root = st.session_state.edits
+edits = scoped_edits()      # 학교를 선택했으면 edits_root["schools"][학교 id]
+# 파생 표 캐시 키 — 데이터 버전 + 편집 내용 해시
+DATA_VER = f"{st.session_state.data_version}:{edits_digest(edits)}"
+
+# 화면 선택 — 선택된 화면만 계산·렌더링 (st.tabs 는 다섯 화면을 매번 모두 실행)
+VIEWS = {
+    "📅 연도별 운영 현황": "운영현황",
+    "📚 교육과정 편성표": "편성표",
+    "👩‍🏫 교사 수급 분석": "교사수급",
+    "🔄 상치교과 관리": "상치교과",
+    "🗺️ 편성 가이드": "편성가이드",
+}
+if SCHOOLS:
+    VIEWS["🏫 교육지원청 집계"] = "지원청집계"
+VIEW_1, VIEW_2, VIEW_3, VIEW_4, VIEW_5 = list(VIEWS)[:5]
+VIEW_DISTRICT = "🏫 교육지원청 집계"
+
+# 보이지 않는 화면의 위젯 값은 Streamlit 이 지우므로 다시 넣어 화면을 오가도 필터 유지
+for _k in ("yf_grade", "yf_area", "yf_search", "curr_search", "dept_sel", "t_search",
+           "cross_yr", "guide_target", "guide_grade"):
+    if _k in st.session_state:
+        st.session_state[_k] = st.session_state[_k]
+st.session_state.setdefault("cross_yr", YEARS_ALL[min(1, len(YEARS_ALL) - 1)])
+
+
+def dept_overrides():
+    """과목 → 교과(과) 지정 표 (교사 수급 화면에서 편집, 과목명 키워드 추정보다 우선)"""
+    return {r["과목명"]: r["교과(과)"] for r in edits.get("dept_overrides", [])
+            if r.get("과목명") and r.get("교과(과)")}
+
+
+def get_demand_supply():
+    """전 학년도 교과별 수요·공급 (교사 수급·상치교과 화면 공용)"""
+    return cached_table("demand_supply", DATA_VER, (),
+                        lambda: demand_supply(curriculum, session_table("teachers"), YEARS_ALL,
+                                              scenarios={"현재": LAYOUT.class_counts},
+                                              overrides=dept_overrides(), index=curr_index))
 
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📅 연도별 운영 현황",
-    "📚 교육과정 편성표",
-    "👩‍🏫 교사 수급 분석",
-    "🔄 상치교과 관리",
-    "🗺️ 2027 편성 가이드",
-])
+
+def get_search_index():
+    """과목명·교과군·교사명 검색 색인 — 데이터가 바뀔 때만 새로 만듦 (편집·필터와 무관)"""
+    return cached_table("search_index", st.session_state.data_version, (),
+                        lambda: SearchIndex.build(curriculum, session_table("teachers")))
+
+
+def get_scenario_engine():
+    """What-if 시나리오 기준 계산 — 시나리오 편집으로는 다시 만들지 않도록 교과 지정만 키에 포함"""
+    overrides = dept_overrides()
+    return cached_table("scenario_engine", st.session_state.data_version, (edits_digest(overrides),),
+                        lambda: ScenarioEngine(curriculum, session_table("teachers"), YEARS_ALL, LAYOUT.class_counts,
+                                               overrides=overrides, index=curr_index))
+
+
+view = st.radio("화면", list(VIEWS), horizontal=True, key="view", label_visibility="collapsed")
+view_t0 = timing.mark()
 
 # ════════════════════════════════════════════════════════════════
 # TAB 1: 연도별 운영 현황
 # ════════════════════════════════════════════════════════════════
-with tab1:
+if view == VIEW_1:
     st.markdown(f"## {school_year}학년도 운영 현황")
     items = yearly_view_all.get(SY, [])
 
@@ -288,7 +433,7 @@ with tab1:
         with col_f2:
             area_filter = st.selectbox("교과 유형", ["전체", "보통교과", "전문교과"], key="yf_area")
         with col_f3:
-            search = st.text_input("과목명 검색", placeholder="예: 국어, 세무 …", key="yf_search")
+            search = st.text_input("과목명 검색", placeholder="예: 국어, 세무, ㄱㅇ …", key="yf_search")
 
         filtered = items
         if grade_filter != "전체":
@@ -298,9 +443,10 @@ with tab1:
         elif area_filter == "전문교과":
             filtered = [i for i in filtered if any(x in i["area"] for x in ["전문", "전공", "고시"])]
         if search:
-            filtered = [i for i in filtered if search in i["name"] or search in (i["group"] or "")]
+            hits = get_search_index().match(search, ("subject", "group"))
+            filtered = [i for i in filtered if i["name"] in hits or i["group"] in hits]
 
-        TRACKS = ["세무회계", "관세무역", "세무행정"]
+        TRACKS = LAYOUT.tracks
 
         for grade in ["1학년", "2학년", "3학년"]:
             grade_items = [i for i in filtered if i["grade"] == grade]
@@ -335,44 +481,32 @@ with tab1:
 # ════════════════════════════════════════════════════════════════
 # TAB 2: 교육과정 편성표
 # ════════════════════════════════════════════════════════════════
-with tab2:
+if view == VIEW_2:
     st.markdown("## 교육과정 편성표")
-    st.caption("""
-    **반 구성**: 1학년 8반(공통) | 2·3학년 세무회계 3반 + 관세무역 3반 + 세무행정 2반 = 8반  
+    counts = LAYOUT.class_counts
+    st.caption(f"""
+    **반 구성**: 1학년 {counts.get(("1학년", "공통"), 0)}반(공통) | 2·3학년 {" + ".join(f"{tr} {counts.get(('2학년', tr), 0)}반" for tr in LAYOUT.tracks)} = {sum(counts.get(("2학년", tr), 0) for tr in LAYOUT.tracks)}반  
     전 학과 동일 과목은 시수 1개만 표시 / 학과별로 다른 과목은 학과 표시
     """)
 
     col_f1, col_f2 = st.columns([3, 4])
     with col_f1:
         entry_filter = st.multiselect(
-            "입학년도", [2024, 2025, 2026],
-            default=[2024, 2025, 2026],
-            format_func=lambda y: f"{y}입학 (현 고{2026-y+1})"
+            "입학년도", LAYOUT.entry_years,
+            default=LAYOUT.entry_years,
+            format_func=lambda y: f"{y}입학 (현 고{max(LAYOUT.entry_years)-y+1})"
         )
     with col_f2:
-        curr_search = st.text_input("과목명/교과군 검색", placeholder="국어, 세무, 회계 …", key="curr_search")
+        curr_search = st.text_input("과목명/교과군 검색", placeholder="국어, 세무, ㅎㄱ …", key="curr_search")
 
-    filtered_curr = [s for s in curriculum if s["entry_year"] in entry_filter]
-    if curr_search:
-        filtered_curr = [s for s in filtered_curr if curr_search in s["name"] or curr_search in (s["group"] or "")]
+    TRACK_NAMES = LAYOUT.tracks
 
-    # 반 수 (학과별)
-    TRACK_COUNTS = {"세무회계": 3, "관세무역": 3, "세무행정": 2}  # 2·3학년 공통
-    G1_COUNT = 8  # 1학년 반 수
-
-    def get_track_info(sch, grade):
+    def get_track_info(sid, grade):
         """
         반환: {track: (시수, 학기)} 또는 None(해당 학년 없음)
         시수는 1반당 시수 (단위배당표 값 그대로)
         """
-        tracks = ["세무회계", "관세무역", "세무행정"]
-        result = {}
-        for tr in tracks:
-            s1 = sch.get(f"{grade}|{tr}|1학기")
-            s2 = sch.get(f"{grade}|{tr}|2학기")
-            if s1 or s2:
-                result[tr] = (s1 or 0, s2 or 0)
-        return result if result else None
+        return curr_index.track_info(sid, grade, TRACK_NAMES)
 
     def format_track_cell(track_info):
         """
@@ -380,22 +514,15 @@ with tab2:
         과별 다름  → "세무·행정: 3/1학기, 관세: -" 형식
         """
         if not track_info:
-            return "-", 0
+            return "-"
 
-        tracks = ["세무회계", "관세무역", "세무행정"]
-        counts = TRACK_COUNTS
+        tracks = TRACK_NAMES
 
         # 모든 과가 있고 값이 동일한지 확인
         all_s1 = set(v[0] for v in track_info.values())
         all_s2 = set(v[1] for v in track_info.values())
         all_tracks_present = all(tr in track_info for tr in tracks)
 
-        # 전체 필요 시수 계산
-        total = sum(
-            (v[0] + v[1]) * counts.get(tr, 0)
-            for tr, v in track_info.items()
-        )
-
         if all_tracks_present and len(all_s1) == 1 and len(all_s2) == 1:
             # 전 과 동일
             s1v = list(all_s1)[0]
@@ -406,7 +533,7 @@ with tab2:
                 label = f"{s1v} (1학기)"
             else:
                 label = f"{s2v} (2학기)"
-            return label, total
+            return label
         else:
             # 과별로 다름
             parts = []
@@ -415,59 +542,67 @@ with tab2:
                 if tr in track_info:
                     s1v, s2v = track_info[tr]
                     if s1v and s2v:
-                        parts.append(f"{abbr[tr]}:{s1v}(1·2)")
+                        parts.append(f"{abbr.get(tr, tr[:2])}:{s1v}(1·2)")
                     elif s1v:
-                        parts.append(f"{abbr[tr]}:{s1v}(1)")
+                        parts.append(f"{abbr.get(tr, tr[:2])}:{s1v}(1)")
                     elif s2v:
-                        parts.append(f"{abbr[tr]}:{s2v}(2)")
+                        parts.append(f"{abbr.get(tr, tr[:2])}:{s2v}(2)")
                 # 없는 과는 표시 안 함
-            return " / ".join(parts), total
-
-    rows = []
-    for s in filtered_curr:
-        sch = s["schedule"]
-
-        # 1학년
-        g1_s1 = sch.get("1학년|공통|1학기", "")
-        g1_s2 = sch.get("1학년|공통|2학기", "")
-        if g1_s1 and g1_s2:
-            g1_label = f"{g1_s1} (1·2학기)"
-            g1_total = (g1_s1 + g1_s2) * G1_COUNT
-        elif g1_s1:
-            g1_label = f"{g1_s1} (1학기)"
-            g1_total = g1_s1 * G1_COUNT
-        elif g1_s2:
-            g1_label = f"{g1_s2} (2학기)"
-            g1_total = g1_s2 * G1_COUNT
-        else:
-            g1_label = "-"
-            g1_total = 0
-
-        g2_info = get_track_info(sch, "2학년")
-        g3_info = get_track_info(sch, "3학년")
-        g2_label, g2_total = format_track_cell(g2_info)
-        g3_label, g3_total = format_track_cell(g3_info)
-
-        grand_total = g1_total + g2_total + g3_total
-
-        rows.append({
-            "입학": str(s["entry_year"]),
-            "교과군": s["group"] or "-",
-            "과목명": s["name"],
-            "기준학점": s["std_credits"],
-            "운영학점": s["op_credits"],
-            "1학년 (8반)": g1_label,
-            "2학년 (8반)": g2_label,
-            "2학년 전체시수": g2_total if g2_total else "",
-            "3학년 (8반)": g3_label,
-            "3학년 전체시수": g3_total if g3_total else "",
-        })
-
-    if rows:
-        df_curr = pd.DataFrame(rows)
+            return " / ".join(parts)
+
+    def build_curr_table(entry_years, search):
+        """입학년도·검색어 → 편성표 DataFrame"""
+        filtered_ids = np.flatnonzero(curr_index.entry_mask(entry_years)).tolist()
+        if search:
+            hits = get_search_index().match(search, ("subject", "group"))
+            filtered_ids = [sid for sid in filtered_ids
+                            if curriculum[sid]["name"] in hits or curriculum[sid]["group"] in hits]
+
+        # 과목 × 학년 전체시수 (1반당 학점 × 반 수) — 배열 연산으로 한 번에
+        grade_hours = curr_index.grade_hours(LAYOUT.class_counts)
+
+        n_cls = {g: sum(n for (gg, _), n in LAYOUT.class_counts.items() if gg == g) for g in ("1학년", "2학년", "3학년")}
+        rows = []
+        for sid in filtered_ids:
+            s = curriculum[sid]
+
+            # 1학년
+            g1_s1 = curr_index.credit(sid, "1학년", "공통", "1학기") or ""
+            g1_s2 = curr_index.credit(sid, "1학년", "공통", "2학기") or ""
+            if g1_s1 and g1_s2:
+                g1_label = f"{g1_s1} (1·2학기)"
+            elif g1_s1:
+                g1_label = f"{g1_s1} (1학기)"
+            elif g1_s2:
+                g1_label = f"{g1_s2} (2학기)"
+            else:
+                g1_label = "-"
+
+            g2_label = format_track_cell(get_track_info(sid, "2학년"))
+            g3_label = format_track_cell(get_track_info(sid, "3학년"))
+            g1_total, g2_total, g3_total = grade_hours[sid].tolist()
+
+            rows.append({
+                "입학": str(s["entry_year"]),
+                "교과군": s["group"] or "-",
+                "과목명": s["name"],
+                "기준학점": s["std_credits"],
+                "운영학점": s["op_credits"],
+                f"1학년 ({n_cls['1학년']}반)": g1_label,
+                f"2학년 ({n_cls['2학년']}반)": g2_label,
+                "2학년 전체시수": g2_total if g2_total else "",
+                f"3학년 ({n_cls['3학년']}반)": g3_label,
+                "3학년 전체시수": g3_total if g3_total else "",
+            })
+        return pd.DataFrame(rows)
+
+    df_curr = cached_table("curr_rows", DATA_VER, (tuple(sorted(entry_filter)), curr_search),
+                           lambda: build_curr_table(entry_filter, curr_search))
+
+    if not df_curr.empty:
         st.dataframe(df_curr, use_container_width=True, hide_index=True)
         st.caption(
-            f"총 {len(rows)}개 과목 | "
+            f"총 {len(df_curr)}개 과목 | "
             "**1반당 시수** 표시 + 전체시수(반수×시수) | "
             "전 학과 동일 과목은 시수만, 학과별 다른 과목은 학과명 표시"
         )
@@ -477,11 +612,11 @@ with tab2:
 # ════════════════════════════════════════════════════════════════
 # TAB 3: 교사 수급 분석
 # ════════════════════════════════════════════════════════════════
-with tab3:
+if view == VIEW_3:
     st.markdown(f"## {school_year}학년도 교사 수급 분석")
 
-    teachers = teachers_all.get(SY, [])
-    dept_groups = dept_groups_all.get(SY, [])
+    teachers = session_table("teachers").get(SY, [])
+    dept_groups = session_table("dept_groups").get(SY, [])
 
     real_t = [t for t in teachers if not t["is_temp"] and t["total_credits"] > 0]
     temp_t = [t for t in teachers if t["is_temp"] and t["total_credits"] > 0]
@@ -523,64 +658,167 @@ with tab3:
 
     with col_left:
         st.markdown("### 📊 교과별 현황")
-        dept_map = {}
-        for t in teachers:
-            if t["total_credits"] > 0:
-                d = t["dept"]
-                if d not in dept_map:
-                    dept_map[d] = {"real": [], "temp": [], "total_load": 0}
-                if t["is_temp"]:
-                    dept_map[d]["temp"].append(t)
-                else:
-                    dept_map[d]["real"].append(t)
-                dept_map[d]["total_load"] += t["total_credits"]
 
-        dept_rows = []
-        for dept, info in dept_map.items():
-            if not dept or dept == "미분류":
-                continue
-            avg2 = round(info["total_load"] / len(info["real"])) if info["real"] else 0
-            status = "⚠️ 초과" if avg2 > 18 else ("✅ 적정" if avg2 >= 14 else "🔶 부족")
-            dept_rows.append({
-                "교과(과)": dept,
-                "정규": len(info["real"]),
-                "기간제": len(info["temp"]),
-                "총 시수": info["total_load"],
-                "인당 평균": avg2,
-                "상태": status,
-            })
-        if dept_rows:
-            st.dataframe(pd.DataFrame(dept_rows), use_container_width=True, hide_index=True)
+        def build_dept_table():
+            """교과별 정규·기간제 인원과 시수 합계"""
+            dept_map = {}
+            for t in teachers:
+                if t["total_credits"] > 0:
+                    d = t["dept"]
+                    if d not in dept_map:
+                        dept_map[d] = {"real": [], "temp": [], "total_load": 0}
+                    if t["is_temp"]:
+                        dept_map[d]["temp"].append(t)
+                    else:
+                        dept_map[d]["real"].append(t)
+                    dept_map[d]["total_load"] += t["total_credits"]
+
+            dept_rows = []
+            for dept, info in dept_map.items():
+                if not dept or dept == "미분류":
+                    continue
+                avg2 = round(info["total_load"] / len(info["real"])) if info["real"] else 0
+                status = "⚠️ 초과" if avg2 > 18 else ("✅ 적정" if avg2 >= 14 else "🔶 부족")
+                dept_rows.append({
+                    "교과(과)": dept,
+                    "정규": len(info["real"]),
+                    "기간제": len(info["temp"]),
+                    "총 시수": info["total_load"],
+                    "인당 평균": avg2,
+                    "상태": status,
+                })
+            return pd.DataFrame(dept_rows)
+
+        df_dept = cached_table("dept_rows", DATA_VER, (SY,), build_dept_table)
+        if not df_dept.empty:
+            st.dataframe(df_dept, use_container_width=True, hide_index=True)
 
     with col_right:
         st.markdown("### 👩‍🏫 교사별 시수")
         dept_options = ["전체"] + sorted(set(t["dept"] for t in teachers if t["dept"] and t["dept"] != "미분류"))
         dept_sel = st.selectbox("교과 필터", dept_options, key="dept_sel")
-        teacher_search = st.text_input("교사명 검색", placeholder="이름 입력", key="t_search")
-
-        t_filtered = [t for t in teachers if t["total_credits"] > 0]
-        if dept_sel != "전체":
-            t_filtered = [t for t in t_filtered if t["dept"] == dept_sel]
-        if teacher_search:
-            t_filtered = [t for t in t_filtered if teacher_search in t["name"]]
-
-        t_rows = []
-        for t in t_filtered:
-            load = t["total_credits"]
-            status = "⚠️ 초과" if load > 18 else ("✅ 적정" if load >= 14 else "🔶 부족")
-            t_rows.append({
-                "교사명": t["name"] + (" (기간제)" if t["is_temp"] else ""),
-                "교과(과)": t["dept"],
-                "시수": load,
-                "상태": status,
-            })
-        if t_rows:
-            st.dataframe(pd.DataFrame(t_rows), use_container_width=True, hide_index=True)
+        teacher_search = st.text_input("교사명 검색", placeholder="이름 또는 초성", key="t_search")
+
+        def build_teacher_table(dept_sel, teacher_search):
+            """교과·이름 필터 → 교사별 시수 표"""
+            t_filtered = [t for t in teachers if t["total_credits"] > 0]
+            if dept_sel != "전체":
+                t_filtered = [t for t in t_filtered if t["dept"] == dept_sel]
+            if teacher_search:
+                hits = get_search_index().match(teacher_search, ("teacher",))
+                t_filtered = [t for t in t_filtered if t["name"] in hits]
+
+            t_rows = []
+            for t in t_filtered:
+                load = t["total_credits"]
+                status = "⚠️ 초과" if load > 18 else ("✅ 적정" if load >= 14 else "🔶 부족")
+                t_rows.append({
+                    "교사명": t["name"] + (" (기간제)" if t["is_temp"] else ""),
+                    "교과(과)": t["dept"],
+                    "시수": load,
+                    "상태": status,
+                })
+            return pd.DataFrame(t_rows)
+
+        df_t = cached_table("teacher_rows", DATA_VER, (SY, dept_sel, teacher_search),
+                            lambda: build_teacher_table(dept_sel, teacher_search))
+        if not df_t.empty:
+            st.dataframe(df_t, use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+    st.markdown("### 📐 교육과정 기준 수요 vs 공급")
+    st.caption("수요 = 해당 학년도 재학 코호트의 편성 학점 × 반 수 (주당 시수) · "
+               "공급 = 교사 시수 합계 (상치 시수는 상치 교과로) · 과부족 = 공급 − 수요")
+
+    df_ds = semester_view(get_demand_supply(), school_year)
+    if not df_ds.empty:
+        st.dataframe(df_ds, use_container_width=True, hide_index=True)
+        short = df_ds[df_ds["상태"] == "🔶 부족"]["교과(과)"].tolist()
+        if short:
+            st.warning(f"시수 부족 교과: {', '.join(short)}")
+
+    with st.expander("과목 → 교과(과) 지정"):
+        st.caption("과목명 키워드로 교과를 잘못 추정한 과목(예: '기타')을 직접 지정합니다. 저장 버튼으로 기록됩니다.")
+        ov_df = pd.DataFrame(edits.get("dept_overrides") or [{"과목명": "", "교과(과)": ""}])
+        ov_edited = st.data_editor(
+            ov_df, use_container_width=True, num_rows="dynamic",
+            column_config={
+                "과목명": st.column_config.SelectboxColumn(
+                    "과목명", options=sorted({s["name"] for s in curriculum})),
+                "교과(과)": st.column_config.SelectboxColumn(
+                    "교과(과)", options=["국어과", "수학과", "영어과", "사회과", "과학과", "예체능과", "상업과", "기타"]),
+            },
+            key="dept_override_editor",
+        )
+        ov_rows = [r for r in ov_edited.to_dict("records") if r.get("과목명")]
+        if ov_rows != edits.get("dept_overrides", []):
+            edits["dept_overrides"] = ov_rows
+            st.session_state.edits = edits_root
+
+    st.markdown("---")
+    st.markdown("### 🧪 What-if 시나리오")
+    st.caption("반 수·과목 학기·교사를 바꿨을 때의 과부족을 기준과 나란히 비교합니다. "
+               "시나리오는 바뀐 부분만 저장되며 저장 버튼으로 기록됩니다.")
+
+    saved = edits.get("scenarios", [])
+    with st.expander("시나리오 추가"):
+        sc_name = st.text_input("이름", key="sc_name", placeholder="예: 관세무역 2반 축소")
+        st.markdown("**반 수**")
+        sc_cols = st.columns(len(LAYOUT.class_counts))
+        sc_classes = {}
+        for col, ((g, tr), n) in zip(sc_cols, LAYOUT.class_counts.items()):
+            v = col.number_input(f"{g} {tr}", min_value=0, max_value=20, value=n, key=f"sc_cls_{g}_{tr}")
+            if v != n:
+                sc_classes[(g, tr)] = v
+        st.markdown("**과목 학기 이동**")
+        m1, m2 = st.columns([3, 1])
+        sc_move = m1.multiselect("과목", sorted({s["name"] for s in curriculum}), key="sc_move")
+        sc_dir = m2.selectbox("방향", ["1학기 → 2학기", "2학기 → 1학기"], key="sc_dir")
+        st.markdown(f"**교사 추가** ({school_year}학년도)")
+        a1, a2, a3 = st.columns(3)
+        sc_dept = a1.selectbox("교과(과)", ["", "국어과", "수학과", "영어과", "사회과", "과학과", "예체능과", "상업과"],
+                               key="sc_dept")
+        sc_n = a2.number_input("인원", min_value=0, max_value=10, value=1, key="sc_n")
+        sc_load = a3.number_input("1인 시수", min_value=0, max_value=24, value=16, key="sc_load")
+
+        if st.button("시나리오 저장", key="sc_add", disabled=not sc_name):
+            sc = Scenario(sc_name, sc_classes)
+            src, dst = sc_dir.split(" → ")
+            for name in sc_move:
+                sc.move_semester(curriculum, name, src, dst)
+            if sc_dept:
+                for i in range(sc_n):
+                    sc.add_teacher(school_year, {"name": f"{sc_name} 신규{i + 1}", "dept": sc_dept,
+                                                 "total_credits": sc_load})
+            edits["scenarios"] = [d for d in saved if d["name"] != sc_name] + [sc.to_dict()]
+            st.session_state.edits = edits_root
+            st.rerun()
+
+    if saved:
+        sc_names = [d["name"] for d in saved]
+        pick = st.multiselect("비교할 시나리오", sc_names, default=sc_names, key="sc_pick")
+        scenarios = [Scenario.from_dict(d) for d in saved if d["name"] in pick]
+        engine = get_scenario_engine()
+        with timing.stage("scenario_compare", scenarios=len(scenarios)):
+            sc_df = balance_table(engine.compare(scenarios), school_year)
+        if not sc_df.empty:
+            st.caption("값 = 학기 중 가장 부족한 과부족 (공급 − 수요)")
+            st.dataframe(sc_df, use_container_width=True, hide_index=True)
+
+        d1, d2 = st.columns([3, 1])
+        detail = d1.selectbox("과목별 시수 변화", sc_names, key="sc_detail")
+        if d2.button("시나리오 삭제", key="sc_del"):
+            edits["scenarios"] = [d for d in saved if d["name"] != detail]
+            st.session_state.edits = edits_root
+            st.rerun()
+        changes = engine.subject_changes(Scenario.from_dict(next(d for d in saved if d["name"] == detail)))
+        if not changes.empty:
+            st.dataframe(changes[changes["학년도"] == school_year], use_container_width=True, hide_index=True)
 
 # ════════════════════════════════════════════════════════════════
 # TAB 4: 상치교과 관리
 # ════════════════════════════════════════════════════════════════
-with tab4:
+if view == VIEW_4:
     st.markdown("## 🔄 상치교과 관리")
     st.caption("수기로 편집하고 저장합니다. 사이드바의 저장 버튼으로 JSON 파일에 기록됩니다.")
 
@@ -590,8 +828,8 @@ with tab4:
     else:
         st.info("💡 교원정보 양식(xlsx)을 사이드바에서 업로드하면 상치교과가 자동으로 채워집니다.")
 
-    cross_yr = st.selectbox("학년도", [2025, 2026, 2027, 2028],
-                             index=1, format_func=lambda y: f"{y}학년도", key="cross_yr")
+    cross_yr = st.selectbox("학년도", YEARS_ALL,
+                             format_func=lambda y: f"{y}학년도", key="cross_yr")
     cross_key = str(cross_yr)
 
     # 초기화: 교과배정표 notes에서 자동 생성
@@ -638,6 +876,32 @@ with tab4:
 """, unsafe_allow_html=True)
         st.markdown("---")
 
+    with st.expander("🤖 상치교과 자동 제안"):
+        st.caption(f"시수 {MIN_LOAD}시간 미만 교사가 시수 부족 교과를 맡도록 배정안을 만듭니다 "
+                   f"(배정 후 {MAX_LOAD}시간 초과 없음 · 교원양식의 상치교과·주요과목 기준).")
+        if st.button("배정안 계산", key="cross_propose"):
+            defs = deficits_from(get_demand_supply(), cross_yr)
+            subs = dept_subjects(curriculum, curr_index, cross_yr, dept_overrides())
+            st.session_state.cross_proposal = (cross_key, *propose(session_table("teachers").get(cross_key, []), defs, subs))
+
+        proposal = st.session_state.get("cross_proposal")
+        if proposal and proposal[0] == cross_key:
+            _, prop_rows, prop_sum = proposal
+            st.markdown(f"부족 {prop_sum['deficit']}시수 중 **{prop_sum['covered']}시수** 배정 · "
+                        f"남은 부족 {prop_sum['remaining']}시수 · 후보 교사 {prop_sum['donors']}명"
+                        + ("" if prop_sum["complete"] else " · ⏱️ 시간 제한으로 일부만 계산"))
+            if prop_rows:
+                st.dataframe(pd.DataFrame(prop_rows), use_container_width=True, hide_index=True)
+                if st.button("배정표에 추가", key="cross_apply"):
+                    kept = [r for r in edits["cross_teaching"][cross_key] if r.get("교사명")]
+                    edits["cross_teaching"][cross_key] = kept + prop_rows
+                    st.session_state.edits = edits_root
+                    st.session_state.cross_editor_rev = st.session_state.get("cross_editor_rev", 0) + 1
+                    del st.session_state.cross_proposal
+                    st.rerun()
+            else:
+                st.info("배정할 수 있는 후보가 없습니다.")
+
     st.info("✏️ 아래 표를 직접 클릭해서 편집할 수 있습니다.")
 
     cross_df = pd.DataFrame(edits["cross_teaching"][cross_key])
@@ -657,10 +921,10 @@ with tab4:
             "시수": st.column_config.NumberColumn("시수", width="small", min_value=0, max_value=20),
             "메모": st.column_config.TextColumn("메모"),
         },
-        key=f"cross_editor_{cross_key}"
+        key=f"cross_editor_{cross_key}_{st.session_state.get('cross_editor_rev', 0)}"
     )
     edits["cross_teaching"][cross_key] = edited_df.to_dict("records")
-    st.session_state.edits = edits
+    st.session_state.edits = edits_root
 
     st.markdown("---")
     st.markdown("### 📝 교원 배치 메모")
@@ -674,24 +938,42 @@ with tab4:
         key=f"memo_{cross_key}"
     )
     edits["teacher_memos"][cross_key] = memo
-    st.session_state.edits = edits
+    st.session_state.edits = edits_root
 
 # ════════════════════════════════════════════════════════════════
-# TAB 5: 2027 편성 가이드
+# TAB 5: 편성 가이드
 # ════════════════════════════════════════════════════════════════
-with tab5:
-    st.markdown("## 🗺️ 2027학년도 교육과정 편성 가이드")
-    st.info("📌 2027학년도 구성: **2025입학 고3** + **2026입학 고2** + **2027입학 고1(신규 편성 필요)**")
+if view == VIEW_5:
+    col_t, col_tpl = st.columns(2)
+    with col_t:
+        target = st.selectbox("편성 학년도", GUIDE_YEARS, index=0,
+                              format_func=lambda y: f"{y}학년도", key="guide_target")
+    cohorts = sorted(set(curr_index.entry_years.tolist()))
+    tpl_default = default_template(target, curriculum)
+    with col_tpl:
+        template = st.selectbox(
+            "고1 예측 기준 코호트", cohorts,
+            index=cohorts.index(tpl_default) if tpl_default in cohorts else 0,
+            format_func=lambda y: f"{y}입학 구조", key=f"guide_tpl_{target}",
+            help="신입생 교육과정이 아직 없을 때 1학년 편성을 가져올 기존 코호트"
+        )
+    guide_df = cached_table("guidance", DATA_VER, (target, template),
+                            lambda: build_guidance(target, curriculum, new_cohort_template=template, index=curr_index))
+    has_g1 = bool((curr_index.entry_years == target).any())
+
+    st.markdown(f"## 🗺️ {target}학년도 교육과정 편성 가이드")
+    g1_note = "편성 완료" if has_g1 else f"신규 편성 필요 · {template}입학 구조로 예측"
+    st.info(f"📌 {target}학년도 구성: **{target-2}입학 고3** + **{target-1}입학 고2** + **{target}입학 고1({g1_note})**")
 
-    g3_subs = list(set(g["name"] for g in guidance if g["grade"] == "3학년"))
-    g2_subs = list(set(g["name"] for g in guidance if g["grade"] == "2학년"))
-    groups = list(set(g["group"] for g in guidance))
+    n_subs = guide_df.groupby("grade")["name"].nunique()
+    groups = guide_df.loc[guide_df["grade"] != "1학년", "group"].nunique()
 
     c1, c2, c3, c4 = st.columns(4)
-    c1.metric("고3 예상 과목", f"{len(g3_subs)}개", help="2025입학 기준")
-    c2.metric("고2 예상 과목", f"{len(g2_subs)}개", help="2026입학 기준")
-    c3.metric("교과군", f"{len(groups)}종")
-    c4.metric("고1 신규 편성", "필요", help="2027입학 교육과정")
+    c1.metric("고3 예상 과목", f"{n_subs.get('3학년', 0)}개", help=f"{target-2}입학 기준")
+    c2.metric("고2 예상 과목", f"{n_subs.get('2학년', 0)}개", help=f"{target-1}입학 기준")
+    c3.metric("교과군", f"{groups}종")
+    c4.metric("고1 과목" if has_g1 else "고1 예측 과목", f"{n_subs.get('1학년', 0)}개",
+              help=f"{target}입학 교육과정" if has_g1 else f"{template}입학 1학년 편성 기준 예측")
 
     st.markdown("---")
     col_cl, col_note = st.columns(2)
@@ -700,10 +982,10 @@ with tab5:
         st.markdown("### ✅ 편성 체크리스트")
         if "checklist" not in edits:
             edits["checklist"] = [
-                {"done": True,  "text": "2025입학 3학년 교육과정 확정"},
-                {"done": True,  "text": "2026입학 2학년 교육과정 확정"},
-                {"done": False, "text": "2027입학 1학년 교육과정 신규 편성"},
-                {"done": False, "text": "2027학년도 교사 수급 계획 수립"},
+                {"done": True,  "text": f"{target-2}입학 3학년 교육과정 확정"},
+                {"done": True,  "text": f"{target-1}입학 2학년 교육과정 확정"},
+                {"done": False, "text": f"{target}입학 1학년 교육과정 신규 편성"},
+                {"done": False, "text": f"{target}학년도 교사 수급 계획 수립"},
                 {"done": False, "text": "기간제·강사 필요 인원 파악"},
                 {"done": False, "text": "상치교과 배정 계획 확인"},
                 {"done": False, "text": "3학년 선택과목(코스형) 최종 확정"},
@@ -718,38 +1000,150 @@ with tab5:
         if new_item:
             edits["checklist"].append({"done": False, "text": new_item})
             st.rerun()
-        st.session_state.edits = edits
+        st.session_state.edits = edits_root
 
     with col_note:
         st.markdown("### ⚠️ 주의사항 및 권고")
         st.warning("영어과 수업시수 증가 추세 — 상치교과 또는 추가 배치 검토 필요")
-        st.warning("과학과 기간제 운영 중 — 2027 정규교사 확보 여부 확인")
+        st.warning(f"과학과 기간제 운영 중 — {target} 정규교사 확보 여부 확인")
         st.info("3학년 코스형(택1) 과목은 수강 인원에 따라 통합/분리 여부 결정")
-        st.info("2027 신입생 교육과정은 2026입학 구조를 베이스로 검토 권장")
+        st.info(f"{target} 신입생 교육과정은 {template}입학 구조를 베이스로 검토 권장 — 아래 코호트 비교 참고")
 
     st.markdown("---")
-    st.markdown("### 📋 예상 운영 과목 상세 (고2·고3)")
-
-    grade_sel = st.radio("학년 필터", ["전체", "3학년 (2025입학)", "2학년 (2026입학)"],
-                          horizontal=True, key="guide_grade")
-
-    filtered_g = guidance
-    if "3학년" in grade_sel:
-        filtered_g = [g for g in guidance if g["grade"] == "3학년"]
-    elif "2학년" in grade_sel:
-        filtered_g = [g for g in guidance if g["grade"] == "2학년"]
-
-    if filtered_g:
-        df_g = pd.DataFrame([{
-            "학년": g["grade"],
-            "코호트": g["cohort"],
-            "교과군": g["group"] or "-",
-            "과목명": g["name"],
-            "학과/트랙": g["track"],
-            "학기": g["sem"],
-            "학점": g["credits"],
-        } for g in filtered_g])
+    st.markdown("### 🔍 코호트 교육과정 비교")
+    others = [y for y in cohorts if y != template] or cohorts
+    cmp_default = target if has_g1 else min(others, key=lambda y: abs(y - template))
+    col_b, col_c = st.columns(2)
+    with col_b:
+        base_yr = st.selectbox("기준 코호트", cohorts, index=cohorts.index(template),
+                               format_func=lambda y: f"{y}입학", key=f"cmp_base_{target}")
+    with col_c:
+        cmp_yr = st.selectbox("비교 코호트", cohorts, index=cohorts.index(cmp_default),
+                              format_func=lambda y: f"{y}입학", key=f"cmp_new_{target}")
+    sub_diff, credit_diff = cached_table(
+        "curriculum_diff", DATA_VER, (base_yr, cmp_yr),
+        lambda: (subject_table(curriculum, curriculum, base_yr, cmp_yr),
+                 credit_table(curriculum, curriculum, base_yr, cmp_yr)))
+    counts = sub_diff["구분"].value_counts()
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("과목 추가", f"{counts.get('과목 추가', 0)}개")
+    c2.metric("과목 삭제", f"{counts.get('과목 삭제', 0)}개")
+    c3.metric("편성 변경", f"{counts.get('편성 변경', 0)}개")
+    c4.metric("총 편성 학점", f"{int(credit_diff['비교'].sum())}", delta=int(credit_diff["증감"].sum()))
+    if base_yr == cmp_yr:
+        st.caption("기준과 비교 코호트가 같습니다.")
+    elif sub_diff.empty:
+        st.success(f"{cmp_yr}입학 교육과정이 {base_yr}입학과 같습니다.")
+    else:
+        col_s, col_k = st.columns([3, 2])
+        with col_s:
+            st.dataframe(sub_diff.drop(columns="입학년도"), use_container_width=True, hide_index=True)
+        with col_k:
+            st.markdown("**학년·학과·학기별 편성 학점**")
+            st.dataframe(credit_diff, use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+    st.markdown("### 📋 예상 운영 과목 상세 (고1·고2·고3)")
+
+    grade_sel = st.radio("학년 필터",
+                         ["전체", f"3학년 ({target-2}입학)", f"2학년 ({target-1}입학)",
+                          f"1학년 ({target}입학{'' if has_g1 else ' 예측'})"],
+                         horizontal=True, key="guide_grade")
+
+    filtered_g = guide_df
+    for g in ["3학년", "2학년", "1학년"]:
+        if g in grade_sel:
+            filtered_g = guide_df[guide_df["grade"] == g]
+
+    if not filtered_g.empty:
+        df_g = (filtered_g.assign(group=filtered_g["group"].mask(filtered_g["group"] == "", "-"))
+                [["grade", "cohort", "group", "name", "track", "sem", "credits"]]
+                .rename(columns={"grade": "학년", "cohort": "코호트", "group": "교과군", "name": "과목명",
+                                 "track": "학과/트랙", "sem": "학기", "credits": "학점"}))
         st.dataframe(df_g, use_container_width=True, hide_index=True)
         st.caption(f"총 {len(filtered_g)}건")
     else:
-        st.info("데이터 없음")
\ No newline at end of file
+        st.info("데이터 없음")
+
+# ════════════════════════════════════════════════════════════════
+# 교육지원청 집계 (학교별 데이터가 있을 때만)
+# ════════════════════════════════════════════════════════════════
+if SCHOOLS and view == VIEW_DISTRICT:
+    st.markdown(f"## 🏫 {school_year}학년도 교육지원청 교과별 수급")
+    st.caption("학교별 요약(ingest.py --school 로 생성한 summary.json)만 합산합니다. "
+               "학교 데이터를 갱신하면 요약도 함께 갱신됩니다.")
+
+    frame = cached_table("district_frame", "district", signature(), lambda: summary_frame(load_summaries()))
+    if frame.empty:
+        st.info("학교별 요약이 없습니다. `python ingest.py 엑셀폴더/ --school <학교 id>` 로 만들어 주세요.")
+    else:
+        dist = aggregate(frame)
+        dist = dist[dist["school_year"] == school_year]
+        c1, c2, c3 = st.columns(3)
+        c1.metric("학교", f"{frame['school_id'].nunique()}곳")
+        c2.metric("교사", f"{int(dist.groupby('dept')['teachers'].max().sum())}명")
+        c3.metric("부족 교과(학기)", f"{int((dist['balance'] < 0).sum())}건")
+        st.dataframe(
+            dist.drop(columns="school_year").rename(columns={
+                "dept": "교과(과)", "sem": "학기", "demand": "수요", "supply": "공급", "balance": "과부족",
+                "teachers": "교사", "schools": "학교 수", "short_schools": "부족 학교", "status": "상태"}),
+            use_container_width=True, hide_index=True)
+
+        st.markdown("#### 학교별 과부족")
+        st.caption("값 = 학기 중 가장 부족한 과부족 (공급 − 수요)")
+        st.dataframe(school_balance(frame, school_year), use_container_width=True, hide_index=True)
+
+timing.since(f"view:{VIEWS[view]}", view_t0)
+
+# ── 엑셀 내보내기 (사이드바) ────────────────────────────────────────────────────
+# 사이드바 저장 칸(export_box)에 그림 — 데이터 버전(DATA_VER)·수급 표를 쓸 수 있는 이 위치에서
+def build_export():
+    data = {"curriculum": curriculum, "teachers": session_table("teachers"), "yearly_view": yearly_view_all,
+            "guidance": session_table("guidance")}
+    return write_workbook(export_sheets(data, LAYOUT, get_demand_supply(), edits.get("cross_teaching")))
+
+
+if export_box is not None:
+    with export_box:
+        # 버튼을 누른 데이터 버전에서만 만들고, 같은 버전이면 캐시된 파일을 다시 씀
+        if st.button("📊 전체 엑셀 만들기", use_container_width=True, key="export_build",
+                     help="운영 현황(전 학년도)·편성표·교과별 수급·교사별 시수·상치교과·편성 가이드를 한 파일로"):
+            st.session_state.export_ver = DATA_VER
+        if st.session_state.get("export_ver") == DATA_VER:
+            with timing.stage("export"):
+                xlsx = cached_table("export_xlsx", DATA_VER, (), build_export)
+            st.download_button(
+                "📥 엑셀 다운로드",
+                data=xlsx,
+                file_name=f"{LAYOUT.name}_교육과정_전체.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True,
+            )
+        elif st.session_state.get("export_ver"):
+            st.caption("데이터가 바뀌었습니다 — 다시 만들어 주세요.")
+
+# ── 성능 진단 (사이드바) ──────────────────────────────────────────────────────
+# 화면 렌더링이 끝난 뒤에 그려야 이번 실행의 기록까지 보임
+with st.sidebar:
+    st.markdown("---")
+    diag_on = st.checkbox("⏱️ 성능 진단", value=timing.is_enabled(), key="diag_on",
+                          help="단계별 소요 시간 기록 (워크북 읽기·시트 파싱·뷰 계산·화면 렌더링·저장)")
+    if diag_on != timing.is_enabled():
+        timing.enable(diag_on)
+    if diag_on:
+        summary = timing.summary()
+        if summary:
+            st.dataframe(
+                pd.DataFrame(summary)[["stage", "count", "last_ms", "mean_ms", "max_ms", "total_ms"]]
+                .rename(columns={"stage": "단계", "count": "횟수", "last_ms": "최근ms",
+                                 "mean_ms": "평균ms", "max_ms": "최대ms", "total_ms": "합계ms"}),
+                use_container_width=True, hide_index=True,
+            )
+        else:
+            st.caption("기록 없음 — 다음 실행부터 기록됩니다")
+        c_dl, c_clr = st.columns(2)
+        c_dl.download_button("JSON 내보내기", timing.export_json(), file_name="timing.json",
+                             mime="application/json", use_container_width=True)
+        if c_clr.button("비우기", use_container_width=True):
+            timing.clear()
+            st.rerun()
@@ -0,0 +1,199 @@
+"""
+assign.py — 상치교과 배정 제안 (최소 비용 유량)
+시수가 MIN_LOAD(14) 미만인 교사가 시수 부족 교과를 맡도록 배정안을 만든다.
+  source → (교사, 학기)   용량 MAX_LOAD - 현재 시수 (MIN_LOAD 까지는 비용 1, 그 위는 비용 3)
+  (교사, 학기) → (교과, 학기)  상치 가능 교과만 (교원양식 cross_dept / main_subjects 기준), 비용 0~1
+  (교과, 학기) → sink     용량 = 부족 시수
+최소 비용 최대 유량을 다익스트라 + 포텐셜로 한 경로씩 늘려 가며 구하고,
+time_budget 을 넘기면 그때까지의 배정(항상 제약을 지키는 상태)을 돌려준다.
+
+결과는 상치교과 관리 화면(edits["cross_teaching"])의 행 형식.
+"""
+import heapq
+import re
+import time
+
+from parser import guess_dept
+
+MIN_LOAD = 14     # 이 시수 미만 교사만 상치 후보
+MAX_LOAD = 18     # 배정 후 넘지 않을 시수
+_INF = float("inf")
+
+
+# ── 최소 비용 유량 ─────────────────────────────────────────────────────────────
+class FlowGraph:
+    def __init__(self, n):
+        self.adj = [[] for _ in range(n)]     # 간선: [도착, 남은 용량, 비용, 역방향 간선 위치]
+
+    def add_edge(self, u, v, cap, cost):
+        """간선 추가 → (u, u 의 간선 번호) — 나중에 흐른 양을 읽을 때 사용"""
+        self.adj[u].append([v, cap, cost, len(self.adj[v])])
+        self.adj[v].append([u, 0, -cost, len(self.adj[u]) - 1])
+        return u, len(self.adj[u]) - 1
+
+    def flow_on(self, ref):
+        u, i = ref
+        v, _, _, r = self.adj[u][i]
+        return self.adj[v][r][1]
+
+    def min_cost_flow(self, s, t, deadline=None):
+        """
+        s → t 최소 비용 최대 유량 (비용은 음수 없음)
+        → (유량, 비용, 끝까지 계산했는지). deadline(time.monotonic 기준)을 넘기면 중단
+        """
+        n = len(self.adj)
+        potential = [0] * n
+        flow = cost = 0
+        while True:
+            if deadline is not None and time.monotonic() > deadline:
+                return flow, cost, False
+            dist = [_INF] * n
+            prev = [None] * n
+            dist[s] = 0
+            heap = [(0, s)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                for i, (v, cap, c, _) in enumerate(self.adj[u]):
+                    if cap > 0:
+                        nd = d + c + potential[u] - potential[v]
+                        if nd < dist[v]:
+                            dist[v] = nd
+                            prev[v] = (u, i)
+                            heapq.heappush(heap, (nd, v))
+            if dist[t] == _INF:
+                return flow, cost, True
+            for v in range(n):
+                if dist[v] < _INF:
+                    potential[v] += dist[v]
+
+            push, v = _INF, t
+            while v != s:
+                u, i = prev[v]
+                push = min(push, self.adj[u][i][1])
+                v = u
+            v = t
+            while v != s:
+                u, i = prev[v]
+                edge = self.adj[u][i]
+                edge[1] -= push
+                self.adj[v][edge[3]][1] += push
+                v = u
+            flow += push
+            cost += push * (potential[t] - potential[s])
+
+
+# ── 입력 정리 ─────────────────────────────────────────────────────────────────
+def deficits_from(ds_df, school_year, scenario=None):
+    """demand.demand_supply 결과 → {(교과, 학기): 부족 시수} (부족한 칸만)"""
+    part = ds_df[(ds_df["school_year"] == school_year) & (ds_df["balance"] < 0)]
+    if scenario is not None:
+        part = part[part["scenario"] == scenario]
+    elif not ds_df.empty:
+        part = part[part["scenario"] == ds_df["scenario"].iloc[0]]
+    return {(r.dept, r.sem): int(-r.balance) for r in part.itertuples()}
+
+
+def eligible_depts(teacher):
+    """
+    교사가 상치로 맡을 수 있는 교과 — 교원양식의 상치교과(cross_dept)와
+    주요과목(main_subjects, 쉼표·슬래시 구분)에서 추정한 교과. 소속 교과는 제외
+    """
+    depts = set()
+    if teacher.get("cross_dept") and teacher["cross_dept"] != "없음":
+        depts.add(teacher["cross_dept"])
+    for subj in re.split(r"[,/·\s]+", teacher.get("main_subjects", "") or ""):
+        if subj:
+            depts.add(guess_dept(subj))
+    depts.discard(teacher.get("dept", ""))
+    depts.discard("기타")
+    return depts
+
+
+def dept_subjects(curriculum, index, school_year, overrides=None):
+    """{(교과, 학기): [(과목명, 학년, 1반당 학점)]} — 해당 학년도 재학 코호트의 과목, 학점 큰 순"""
+    overrides = overrides or {}
+    out = {}
+    for offset in range(3):
+        grade = f"{offset + 1}학년"
+        for sid in index.subjects(school_year - offset, grade):
+            name = curriculum[sid]["name"]
+            dept = overrides.get(name) or guess_dept(name)
+            for _, sem, cr in index.grade_entries(sid, grade):
+                out.setdefault((dept, sem), {}).setdefault((name, grade), cr)
+    return {k: sorted(((n, g, c) for (n, g), c in v.items()), key=lambda x: -x[2]) for k, v in out.items()}
+
+
+# ── 배정 ─────────────────────────────────────────────────────────────────────
+def propose(teachers, deficits, subjects=None, time_budget=2.0, min_load=MIN_LOAD, max_load=MAX_LOAD):
+    """
+    교사 목록 + 부족 시수 → (상치교과 행 리스트, 요약 dict)
+    teachers: 한 학년도 교사 dict 리스트 (total_credits, dept, main_subjects, cross_dept)
+    deficits: {(교과, 학기): 부족 시수}
+    subjects: dept_subjects() 결과 — 있으면 상치담당과목·학년을 채움
+    """
+    subjects = subjects or {}
+    sems = sorted({sem for _, sem in deficits})
+    donors = [t for t in teachers
+              if 0 < (t.get("total_credits") or 0) < min_load and eligible_depts(t) & {d for d, _ in deficits}]
+
+    # 노드: 0 source, 1 sink, (교사, 학기), (교과, 학기)
+    t_node = {(i, sem): 2 + i * len(sems) + j for i in range(len(donors)) for j, sem in enumerate(sems)}
+    d_keys = sorted(deficits)
+    d_node = {k: 2 + len(t_node) + j for j, k in enumerate(d_keys)}
+    g = FlowGraph(2 + len(t_node) + len(d_node))
+
+    for k, hours in deficits.items():
+        g.add_edge(d_node[k], 1, hours, 0)
+    assign_edges = []
+    for i, t in enumerate(donors):
+        load = t["total_credits"]
+        depts = eligible_depts(t)
+        for sem in sems:
+            u = t_node[(i, sem)]
+            g.add_edge(0, u, min_load - load, 1)           # 최소 시수까지 채우는 쪽 우선
+            g.add_edge(0, u, max_load - min_load, 3)
+            for d in depts:
+                if (d, sem) in d_node:
+                    cost = 0 if d == t.get("cross_dept") else 1   # 교원양식에 적은 상치교과 우선
+                    assign_edges.append((i, d, sem, g.add_edge(u, d_node[(d, sem)], max_load, cost)))
+
+    deadline = time.monotonic() + time_budget
+    flow, cost, complete = g.min_cost_flow(0, 1, deadline)
+
+    # 배정 결과 → (교사, 교과) 별 학기 시수
+    per = {}
+    for i, d, sem, ref in assign_edges:
+        f = g.flow_on(ref)
+        if f:
+            per.setdefault((i, d), {})[sem] = f
+
+    rows = []
+    for (i, d), by_sem in sorted(per.items()):
+        t = donors[i]
+        same = len(by_sem) == len(sems) > 1 and len(set(by_sem.values())) == 1
+        parts = [("연간", next(iter(by_sem.values())))] if same else sorted(by_sem.items())
+        for sem, hours in parts:
+            cand = subjects.get((d, sems[0] if sem == "연간" else sem), [])
+            subj, grade = (cand[0][0], cand[0][1]) if cand else ("", "")
+            rows.append({
+                "교사명": t["name"],
+                "소속교과": t.get("dept", ""),
+                "상치담당과목": f"{d} / {subj}" if subj else d,
+                "학년": grade,
+                "학기": sem,
+                "시수": hours,
+                "메모": f"자동 제안 (현재 {t['total_credits']}시수)",
+            })
+
+    total_deficit = sum(deficits.values())
+    summary = {
+        "deficit": total_deficit,
+        "covered": flow,
+        "remaining": total_deficit - flow,
+        "donors": len(donors),
+        "cost": cost,
+        "complete": complete,
+    }
+    return rows, summary
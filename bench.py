@@ -0,0 +1,171 @@
+"""
+bench.py — parser.py 성능 측정
+synth.py 로 규모별(과목·교사 수 배수 × 학년도 시트 수) 합성 엑셀을 만들고 파싱·집계 함수의 시간과 최대 메모리를 잰다.
+결과는 data/bench/results.jsonl 에 한 줄씩 쌓이고, 직전 실행(또는 지정한 기준 실행)과 비교해
+느려진 항목을 표시한다.
+
+사용:
+  python bench.py                       # 기본 규모 1, 10
+  python bench.py --scales 1 3 10 --repeat 5
+  python bench.py --scales 1 --sheets 3 6 12   # 학년도 시트 수만 늘려 가며
+  python bench.py --baseline <run id>   # 특정 실행과 비교
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import parser as P
+import synth
+
+BENCH_DIR = Path(__file__).parent / "data" / "bench"
+RESULTS_PATH = BENCH_DIR / "results.jsonl"
+WORKBOOK_DIR = BENCH_DIR / "workbooks"
+REGRESSION = 1.2   # 기준 대비 이 배수 이상 느려지면 표시
+
+
+# ── 측정 ─────────────────────────────────────────────────────────────────────
+def measure(fn, repeat=3):
+    """fn() 을 repeat 번 실행 → (최소 시간 초, 최대 메모리 bytes, 마지막 결과)"""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+
+    # 메모리는 추적 오버헤드가 시간에 섞이지 않도록 따로 한 번 더 실행
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def run_key(scale, sheets=None):
+    """결과 키 — 기본 학년도 시트면 규모만 (이전 실행과 비교되도록)"""
+    return str(scale) if sheets is None else f"{scale}_y{sheets}"
+
+
+def workbooks(scale, junk_sheets=2, sheets=None):
+    """규모별 합성 엑셀 (이미 있으면 재사용 — 같은 seed 면 내용 동일)"""
+    out = WORKBOOK_DIR / f"x{run_key(scale, sheets)}_j{junk_sheets}"
+    paths = {
+        "curriculum": out / f"단위배당표_x{scale}.xlsx",
+        "allocation": out / f"교과배정표_x{scale}.xlsx",
+        "teacher_form": out / f"교원정보_x{scale}.xlsx",
+    }
+    if not all(p.exists() for p in paths.values()):
+        paths = synth.write_set(out, scale, junk_sheets, sheets=sheets)
+    return paths
+
+
+def run_scale(scale, repeat=3, junk_sheets=2, sheets=None):
+    """한 규모(배수 × 학년도 시트 수)의 측정 → {항목: {seconds, peak_kb, rows}}"""
+    paths = workbooks(scale, junk_sheets, sheets)
+    profile = synth.synth_profile(sheets)
+    years = P.view_years(profile.school_years)
+    results = {}
+
+    def record(name, fn, rows=len):
+        sec, peak, out = measure(fn, repeat)
+        results[name] = {"seconds": round(sec, 5), "peak_kb": peak // 1024, "rows": rows(out)}
+        return out
+
+    curriculum = record("parse_curriculum_file",
+                        lambda: P.parse_curriculum_file(paths["curriculum"], profile=profile))
+    record("parse_allocation_file", lambda: P.parse_allocation_file(paths["allocation"], profile=profile),
+           rows=lambda r: sum(len(v) for v in r[0].values()))
+    record("parse_teacher_form", lambda: P.parse_teacher_form(paths["teacher_form"]),
+           rows=lambda r: sum(len(v) for v in r.values()))
+    index = record("build_index", lambda: P.build_index(curriculum, profile), rows=lambda ix: len(ix.curriculum))
+    record("build_yearly_view", lambda: P.build_yearly_view(years[len(years) // 2], curriculum))
+    record("build_yearly_views", lambda: P.build_yearly_views(years, curriculum, index),
+           rows=lambda r: sum(len(v) for v in r.values()))
+    record("build_guidance_2027", lambda: P.build_guidance_2027(curriculum))
+    return results
+
+
+# ── 결과 저장·비교 ─────────────────────────────────────────────────────────────
+def load_runs():
+    if not RESULTS_PATH.exists():
+        return []
+    with open(RESULTS_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_run(run):
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    with open(RESULTS_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run, ensure_ascii=False) + "\n")
+
+
+def compare(run, base):
+    """
+    두 실행 비교 → [(규모, 항목, 기준 초, 현재 초, 배수)]
+    REGRESSION 배수 이상 느려진 항목만
+    """
+    slow = []
+    for scale, items in run["results"].items():
+        for name, cur in items.items():
+            prev = base["results"].get(scale, {}).get(name)
+            if prev and prev["seconds"] > 0:
+                ratio = cur["seconds"] / prev["seconds"]
+                if ratio >= REGRESSION:
+                    slow.append((scale, name, prev["seconds"], cur["seconds"], ratio))
+    return slow
+
+
+def _print_table(run, base):
+    for scale, items in run["results"].items():
+        print(f"\n[x{scale}]")
+        print(f"  {'항목':<24}{'초':>10}{'메모리KB':>12}{'행':>8}{'기준 대비':>10}")
+        for name, r in items.items():
+            prev = base["results"].get(scale, {}).get(name) if base else None
+            diff = f"{r['seconds'] / prev['seconds']:.2f}x" if prev and prev["seconds"] > 0 else "-"
+            print(f"  {name:<24}{r['seconds']:>10.4f}{r['peak_kb']:>12}{r['rows']:>8}{diff:>10}")
+
+
+def main(scales, repeat=3, junk_sheets=2, baseline=None, save=True, sheets=(None,)):
+    run = {
+        "id": datetime.now().strftime("%Y%m%d-%H%M%S"),
+        "parser_version": P.PARSER_VERSION,
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "results": {run_key(s, n): run_scale(s, repeat, junk_sheets, n) for s in scales for n in sheets},
+    }
+
+    runs = load_runs()
+    base = next((r for r in runs if r["id"] == baseline), None) if baseline else (runs[-1] if runs else None)
+    if baseline and base is None:
+        print(f"기준 실행 없음: {baseline}")
+    _print_table(run, base)
+
+    if save:
+        save_run(run)
+        print(f"\n저장: {RESULTS_PATH} (id={run['id']})")
+
+    slow = compare(run, base) if base else []
+    for scale, name, prev, cur, ratio in slow:
+        print(f"⚠️ x{scale} {name}: {prev:.4f}s → {cur:.4f}s ({ratio:.2f}x, 기준 {base['id']})")
+    return not slow
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="parser.py 벤치마크")
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10], help="합성 데이터 규모 배수")
+    ap.add_argument("--repeat", type=int, default=3, help="시간 측정 반복 횟수 (최솟값 사용)")
+    ap.add_argument("--junk", type=int, default=2, help="파싱 대상이 아닌 시트 수")
+    ap.add_argument("--sheets", type=int, nargs="+", default=[None],
+                    help="입학년도 시트 수 (교과배정표는 한 개 더, 기본 3)")
+    ap.add_argument("--baseline", help="비교할 실행 id (기본: 직전 실행)")
+    ap.add_argument("--no-save", action="store_true", help="결과를 저장하지 않음")
+    args = ap.parse_args()
+    ok = main(args.scales, args.repeat, args.junk, args.baseline, save=not args.no_save, sheets=args.sheets)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,173 @@
+"""
+curriculum_diff.py — 교육과정 두 판 비교 (코호트 간 또는 같은 코호트의 수정본 간)
+과목은 (입학년도, 정규화한 과목명, 같은 이름 중 순번) 으로 짝짓는다.
+  - 코호트 간 비교 (예: 2025입학 vs 2026입학): 입학년도를 빼고 과목명으로만 짝지음
+  - 수정본 간 비교: 입학년도까지 같은 과목끼리 짝지음
+양쪽을 dict 로 한 번씩 훑어 짝지으므로 과목 수에 선형.
+
+결과:
+  subject_table  과목 추가·삭제·편성 변경 (학년·학과·학기별 학점 차이)
+  credit_table   학년·학과·학기별 편성 학점 합계와 증감
+
+사용:
+  python curriculum_diff.py 단위배당표.xlsx --base 2026 --target 2027      # 한 파일 안의 두 코호트
+  python curriculum_diff.py 이전.xlsx 수정본.xlsx                           # 두 수정본 (전체 코호트)
+  python curriculum_diff.py data/curriculum_data.json 수정본.xlsx --base 2026 -o 비교.csv
+"""
+import argparse
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+import pandas as pd
+
+SUBJECT_DIFF_COLUMNS = ["구분", "입학년도", "과목명", "교과군", "기준", "비교", "증감"]
+CREDIT_DIFF_COLUMNS = ["학년", "학과", "학기", "기준", "비교", "증감"]
+CHANGE_ORDER = {"과목 추가": 0, "과목 삭제": 1, "편성 변경": 2}
+
+_SPACE = re.compile(r"[\s·ㆍ]+")
+_ROMAN = re.compile(r"(I{1,3})$")
+
+
+# ── 과목 짝짓기 ────────────────────────────────────────────────────────────────
+def norm_name(name):
+    """비교용 과목명 — 전각·로마 숫자(Ⅰ → 1)·공백·가운뎃점 차이를 무시"""
+    s = _SPACE.sub("", unicodedata.normalize("NFKC", str(name)))
+    return _ROMAN.sub(lambda m: str(len(m.group(1))), s)
+
+
+def _keyed(curriculum, entry_year=None, years=None, with_cohort=True):
+    """
+    curriculum → {(입학년도 또는 None, 정규화 과목명, 순번): 과목}
+    entry_year: 그 입학년도만, years: 그 입학년도 집합만 (None 이면 전체)
+    """
+    out, seen = {}, {}
+    for sub in curriculum:
+        ey = sub["entry_year"]
+        if (entry_year is not None and ey != entry_year) or (years is not None and ey not in years):
+            continue
+        k = (ey if with_cohort else None, norm_name(sub["name"]))
+        seen[k] = seen.get(k, 0) + 1
+        out[k + (seen[k],)] = sub
+    return out
+
+
+def match_subjects(old, new, old_year=None, new_year=None, years=None):
+    """
+    두 curriculum 의 과목 짝짓기 → (추가 [과목], 삭제 [과목], 짝 [(이전, 이후)])
+    old_year·new_year 가 서로 다르면 코호트 간 비교 (입학년도 없이 과목명으로 짝지음)
+    """
+    cross = old_year != new_year
+    before = _keyed(old, old_year, years, with_cohort=not cross)
+    after = _keyed(new, new_year, years, with_cohort=not cross)
+    added = [sub for k, sub in after.items() if k not in before]
+    removed = [sub for k, sub in before.items() if k not in after]
+    pairs = [(sub, after[k]) for k, sub in before.items() if k in after]
+    return added, removed, pairs
+
+
+def schedule_delta(a, b):
+    """schedule 두 개 → {편성 키: 학점 차이} (차이가 있는 키만, 열 순서 유지)"""
+    keys = list(dict.fromkeys([*a, *b]))
+    return {k: b.get(k, 0) - a.get(k, 0) for k in keys if a.get(k, 0) != b.get(k, 0)}
+
+
+def schedule_text(schedule):
+    return ", ".join(f"{k}: {v}" for k, v in schedule.items())
+
+
+# ── 비교 표 ────────────────────────────────────────────────────────────────────
+def subject_table(old, new, old_year=None, new_year=None):
+    """과목 추가·삭제·편성 변경 (SUBJECT_DIFF_COLUMNS) — 증감은 편성(schedule) 학점 합계 차이"""
+    added, removed, pairs = match_subjects(old, new, old_year, new_year)
+    rows = []
+    for sub in added:
+        rows.append(["과목 추가", sub["entry_year"], sub["name"], sub.get("group", ""),
+                     "", schedule_text(sub["schedule"]), sum(sub["schedule"].values())])
+    for sub in removed:
+        rows.append(["과목 삭제", sub["entry_year"], sub["name"], sub.get("group", ""),
+                     schedule_text(sub["schedule"]), "", -sum(sub["schedule"].values())])
+    for a, b in pairs:
+        delta = schedule_delta(a["schedule"], b["schedule"])
+        if delta:
+            rows.append(["편성 변경", b["entry_year"], b["name"], b.get("group", ""),
+                         schedule_text({k: a["schedule"].get(k, "-") for k in delta}),
+                         schedule_text({k: b["schedule"].get(k, "-") for k in delta}), sum(delta.values())])
+        elif a.get("op_credits") != b.get("op_credits"):
+            rows.append(["편성 변경", b["entry_year"], b["name"], b.get("group", ""),
+                         f"운영 학점 {a.get('op_credits')}", f"운영 학점 {b.get('op_credits')}", 0])
+    rows.sort(key=lambda r: (CHANGE_ORDER[r[0]], r[1], r[3], r[2]))
+    return pd.DataFrame(rows, columns=SUBJECT_DIFF_COLUMNS)
+
+
+def credit_totals(curriculum, entry_year=None):
+    """{편성 키: 학점 합계} — entry_year 가 있으면 그 코호트만"""
+    totals = {}
+    for sub in curriculum:
+        if entry_year is None or sub["entry_year"] == entry_year:
+            for k, c in sub["schedule"].items():
+                totals[k] = totals.get(k, 0) + c
+    return totals
+
+
+def credit_table(old, new, old_year=None, new_year=None):
+    """학년·학과·학기별 편성 학점 합계 비교 (CREDIT_DIFF_COLUMNS)"""
+    a, b = credit_totals(old, old_year), credit_totals(new, new_year)
+    rows = []
+    for k in dict.fromkeys([*a, *b]):
+        parts = k.split("|")
+        if len(parts) != 3:       # 형식이 다른 편성 키는 건너뜀 (다른 집계와 같게)
+            continue
+        grade, track, sem = parts
+        rows.append([grade, track, sem, a.get(k, 0), b.get(k, 0), b.get(k, 0) - a.get(k, 0)])
+    return pd.DataFrame(rows, columns=CREDIT_DIFF_COLUMNS)
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+def _load(path):
+    """단위배당표 xlsx 또는 curriculum_data.json/.snap → curriculum"""
+    if Path(path).suffix == ".xlsx":
+        from parser import parse_curriculum_file
+        return parse_curriculum_file(path)
+    from snapshot import load_data
+    return load_data(path).get("curriculum", [])
+
+
+def main(old_path, new_path=None, base=None, target=None, out=None):
+    try:
+        old = _load(old_path)
+        new = _load(new_path) if new_path else old
+    except Exception as e:
+        print(f"읽기 실패: {e}")
+        return False
+    if not new_path and (base is None or target is None):
+        print("파일이 하나면 --base 와 --target 입학년도를 모두 지정하세요.")
+        return False
+    target = target if target is not None else base
+
+    subjects = subject_table(old, new, base, target)
+    credits = credit_table(old, new, base, target)
+    label = f"{base}입학 → {target}입학" if base is not None else "전체 코호트"
+    counts = subjects["구분"].value_counts()
+    print(f"{label}: " + " · ".join(f"{k} {counts.get(k, 0)}" for k in CHANGE_ORDER))
+    if out:
+        subjects.to_csv(out, index=False, encoding="utf-8-sig")
+        print(f"저장: {out}")
+    else:
+        with pd.option_context("display.max_rows", None, "display.width", 200, "display.max_colwidth", 60):
+            print(subjects.to_string(index=False))
+            print()
+            print(credits[credits["증감"] != 0].to_string(index=False))
+    return True
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="교육과정 두 판 비교")
+    ap.add_argument("old", help="기준 단위배당표 xlsx 또는 curriculum_data.json/.snap")
+    ap.add_argument("new", nargs="?", help="비교할 파일 (없으면 같은 파일 안에서 코호트 비교)")
+    ap.add_argument("--base", type=int, help="기준 입학년도")
+    ap.add_argument("--target", type=int, help="비교 입학년도 (없으면 --base 와 같음)")
+    ap.add_argument("-o", "--out", help="과목 변경 표를 CSV 로 저장")
+    args = ap.parse_args()
+    sys.exit(0 if main(args.old, args.new, args.base, args.target, args.out) else 1)
@@ -0,0 +1,197 @@
+"""
+curriculum_index.py — 파싱된 교육과정 색인
+schedule 키("2학년|세무회계|1학기")를 한 번만 분해해
+(입학년도, 학년, 학과, 학기) → 과목 id·학점 조회와 학년별 합계를 미리 계산해 둔다.
+과목 id 는 curriculum 리스트 안의 위치(index).
+
+ScheduleArray — 전체 과목의 schedule 을 (과목 × 학년 × 학과 × 학기) 정수 배열 하나로 보관.
+합계·반 수 가중 시수·필터는 배열 연산으로 계산하고, dict 형식과 서로 변환된다.
+"""
+import numpy as np
+
+
+class ScheduleArray:
+    def __init__(self, credits, present, grades, tracks, sems, extra=None):
+        self.credits = credits        # int16 (과목, 학년, 학과, 학기)
+        self.present = present        # bool  — 값이 0 이어도 편성된 칸 구분 (무손실 변환용)
+        self.grades = list(grades)
+        self.tracks = list(tracks)
+        self.sems = list(sems)
+        self.extra = extra or {}      # 과목 id → 축에 맞지 않는 schedule 키 (그대로 보존)
+        self.grade_pos = {g: i for i, g in enumerate(self.grades)}
+        self.track_pos = {t: i for i, t in enumerate(self.tracks)}
+        self.sem_pos = {s: i for i, s in enumerate(self.sems)}
+
+    @classmethod
+    def from_curriculum(cls, curriculum, axes=None):
+        """
+        curriculum → 배열. axes=(학년 목록, 학과 목록, 학기 목록)
+        axes 가 없으면 schedule 키에 처음 나온 순서대로 축을 만든다.
+        """
+        split = [[(k.split("|"), v) for k, v in sub["schedule"].items()] for sub in curriculum]
+        if axes is None:
+            found = ({}, {}, {})
+            for entries in split:
+                for parts, _ in entries:
+                    if len(parts) == 3:
+                        for d, p in zip(found, parts):
+                            d.setdefault(p, None)
+            axes = tuple(list(d) for d in found)
+        grades, tracks, sems = axes
+        gp = {g: i for i, g in enumerate(grades)}
+        tp = {t: i for i, t in enumerate(tracks)}
+        sp = {s: i for i, s in enumerate(sems)}
+
+        rows, gi, ti, si, vals, extra = [], [], [], [], [], {}
+        for sid, entries in enumerate(split):
+            for parts, v in entries:
+                if len(parts) == 3 and parts[0] in gp and parts[1] in tp and parts[2] in sp:
+                    rows.append(sid)
+                    gi.append(gp[parts[0]])
+                    ti.append(tp[parts[1]])
+                    si.append(sp[parts[2]])
+                    vals.append(v)
+                else:
+                    extra.setdefault(sid, {})["|".join(parts)] = v
+
+        shape = (len(curriculum), len(grades), len(tracks), len(sems))
+        credits = np.zeros(shape, dtype=np.int16)
+        present = np.zeros(shape, dtype=bool)
+        credits[rows, gi, ti, si] = vals
+        present[rows, gi, ti, si] = True
+        return cls(credits, present, grades, tracks, sems, extra)
+
+    def schedule(self, sid):
+        """과목 하나 → 기존 dict 형식 ("학년|학과|학기" → 학점)"""
+        g, t, s = np.nonzero(self.present[sid])
+        out = {f"{self.grades[a]}|{self.tracks[b]}|{self.sems[c]}": int(self.credits[sid, a, b, c])
+               for a, b, c in zip(g.tolist(), t.tolist(), s.tolist())}
+        out.update(self.extra.get(sid, {}))
+        return out
+
+    def to_schedules(self):
+        """전체 → schedule dict 리스트 (from_curriculum 의 역변환)"""
+        return [self.schedule(sid) for sid in range(len(self.credits))]
+
+    def count_matrix(self, class_counts):
+        """{(학년, 학과): 반 수} → (학년 × 학과) 배열"""
+        m = np.zeros((len(self.grades), len(self.tracks)), dtype=np.int32)
+        for (grade, track), n in class_counts.items():
+            if grade in self.grade_pos and track in self.track_pos:
+                m[self.grade_pos[grade], self.track_pos[track]] = n
+        return m
+
+    def class_hours(self, class_counts):
+        """반 수 가중 시수 (과목 × 학년 × 학과 × 학기) = 1반당 학점 × 반 수"""
+        return self.credits.astype(np.int32) * self.count_matrix(class_counts)[None, :, :, None]
+
+    def grade_totals(self, mask=None):
+        """과목별·학년별 학점 합계 (과목 × 학년). mask 로 과목 필터"""
+        totals = self.credits.sum(axis=(2, 3), dtype=np.int32)
+        return totals if mask is None else totals[mask]
+
+
+class CurriculumIndex:
+    def __init__(self, curriculum, axes=None):
+        self.curriculum = curriculum
+        self.array = ScheduleArray.from_curriculum(curriculum, axes)
+        self.entry_years = np.asarray([sub["entry_year"] for sub in curriculum], dtype=np.int32)
+        self.attrs = {   # 과목 id → 과목명·교과군·영역 (배열 인덱싱용 object 배열)
+            col: np.asarray([sub.get(col, "") for sub in curriculum], dtype=object)
+            for col in ("name", "group", "area")
+        }
+        self.slots = {}           # (입학년도, 학년, 학과, 학기) → [(과목 id, 학점)]
+        self.cohort_grade = {}    # (입학년도, 학년) → [과목 id]  (curriculum 순서)
+        self.entries = {}         # (과목 id, 학년) → [(학과, 학기, 학점)]  (학과·학기 축 순서)
+        self.grade_totals = {}    # (입학년도, 학년) → 주당 학점 합계
+        self.slot_totals = {}     # (입학년도, 학년, 학과, 학기) → 학점 합계
+
+        arr = self.array
+        sids, g, t, s = (x.tolist() for x in np.nonzero(arr.present))
+        credits = arr.credits[arr.present].tolist()
+        years = self.entry_years.tolist()
+        for sid, gi, ti, si, cr in zip(sids, g, t, s, credits):
+            grade, track, sem = arr.grades[gi], arr.tracks[ti], arr.sems[si]
+            self.slots.setdefault((years[sid], grade, track, sem), []).append((sid, cr))
+            if (sid, grade) not in self.entries:
+                self.entries[(sid, grade)] = []
+                self.cohort_grade.setdefault((years[sid], grade), []).append(sid)
+            self.entries[(sid, grade)].append((track, sem, cr))
+
+        # 합계는 배열에서 입학년도별로 모아 계산
+        for ey in np.unique(self.entry_years).tolist():
+            cohort = arr.credits[self.entry_years == ey].sum(axis=0, dtype=np.int32)   # (학년, 학과, 학기)
+            for gi, ti, si in zip(*np.nonzero(cohort)):
+                self.slot_totals[(ey, arr.grades[gi], arr.tracks[ti], arr.sems[si])] = int(cohort[gi, ti, si])
+            for gi, total in enumerate(cohort.sum(axis=(1, 2)).tolist()):
+                if (ey, arr.grades[gi]) in self.cohort_grade:
+                    self.grade_totals[(ey, arr.grades[gi])] = total
+        self._index_extra(years)
+
+    def _index_extra(self, years):
+        """
+        축에 없는 "학년|학과|학기" 키 (예: 양식에 없는 학과) 도 조회·운영 현황에 포함
+        배열에는 들어가지 않으므로 여기서 따로 더하고, 과목 id 순서는 다시 맞춘다
+        """
+        touched_slots, touched_cohorts = set(), set()
+        for sid, keys in self.array.extra.items():
+            for key, cr in keys.items():
+                parts = key.split("|")
+                if len(parts) != 3:
+                    continue
+                grade, track, sem = parts
+                slot = (years[sid], grade, track, sem)
+                self.slots.setdefault(slot, []).append((sid, cr))
+                self.slot_totals[slot] = self.slot_totals.get(slot, 0) + cr
+                self.grade_totals[slot[:2]] = self.grade_totals.get(slot[:2], 0) + cr
+                touched_slots.add(slot)
+                if (sid, grade) not in self.entries:
+                    self.entries[(sid, grade)] = []
+                    self.cohort_grade.setdefault(slot[:2], []).append(sid)
+                    touched_cohorts.add(slot[:2])
+                self.entries[(sid, grade)].append((track, sem, cr))
+        for slot in touched_slots:
+            self.slots[slot].sort()
+        for key in touched_cohorts:
+            self.cohort_grade[key].sort()
+
+    def lookup(self, entry_year, grade, track, sem):
+        """해당 칸에 편성된 [(과목 id, 학점)]"""
+        return self.slots.get((entry_year, grade, track, sem), [])
+
+    def subjects(self, entry_year, grade):
+        """해당 코호트·학년에 편성된 과목 id 목록"""
+        return self.cohort_grade.get((entry_year, grade), [])
+
+    def grade_entries(self, sid, grade):
+        """과목의 해당 학년 편성 [(학과, 학기, 학점)]"""
+        return self.entries.get((sid, grade), [])
+
+    def credit(self, sid, grade, track, sem):
+        arr = self.array
+        try:
+            pos = (sid, arr.grade_pos[grade], arr.track_pos[track], arr.sem_pos[sem])
+        except KeyError:   # 축에 없는 키 — _index_extra 로 색인한 항목에서 찾음
+            return next((cr for tr, sm, cr in self.entries.get((sid, grade), ()) if tr == track and sm == sem), None)
+        return int(arr.credits[pos]) if arr.present[pos] else None
+
+    def track_info(self, sid, grade, tracks):
+        """
+        {학과: (1학기 학점, 2학기 학점)} — 해당 학년에 편성된 학과만, 없으면 None
+        (app 편성표의 get_track_info 와 같은 형식)
+        """
+        result = {}
+        for tr in tracks:
+            s1 = self.credit(sid, grade, tr, "1학기")
+            s2 = self.credit(sid, grade, tr, "2학기")
+            if s1 or s2:
+                result[tr] = (s1 or 0, s2 or 0)
+        return result or None
+
+    def entry_mask(self, entry_years):
+        """입학년도 필터 → 과목 bool 배열"""
+        return np.isin(self.entry_years, list(entry_years))
+
+    def grade_hours(self, class_counts):
+        """과목별·학년별 반 수 가중 전체 시수 (과목 × 학년)"""
+        return self.array.class_hours(class_counts).sum(axis=(2, 3))
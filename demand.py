@@ -0,0 +1,139 @@
+"""
+demand.py — 교과(과)별 수업시수 수요 vs 교사 공급
+수요: 교육과정 schedule × 반 수 → 학년도·교과(과)·학기별 주당 필요 시수
+      (학년도 Y 에는 Y·Y-1·Y-2 입학 코호트가 각각 1·2·3학년)
+공급: 교사별 total_credits 합계 (교원양식 상치 시수는 상치 교과로 옮겨 셈)
+과목 → 교과(과)는 guess_dept, 과목명별 override 표가 있으면 우선.
+
+여러 학년도·여러 반 수 시나리오를 배열 연산 한 번으로 계산한다.
+  hours[k, y, d, m] = Σ_s Σ_g Σ_t credits[s, g, t, m] · classes[k, g, t] · [학년 g 가 학년도 y 의 코호트 s] · [s ∈ 교과 d]
+"""
+import numpy as np
+import pandas as pd
+
+from parser import CLASS_COUNTS, build_index, guess_dept
+
+DEMAND_COLUMNS = ["scenario", "school_year", "dept", "sem", "demand", "supply", "balance", "teachers", "status"]
+IGNORE_DEPTS = {"", "미분류"}    # 공급 집계에서 제외하는 교과명
+
+
+# ── 과목 → 교과(과) ────────────────────────────────────────────────────────────
+def dept_codes(curriculum, overrides=None):
+    """
+    과목별 교과(과) 코드 배열 + 교과 목록
+    overrides: {과목명: 교과(과)} — guess_dept 결과보다 우선
+    """
+    overrides = overrides or {}
+    names = [overrides.get(sub["name"]) or guess_dept(sub["name"]) for sub in curriculum]
+    depts = sorted(set(names))
+    pos = {d: i for i, d in enumerate(depts)}
+    return np.asarray([pos[n] for n in names], dtype=np.int64), depts
+
+
+# ── 수요 ─────────────────────────────────────────────────────────────────────
+def demand_array(index, years, scenarios, codes, n_depts):
+    """
+    (시나리오 × 학년도 × 교과 × 학기) 주당 필요 시수 배열
+    scenarios: [{(학년, 학과): 반 수}, …]
+    """
+    arr = index.array
+    counts = np.stack([arr.count_matrix(c) for c in scenarios]).astype(np.int64)          # (K, G, T)
+
+    # 과목 s 가 학년도 y 에 몇 학년인지 → (S, Y, G) one-hot
+    offsets = np.asarray(years, dtype=np.int64)[None, :] - index.entry_years.astype(np.int64)[:, None]
+    grade_of = (offsets[:, :, None] == np.arange(len(arr.grades))[None, None, :])          # (S, Y, G)
+
+    dept_onehot = np.zeros((len(codes), n_depts), dtype=np.int64)
+    dept_onehot[np.arange(len(codes)), codes] = 1                                          # (S, D)
+
+    credits = arr.credits.astype(np.int64)                                                 # (S, G, T, M)
+    # 학과 축을 먼저 반 수로 합친 뒤 (K, S, G, M) → 코호트·교과로 모음
+    per_grade = np.einsum("sgtm,kgt->ksgm", credits, counts)
+    return np.einsum("ksgm,syg,sd->kydm", per_grade, grade_of.astype(np.int64), dept_onehot)
+
+
+# ── 공급 ─────────────────────────────────────────────────────────────────────
+def supply_table(teachers_by_year, years):
+    """
+    학년도·교과(과)별 공급 시수·교사 수 → DataFrame(school_year, dept, supply, teachers)
+    상치(is_cross) 교사는 cross_credits 만큼을 상치 교과 공급으로 옮김
+    """
+    records = []
+    for y in years:
+        for t in teachers_by_year.get(str(y), []):
+            credits = t.get("total_credits", 0) or 0
+            if credits <= 0 or t.get("dept", "") in IGNORE_DEPTS:
+                continue
+            cross = (t.get("cross_credits", 0) or 0) if t.get("is_cross") and t.get("cross_dept") else 0
+            cross = min(cross, credits)
+            records.append((y, t["dept"], credits - cross, 1))
+            if cross:
+                records.append((y, t["cross_dept"], cross, 0))
+    df = pd.DataFrame(records, columns=["school_year", "dept", "supply", "teachers"])
+    df = df.astype({"school_year": np.int64, "dept": object, "supply": np.int64, "teachers": np.int64})
+    return df.groupby(["school_year", "dept"], as_index=False, sort=True)[["supply", "teachers"]].sum()
+
+
+# ── 수요 vs 공급 ──────────────────────────────────────────────────────────────
+def _status(balance):
+    return np.where(balance < 0, "🔶 부족", np.where(balance > 0, "➕ 여유", "✅ 일치"))
+
+
+def demand_supply(curriculum, teachers_by_year, years, scenarios=None, overrides=None, index=None):
+    """
+    학년도 × 교과(과) × 학기별 수요·공급·과부족 → DataFrame (DEMAND_COLUMNS)
+    scenarios: {시나리오 이름: {(학년, 학과): 반 수}} (None 이면 현재 반 수 CLASS_COUNTS 하나)
+    balance = supply - demand (음수면 부족). 공급은 학기 구분 없이 같은 주당 시수로 본다.
+    """
+    scenarios = scenarios or {"현재": CLASS_COUNTS}
+    years = list(years)
+    index = index or build_index(curriculum)
+    codes, depts = dept_codes(curriculum, overrides)
+    hours = demand_array(index, years, list(scenarios.values()), codes, len(depts))       # (K, Y, D, M)
+
+    sems = index.array.sems
+    k, y, d, m = np.meshgrid(np.arange(len(scenarios)), np.arange(len(years)),
+                             np.arange(len(depts)), np.arange(len(sems)), indexing="ij")
+    demand = pd.DataFrame({
+        "scenario": np.asarray(list(scenarios), dtype=object)[k.ravel()],
+        "school_year": np.asarray(years, dtype=np.int64)[y.ravel()],
+        "dept": np.asarray(depts, dtype=object)[d.ravel()],
+        "sem": np.asarray(sems, dtype=object)[m.ravel()],
+        "demand": hours.ravel(),
+    })
+
+    supply = supply_table(teachers_by_year, years)
+    # 수요 없는 교과의 공급도 보이도록 외부 조인 (시나리오·학기별로 펼침)
+    keys = pd.MultiIndex.from_product([list(scenarios), years, sems], names=["scenario", "school_year", "sem"])
+    supply_all = keys.to_frame(index=False).merge(supply, on="school_year", how="inner")
+    df = demand.merge(supply_all, on=["scenario", "school_year", "dept", "sem"], how="outer")
+    df[["demand", "supply", "teachers"]] = df[["demand", "supply", "teachers"]].fillna(0).astype(np.int64)
+    df = df[(df["demand"] > 0) | (df["supply"] > 0)]
+
+    df["balance"] = df["supply"] - df["demand"]
+    df["status"] = _status(df["balance"].to_numpy())
+    # 시나리오는 입력 순서, 나머지는 값 순서로 정렬
+    df["_k"] = df["scenario"].map({name: i for i, name in enumerate(scenarios)})
+    df = df.sort_values(["_k", "school_year", "dept", "sem"], kind="stable")
+    return df[DEMAND_COLUMNS].reset_index(drop=True)
+
+
+def semester_view(df, school_year, scenario=None):
+    """demand_supply 결과 → 한 학년도의 교과(과) × 학기 표 (화면 표시용)"""
+    if scenario is None and not df.empty:
+        scenario = df["scenario"].iloc[0]
+    part = df[(df["school_year"] == school_year) & (df["scenario"] == scenario)]
+    if part.empty:
+        return pd.DataFrame()
+    wide = part.pivot_table(index="dept", columns="sem", values=["demand", "balance"], aggfunc="sum", fill_value=0)
+    out = pd.DataFrame({"교과(과)": wide.index})
+    supply = part.groupby("dept")["supply"].max()
+    teachers = part.groupby("dept")["teachers"].max()
+    out["교사"] = teachers.reindex(wide.index).to_numpy()
+    out["공급 시수"] = supply.reindex(wide.index).to_numpy()
+    for sem in wide["demand"].columns:
+        out[f"{sem} 수요"] = wide[("demand", sem)].to_numpy()
+        out[f"{sem} 과부족"] = wide[("balance", sem)].to_numpy()
+    worst = wide["balance"].min(axis=1).to_numpy()
+    out["상태"] = _status(worst)
+    return out
@@ -0,0 +1,71 @@
+"""
+derived_cache.py — 화면용 파생 표 캐시
+키: (표 이름, 데이터 버전, 필터 값) → 계산 결과
+데이터 버전은 교육과정·교사 데이터를 새로 불러올 때마다 new_version() 으로 발급하고,
+편집 데이터는 내용 해시(edits_digest)를 덧붙여 바뀌면 버전이 달라지게 한다.
+LRU(MAX_ENTRIES) + TTL(TTL_SECONDS) 로 정리. 프로세스 전체(모든 세션) 공용.
+
+반환값은 캐시에 든 객체 그대로이므로 호출 측에서 수정하지 말 것.
+"""
+import hashlib
+import itertools
+import json
+import time
+from collections import OrderedDict
+
+MAX_ENTRIES = 128     # 보관할 파생 표 수
+TTL_SECONDS = 1800    # 마지막 사용 후 보관 시간
+
+_cache = OrderedDict()    # 키 → (마지막 사용 시각, 값)
+_counter = itertools.count(1)
+_stats = {"hits": 0, "misses": 0}
+
+
+def new_version():
+    """새 데이터 버전 (프로세스 안에서 유일 — 세션끼리 겹치지 않음)"""
+    return f"d{next(_counter)}"
+
+
+def edits_digest(edits):
+    """편집 데이터 내용 해시 (짧은 문자열)"""
+    raw = json.dumps(edits, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def _evict(now):
+    while _cache:
+        key, (used, _) = next(iter(_cache.items()))
+        if len(_cache) > MAX_ENTRIES or now - used > TTL_SECONDS:
+            del _cache[key]
+        else:
+            break
+
+
+def cached_table(name, version, params, build):
+    """
+    (name, version, params) 로 찾고, 없으면 build() 결과를 저장해 반환
+    params 는 해시 가능한 값 (필터 값 튜플 등)
+    """
+    key = (name, version, params)
+    now = time.monotonic()
+    hit = _cache.get(key)
+    if hit is not None and now - hit[0] <= TTL_SECONDS:
+        _stats["hits"] += 1
+        _cache[key] = (now, hit[1])
+        _cache.move_to_end(key)
+        return hit[1]
+
+    _stats["misses"] += 1
+    value = build()
+    _cache[key] = (now, value)
+    _cache.move_to_end(key)
+    _evict(now)
+    return value
+
+
+def clear():
+    _cache.clear()
+
+
+def stats():
+    return {**_stats, "entries": len(_cache)}
@@ -0,0 +1,125 @@
+"""
+district.py — 교육지원청 단위 교과(과)별 수급 집계
+학교별 요약(data/schools/<학교 id>/summary.json, ingest.py --school 이 생성)만 읽어 합산한다.
+학교 원본 데이터·엑셀은 다시 읽지 않으므로 학교가 수백 곳이어도 몇 초 안에 끝난다.
+
+사용:
+  python district.py                          # 학년도·교과(과)·학기별 합계
+  python district.py --year 2026 --schools    # 학교 × 교과(과) 과부족
+  python district.py -o 집계.csv
+"""
+import argparse
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+from demand import _status
+from parser import PARSER_VERSION
+from school import SCHOOLS_DIR, SUMMARY_COLUMNS
+
+DISTRICT_COLUMNS = ["school_year", "dept", "sem", "demand", "supply", "balance", "teachers",
+                    "schools", "short_schools", "status"]
+
+
+# ── 요약 읽기 ─────────────────────────────────────────────────────────────────
+def summary_files(root=SCHOOLS_DIR):
+    return sorted(root.glob("*/summary.json"))
+
+
+def signature(root=SCHOOLS_DIR):
+    """요약 파일 (경로, 수정 시각) 목록 — 바뀌었는지 확인용 (캐시 키)"""
+    return tuple((p.parent.name, p.stat().st_mtime_ns) for p in summary_files(root))
+
+
+def load_summaries(root=SCHOOLS_DIR):
+    """학교별 요약 목록 (읽을 수 없는 파일은 건너뜀)"""
+    out = []
+    for path in summary_files(root):
+        try:
+            with open(path, encoding="utf-8") as f:
+                s = json.load(f)
+        except Exception as e:
+            print(f"요약 읽기 실패, 건너뜀: {path} ({e})")
+            continue
+        if s.get("columns") != SUMMARY_COLUMNS:
+            print(f"요약 형식이 다름, 건너뜀: {path}")
+            continue
+        if s.get("parser_version") != PARSER_VERSION:
+            print(f"⚠️ 이전 파서 버전 요약: {path} — ingest.py --school {s['school_id']} --force 로 갱신 권장")
+        out.append(s)
+    return out
+
+
+def summary_frame(summaries):
+    """요약 목록 → 한 DataFrame (school_id, name + SUMMARY_COLUMNS)"""
+    rows, ids, names = [], [], []
+    for s in summaries:
+        rows.extend(s["rows"])
+        ids.extend([s["school_id"]] * len(s["rows"]))
+        names.extend([s["name"]] * len(s["rows"]))
+    df = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+    df = df.astype({"school_year": np.int64, "demand": np.int64, "supply": np.int64, "teachers": np.int64})
+    df.insert(0, "name", names)
+    df.insert(0, "school_id", ids)
+    return df
+
+
+# ── 집계 ─────────────────────────────────────────────────────────────────────
+def aggregate(frame):
+    """학교별 요약 → 학년도·교과(과)·학기별 합계 (DISTRICT_COLUMNS)"""
+    if frame.empty:
+        return pd.DataFrame(columns=DISTRICT_COLUMNS)
+    frame = frame.assign(_short=(frame["supply"] < frame["demand"]).astype(np.int64))
+    out = (frame.groupby(["school_year", "dept", "sem"], as_index=False, sort=True)
+                .agg(demand=("demand", "sum"), supply=("supply", "sum"), teachers=("teachers", "sum"),
+                     schools=("school_id", "nunique"), short_schools=("_short", "sum")))
+    out["balance"] = out["supply"] - out["demand"]
+    out["status"] = _status(out["balance"].to_numpy())
+    return out[DISTRICT_COLUMNS]
+
+
+def school_balance(frame, school_year):
+    """한 학년도의 학교 × 교과(과) 과부족 (학기 중 가장 부족한 값, 요약에 없는 교과는 0)"""
+    part = frame[frame["school_year"] == school_year]
+    if part.empty:
+        return pd.DataFrame()
+    part = part.assign(balance=part["supply"] - part["demand"])
+    wide = part.pivot_table(index=["school_id", "name"], columns="dept", values="balance",
+                            aggfunc="min", fill_value=0)
+    wide.columns.name = None
+    return wide.reset_index().rename(columns={"school_id": "학교 id", "name": "학교"})
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+def main(year=None, schools=False, out=None):
+    summaries = load_summaries()
+    if not summaries:
+        print(f"학교별 요약 없음: {SCHOOLS_DIR} (ingest.py --school 로 생성)")
+        return False
+    frame = summary_frame(summaries)
+    if schools:
+        table = school_balance(frame, year or int(frame["school_year"].min()))
+    else:
+        table = aggregate(frame)
+        if year:
+            table = table[table["school_year"] == year]
+
+    print(f"학교 {len(summaries)}곳")
+    if out:
+        table.to_csv(out, index=False, encoding="utf-8-sig")
+        print(f"저장: {out}")
+    else:
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            print(table.to_string(index=False))
+    return True
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="교육지원청 단위 교과별 수급 집계")
+    ap.add_argument("--year", type=int, help="학년도")
+    ap.add_argument("--schools", action="store_true", help="학교 × 교과(과) 과부족 표")
+    ap.add_argument("-o", "--out", help="CSV 로 저장")
+    args = ap.parse_args()
+    sys.exit(0 if main(args.year, args.schools, args.out) else 1)
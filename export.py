@@ -0,0 +1,154 @@
+"""
+export.py — 전체 화면 데이터를 엑셀 한 파일로 내보내기
+학년도별 운영 현황 · 교육과정 편성표 · 교과별 수급 · 교사별 시수 · 상치교과 · 편성 가이드를 시트별로 쓴다.
+openpyxl write-only 워크북에 행을 하나씩 흘려 쓰므로 DataFrame·셀 객체를 시트 전체만큼 만들지 않는다.
+
+앱에서는 버튼을 눌렀을 때만 만들고 데이터 버전(편집 포함) 기준으로 캐시한다.
+
+사용:
+  python export.py                                  # 기본 데이터 + 편집 내용 → 교육과정_전체.xlsx
+  python export.py data/schools/hanbit/curriculum_data.json -o 한빛.xlsx
+"""
+import argparse
+import sys
+from io import BytesIO
+from pathlib import Path
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from demand import demand_supply
+from parser import build_index, schedule_keys
+from school import default_profile, load_profile
+from snapshot import load_data
+from storage import load_edits
+from timing import timed
+
+DEFAULT_DATA = Path(__file__).parent / "data" / "curriculum_data.json"
+_BOLD = Font(bold=True)
+
+
+# ── 시트별 행 ─────────────────────────────────────────────────────────────────
+def yearly_sheet(school_year, items, tracks):
+    """운영 현황 한 학년도 → (시트명, 머리행, 행 iterator) — 학과·학기 열은 '학과_학기' 키 순서"""
+    keys = [f"공통_{s}" for s in ("1학기", "2학기")] + [f"{tr}_{s}" for tr in tracks for s in ("1학기", "2학기")]
+    header = ["학년", "입학년도", "영역", "교과군", "과목명"] + [k.replace("_", " ") for k in keys] + ["주간학점"]
+    rows = ([it["grade"], it["entry_year"], it.get("area", ""), it.get("group", ""), it["name"]]
+            + [it["tracks"].get(k) for k in keys] + [it.get("weekly_credits", 0)]
+            for it in items)
+    return f"{school_year} 운영현황", header, rows
+
+
+def curriculum_sheet(curriculum, keys):
+    """편성표 — 과목 한 행, 편성 열(학년|학과|학기)마다 학점"""
+    header = ["입학년도", "영역", "교과군", "과목명", "기준학점", "운영학점"] + [k.replace("|", " ") for k in keys]
+    rows = ([s["entry_year"], s.get("area", ""), s.get("group", ""), s["name"], s.get("std_credits"),
+             s.get("op_credits")] + [s["schedule"].get(k) for k in keys]
+            for s in curriculum)
+    return "편성표", header, rows
+
+
+def demand_sheet(demand):
+    """교과별 수급 (demand.DEMAND_COLUMNS 표)"""
+    header = ["학년도", "교과(과)", "학기", "수요", "공급", "과부족", "교사", "상태"]
+    rows = ([int(r.school_year), r.dept, r.sem, int(r.demand), int(r.supply), int(r.balance), int(r.teachers),
+             r.status] for r in demand.itertuples())
+    return "교과별 수급", header, rows
+
+
+def teacher_sheet(teachers):
+    """교사별 시수 — 학년도 순"""
+    header = ["학년도", "교사명", "교과(과)", "시수", "기간제", "담당 과목", "비고"]
+    rows = ([int(y), t["name"], t.get("dept", ""), t.get("total_credits", 0), "○" if t.get("is_temp") else "",
+             t.get("subject_group", ""), t.get("notes", "")]
+            for y in sorted(teachers) for t in teachers[y])
+    return "교사별 시수", header, rows
+
+
+def cross_sheet(cross_teaching):
+    """상치교과 배정 — {학년도: [행]} (열은 처음 나온 키 순서)"""
+    cols = list(dict.fromkeys(k for y in cross_teaching for r in cross_teaching[y] for k in r))
+    rows = ([int(y)] + [r.get(k) for k in cols] for y in sorted(cross_teaching) for r in cross_teaching[y])
+    return "상치교과", ["학년도"] + cols, rows
+
+
+def guidance_sheet(guidance):
+    header = ["학년", "코호트", "교과군", "과목명", "학과", "학기", "학점"]
+    rows = ([g["grade"], g["cohort"], g.get("group", ""), g["name"], g["track"], g["sem"], g["credits"]]
+            for g in guidance)
+    return "편성 가이드", header, rows
+
+
+# ── 쓰기 ─────────────────────────────────────────────────────────────────────
+@timed("export_xlsx")
+def write_workbook(sheets, out=None):
+    """
+    (시트명, 머리행, 행 iterator) 목록 → xlsx
+    out 이 없으면 bytes 반환, 있으면 그 경로(또는 파일 객체)에 저장
+    """
+    wb = Workbook(write_only=True)
+    for title, header, rows in sheets:
+        ws = wb.create_sheet(title[:31])
+        ws.freeze_panes = "A2"
+        head = []
+        for h in header:
+            cell = WriteOnlyCell(ws, value=h)
+            cell.font = _BOLD
+            head.append(cell)
+        ws.append(head)
+        for row in rows:
+            ws.append(row)
+    if out is not None:
+        wb.save(out)
+        return out
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def export_sheets(data, profile, demand=None, cross_teaching=None):
+    """
+    데이터(curriculum_data.json 형식) → 내보낼 시트 목록
+    demand: demand_supply 결과 (없으면 시트 생략), cross_teaching: edits["cross_teaching"]
+    """
+    yearly = data.get("yearly_view") or {}
+    sheets = [yearly_sheet(sy, yearly[sy], profile.tracks) for sy in sorted(yearly)]
+    sheets.append(curriculum_sheet(data.get("curriculum") or [], schedule_keys(profile.col_map)))
+    if demand is not None:
+        sheets.append(demand_sheet(demand))
+    sheets.append(teacher_sheet(data.get("teachers") or {}))
+    if cross_teaching:
+        sheets.append(cross_sheet(cross_teaching))
+    guidance = data.get("guidance") or data.get("guidance_2027")     # guidance_2027: 이전 형식 데이터
+    if guidance:
+        sheets.append(guidance_sheet(guidance))
+    return sheets
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+def main(data_path=DEFAULT_DATA, out="교육과정_전체.xlsx", school=None):
+    try:
+        data = load_data(data_path)
+    except Exception as e:
+        print(f"데이터 읽기 실패: {data_path} ({e})")
+        return False
+    profile = load_profile(school) if school else default_profile()
+    edits = load_edits()
+    if school:
+        edits = edits.get("schools", {}).get(school, {})
+    curriculum = data.get("curriculum", [])
+    demand = demand_supply(curriculum, data.get("teachers", {}), profile.school_years,
+                           scenarios={"현재": profile.class_counts}, index=build_index(curriculum, profile))
+    write_workbook(export_sheets(data, profile, demand, edits.get("cross_teaching")), out)
+    print(f"✅ {out}")
+    return True
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="전체 화면 데이터를 엑셀 한 파일로 내보내기")
+    ap.add_argument("data", nargs="?", default=str(DEFAULT_DATA), help="curriculum_data.json 또는 .snap")
+    ap.add_argument("-o", "--out", default="교육과정_전체.xlsx", help="저장할 xlsx")
+    ap.add_argument("--school", help="학교 id (school.py 프로필·학교별 편집 데이터 사용)")
+    args = ap.parse_args()
+    sys.exit(0 if main(args.data, args.out, args.school) else 1)
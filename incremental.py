@@ -0,0 +1,195 @@
+"""
+incremental.py — 수정본 엑셀 재업로드 시 바뀐 시트만 다시 파싱 + 변경 내역
+시트 지문 = 시트 XML 의 셀 데이터(<sheetData>) + 그 시트가 참조하는 공유 문자열(sharedStrings) 내용의 해시.
+(열 너비·선택 셀·dimension 처럼 값과 무관한 부분은 제외)
+xlsx(zip) 안의 XML 만 읽으므로 셀을 파싱하는 것보다 훨씬 빠르다.
+지문이 같은 시트는 이전 파싱 결과를 그대로 쓰고, 바뀐 시트만 parse_*_file(sheets=…) 로 다시 파싱한다.
+
+상태(state)는 세션에 파싱 결과와 함께 보관:
+  {"key": 파서 버전·양식 해시, "sheets": {시트명: 지문}, "data": 시트별 파싱 결과를 합친 값}
+키가 다르면(파서 버전·학교 양식 변경) 전체를 다시 파싱한다.
+"""
+import hashlib
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+from parser import (PARSER_VERSION, CURRICULUM_YEARS, SCHOOL_YEARS, parse_curriculum_file,
+                    parse_allocation_file, _pick_curriculum_sheets, _alloc_year)
+from parse_cache import cached_parse
+from curriculum_diff import match_subjects, schedule_delta, schedule_text
+
+_NS = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+       "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+       "rel": "http://schemas.openxmlformats.org/package/2006/relationships"}
+_SHARED_REF = re.compile(rb'<c\b[^>]*\bt="s"[^>]*>\s*<v>(\d+)</v>')
+_SHEET_DATA = re.compile(rb"<sheetData\s*/>|<sheetData\b.*?</sheetData>", re.S)
+
+
+# ── 시트 지문 ─────────────────────────────────────────────────────────────────
+def _zip_path(target):
+    return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+
+
+def sheet_fingerprints(content):
+    """xlsx bytes → {시트명: 지문}"""
+    with zipfile.ZipFile(BytesIO(content)) as z:
+        rels = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
+        paths = {r.get("Id"): _zip_path(r.get("Target")) for r in rels.findall("rel:Relationship", _NS)}
+        shared = []
+        if "xl/sharedStrings.xml" in z.namelist():
+            root = ET.fromstring(z.read("xl/sharedStrings.xml"))
+            shared = ["".join(si.itertext()).encode("utf-8") for si in root.findall("m:si", _NS)]
+
+        out = {}
+        workbook = ET.fromstring(z.read("xl/workbook.xml"))
+        for sheet in workbook.findall("m:sheets/m:sheet", _NS):
+            xml = z.read(paths[sheet.get(f"{{{_NS['r']}}}id")])
+            m = _SHEET_DATA.search(xml)
+            data = m.group(0) if m else b""
+            # 공유 문자열 번호 대신 내용을 넣어 해시 — 다시 저장하면서 번호만 바뀐 경우는 같은 지문
+            h = hashlib.sha1()
+            pos = 0
+            for ref in _SHARED_REF.finditer(data):
+                i = int(ref.group(1))
+                h.update(data[pos:ref.start(1)])
+                h.update(shared[i] if i < len(shared) else b"")
+                pos = ref.end(1)
+            h.update(data[pos:])
+            out[sheet.get("name")] = h.hexdigest()
+        return out
+
+
+def _state_key(profile):
+    return f"v{PARSER_VERSION}-{profile.key() if profile else 'default'}"
+
+
+def same_layout(state, profile=None):
+    """이전 상태를 이어 쓸 수 있는지 (상태가 있고 파서 버전·양식이 같음)"""
+    return bool(state) and state.get("key") == _state_key(profile)
+
+
+def _changed_sheets(fps, targets, state, profile):
+    """대상 시트 중 다시 파싱할 시트명 (이전 상태가 없거나 키가 다르면 전부)"""
+    if not same_layout(state, profile):
+        return set(targets.values()), True
+    old = state["sheets"]
+    return {n for n in targets.values() if old.get(n) != fps[n]}, False
+
+
+# ── 단위배당표 ────────────────────────────────────────────────────────────────
+def reparse_curriculum(content, state=None, profile=None):
+    """
+    단위배당표 bytes → (curriculum, 새 상태, 바뀐 입학년도 set)
+    바뀐 시트의 입학년도만 다시 파싱하고 나머지 코호트 과목은 이전 결과(같은 dict 객체)를 그대로 씀
+    """
+    fps = sheet_fingerprints(content)
+    targets = _pick_curriculum_sheets(fps, profile.entry_years if profile else CURRICULUM_YEARS)
+    changed, full = _changed_sheets(fps, targets, state, profile)
+
+    if full:
+        curriculum = cached_parse(parse_curriculum_file, BytesIO(content), profile)
+        years = set(targets)
+    else:
+        fresh = parse_curriculum_file(BytesIO(content), profile=profile, sheets=changed) if changed else []
+        old_years = {sub["entry_year"] for sub in state["data"]}
+        years = {y for y, n in targets.items() if n in changed} | (old_years - set(targets))
+        by_year = {}
+        for sub in fresh:
+            by_year.setdefault(sub["entry_year"], []).append(sub)
+        for sub in state["data"]:
+            if sub["entry_year"] not in years:
+                by_year.setdefault(sub["entry_year"], []).append(sub)
+        curriculum = [sub for y in sorted(by_year) for sub in by_year[y]]   # 전체 파싱과 같은 입학년도 순서
+
+    new_state = {"key": _state_key(profile), "sheets": {n: fps[n] for n in targets.values()}, "data": curriculum}
+    return curriculum, new_state, years
+
+
+# ── 교과배정표 ────────────────────────────────────────────────────────────────
+def reparse_allocation(content, state=None, profile=None):
+    """
+    교과배정표 bytes → (교사 dict, 교과군 dict, 새 상태, 바뀐 학년도 set)
+    상태의 data 는 교원양식을 덮어쓰기 전 교과배정표 그대로의 교사 dict
+    """
+    fps = sheet_fingerprints(content)
+    school_years = profile.school_years if profile else SCHOOL_YEARS
+    targets = {_alloc_year(n, school_years): n for n in fps}
+    targets.pop(None, None)
+    changed, full = _changed_sheets(fps, targets, state, profile)
+
+    if full:
+        teachers, _ = cached_parse(parse_allocation_file, BytesIO(content), profile)
+        years = set(targets)
+    else:
+        fresh = parse_allocation_file(BytesIO(content), profile=profile, sheets=changed)[0] if changed else {}
+        years = {y for y, n in targets.items() if n in changed} | ({int(y) for y in state["data"]} - set(targets))
+        teachers = {str(y): fresh[str(y)] if y in years else state["data"][str(y)] for y in sorted(targets)}
+
+    dept_groups = {y: [] for y in teachers}
+    new_state = {"key": _state_key(profile), "sheets": {n: fps[n] for n in targets.values()}, "data": teachers}
+    return teachers, dept_groups, new_state, years
+
+
+# ── 변경 내역 ─────────────────────────────────────────────────────────────────
+DIFF_COLUMNS = ["구분", "연도", "이름", "교과", "내용"]
+
+
+def _keyed_teachers(teachers):
+    """
+    [교사] → {(이름, 교과, 순번): 교사}
+    기간제·강사는 이름이 '기간제' 처럼 같게 들어오므로 같은 (이름, 교과) 중 몇 번째인지로 구분
+    """
+    out, seen = {}, {}
+    for t in teachers:
+        k = (t["name"], t.get("dept", ""))
+        seen[k] = seen.get(k, 0) + 1
+        out[k + (seen[k],)] = t
+    return out
+
+
+def teacher_diff(old, new, years=None):
+    """
+    {학년도: [교사]} 두 개 → 변경 행 리스트 (교사 추가·삭제·시수 변경)
+    같은 학년도 안에서 (이름, 교과, 순번) 으로 짝지음. years 가 있으면 그 학년도만 비교
+    """
+    rows = []
+    keys = sorted(set(old) | set(new)) if years is None else [str(y) for y in sorted(years)]
+    for y in keys:
+        before = _keyed_teachers(old.get(y, []))
+        after = _keyed_teachers(new.get(y, []))
+        for key in after.keys() - before.keys():
+            rows.append({"구분": "교사 추가", "연도": int(y), "이름": key[0], "교과": key[1],
+                         "내용": f"{after[key].get('total_credits', 0)}시수"})
+        for key in before.keys() - after.keys():
+            rows.append({"구분": "교사 삭제", "연도": int(y), "이름": key[0], "교과": key[1],
+                         "내용": f"{before[key].get('total_credits', 0)}시수"})
+        for key in before.keys() & after.keys():
+            a, b = before[key].get("total_credits", 0), after[key].get("total_credits", 0)
+            if a != b:
+                rows.append({"구분": "시수 변경", "연도": int(y), "이름": key[0], "교과": key[1],
+                             "내용": f"{a} → {b}"})
+    return sorted(rows, key=lambda r: (r["연도"], r["구분"], r["교과"], r["이름"]))
+
+
+def subject_diff(old, new, years=None):
+    """
+    curriculum 두 개 → 변경 행 리스트 (과목 추가·삭제·편성 변경)
+    curriculum_diff.match_subjects 로 (입학년도, 과목명) 짝지음. years 가 있으면 그 입학년도만 비교
+    """
+    added, removed, pairs = match_subjects(old, new, years=years)
+    rows = []
+    for sub in added:
+        rows.append({"구분": "과목 추가", "연도": sub["entry_year"], "이름": sub["name"], "교과": sub.get("group", ""),
+                     "내용": schedule_text(sub["schedule"])})
+    for sub in removed:
+        rows.append({"구분": "과목 삭제", "연도": sub["entry_year"], "이름": sub["name"], "교과": sub.get("group", ""),
+                     "내용": schedule_text(sub["schedule"])})
+    for a, b in pairs:
+        delta = schedule_delta(a["schedule"], b["schedule"])
+        if delta:
+            changes = [f"{k}: {a['schedule'].get(k, '-')} → {b['schedule'].get(k, '-')}" for k in delta]
+            rows.append({"구분": "편성 변경", "연도": b["entry_year"], "이름": b["name"], "교과": b.get("group", ""),
+                         "내용": ", ".join(changes)})
+    return sorted(rows, key=lambda r: (r["연도"], r["구분"], r["이름"]))
@@ -0,0 +1,211 @@
+"""
+ingest.py — 엑셀 일괄 파싱 (Streamlit 없이 실행)
+폴더 안의 단위배당표 / 교과배정표 / 교원정보 엑셀을 파싱해
+앱이 바로 읽는 curriculum_data.json 또는 스냅샷(.snap)을 만든다.
+yearly_view·편성 가이드(guidance) 까지 미리 계산해 넣으므로 서버에서는 파싱하지 않는다.
+
+입력 파일 해시는 결과 meta["inputs"] 에 기록되고, 다음 실행 때 모두 같으면 건너뛴다.
+파일별 파싱 결과는 parse_cache 디스크 캐시를 함께 쓴다.
+
+--school 로 학교를 지정하면 그 학교 양식(school.py 프로필)으로 파싱해 학교별 폴더에 저장하고,
+교육지원청 집계(district.py)용 교과별 요약(summary.json)도 함께 만든다.
+
+사용:
+  python ingest.py 엑셀폴더/                                   # → data/curriculum_data.json
+  python ingest.py 엑셀폴더/ -o data/curriculum_data.snap      # → 스냅샷
+  python ingest.py 엑셀폴더/ --workers 3 --force
+  python ingest.py 엑셀폴더/ --school hanbit                   # → data/schools/hanbit/
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from parser import (parse_curriculum_file, parse_allocation_file, parse_teacher_form,
+                    build_index, build_yearly_views, guidance_rows, view_years, guidance_years,
+                    SCHOOL_YEARS, PARSER_VERSION)
+from parse_cache import cached_parse
+from school import default_profile, load_profile, data_path, build_summary, write_summary
+from snapshot import write_snapshot, load_snapshot, load_data
+
+DEFAULT_OUT = Path(__file__).parent / "data" / "curriculum_data.json"
+
+# 파일 종류 → (파일명 키워드, 파서)
+KINDS = {
+    "curriculum": ("단위배당", parse_curriculum_file),
+    "allocation": ("교과배정", parse_allocation_file),
+    "teacher_form": ("교원", parse_teacher_form),
+}
+
+
+# ── 입력 파일 ─────────────────────────────────────────────────────────────────
+def find_inputs(src_dir):
+    """
+    폴더 → {종류: 경로} (파일명 키워드로 구분)
+    같은 종류가 여러 개면 가장 최근에 수정된 파일 사용
+    """
+    candidates = {}
+    for path in sorted(Path(src_dir).glob("*.xlsx")):
+        if path.name.startswith("~$"):   # 엑셀 임시 파일
+            continue
+        kind = next((k for k, (keyword, _) in KINDS.items() if keyword in path.name), None)
+        if kind:
+            candidates.setdefault(kind, []).append(path)
+
+    found = {}
+    for kind, paths in candidates.items():
+        found[kind] = max(paths, key=lambda p: p.stat().st_mtime)
+        for p in paths:
+            if p != found[kind]:
+                print(f"  건너뜀 (더 최근 {kind} 파일 있음): {p.name}")
+    return found
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _input_manifest(inputs):
+    return {kind: {"file": path.name, "sha256": file_digest(path)} for kind, path in inputs.items()}
+
+
+def _previous_meta(out_path):
+    """기존 결과 파일의 meta (없거나 읽을 수 없으면 None)"""
+    if not out_path.exists():
+        return None
+    try:
+        if out_path.suffix == ".json":
+            with open(out_path, encoding="utf-8") as f:
+                return json.load(f).get("meta")
+        return load_snapshot(out_path, tables=["meta"]).get("meta")
+    except Exception:
+        return None
+
+
+# ── 파싱 ─────────────────────────────────────────────────────────────────────
+def _parse_task(task):
+    """프로세스 풀 작업 단위 — (종류, 경로, 학교 양식) → (종류, 파싱 결과)"""
+    kind, path, profile = task
+    # 교원정보 양식은 학교 공통
+    return kind, cached_parse(KINDS[kind][1], path, profile if kind != "teacher_form" else None)
+
+
+def parse_inputs(inputs, workers=1, profile=None):
+    """{종류: 경로} → {종류: 파싱 결과} (workers > 1 이면 파일별 병렬)"""
+    tasks = [(kind, path, profile) for kind, path in sorted(inputs.items())]
+    n = min(workers, len(tasks))
+    if n > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=n) as pool:
+                return dict(pool.map(_parse_task, tasks))
+        except Exception as e:
+            print(f"병렬 파싱 실패, 순차 파싱으로 전환: {e}")
+    return dict(_parse_task(t) for t in tasks)
+
+
+def build_data(parsed, manifest, profile=None):
+    """
+    파싱 결과 → curriculum_data.json 구조 (yearly_view·guidance 포함)
+    profile: 학교 양식 — 있으면 그 학교의 축·학년도로 계산하고 meta 에 양식을 함께 저장
+    """
+    curriculum = parsed["curriculum"]
+    teachers, dept_groups = parsed["allocation"]
+    # 교원양식이 있으면 해당 학년도 교사 목록을 덮어씀 (앱 파싱 버튼과 동일)
+    for yr_k, t_list in parsed.get("teacher_form", {}).items():
+        teachers[yr_k] = t_list
+
+    index = build_index(curriculum, profile)
+    school_years = profile.school_years if profile else SCHOOL_YEARS
+    guide_year = guidance_years(school_years)[0]
+    meta = {
+        "school": (profile or default_profile()).name,
+        "generated": datetime.now().strftime("%Y-%m"),
+        "tracks": (profile or default_profile()).tracks,
+        "parser_version": PARSER_VERSION,
+        "inputs": manifest,
+        "guidance_year": guide_year,
+    }
+    if profile:
+        meta["profile"] = profile.to_dict()
+    return {
+        "curriculum": curriculum,
+        "teachers": teachers,
+        "dept_groups": dept_groups,
+        "yearly_view": build_yearly_views(view_years(school_years), curriculum, index),   # 앱 학년도 선택과 같은 학년도
+        "guidance": guidance_rows(guide_year, curriculum, index),
+        "meta": meta,
+    }
+
+
+def write_data(data, out_path):
+    """확장자에 따라 JSON 또는 스냅샷으로 저장 (임시 파일 → 교체)"""
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if out_path.suffix == ".json":
+        tmp = out_path.with_name(out_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, out_path)
+    else:
+        write_snapshot(data, out_path)
+
+
+def ingest(src_dir, out_path=None, workers=1, force=False, school=None):
+    """
+    폴더 → 결과 파일. 성공(또는 변경 없음)이면 True
+    단위배당표·교과배정표는 필수, 교원정보는 선택
+    school: 학교 id — 그 학교 양식으로 파싱해 학교별 폴더(out_path 기본값)에 저장 + 교과별 요약
+    """
+    try:
+        profile = load_profile(school) if school else None
+    except Exception as e:
+        print(f"학교 양식을 읽을 수 없음: {school} ({e})")
+        return False
+    out_path = Path(out_path or (data_path(school) if school else DEFAULT_OUT))
+    inputs = find_inputs(src_dir)
+    missing = [KINDS[k][0] for k in ("curriculum", "allocation") if k not in inputs]
+    if missing:
+        print(f"입력 파일 없음: {', '.join(missing)} (폴더: {src_dir})")
+        return False
+
+    manifest = _input_manifest(inputs)
+    prev = _previous_meta(out_path)
+    if (not force and prev and prev.get("inputs") == manifest and prev.get("parser_version") == PARSER_VERSION
+            and prev.get("profile") == (profile.to_dict() if profile else None)):
+        print(f"변경 없음 — 건너뜀: {out_path}")
+        if profile and not (out_path.parent / "summary.json").exists():
+            write_summary(build_summary(load_data(out_path), profile))
+        return True
+
+    for kind, path in sorted(inputs.items()):
+        print(f"  {kind}: {path.name}")
+    try:
+        data = build_data(parse_inputs(inputs, workers, profile), manifest, profile)
+        write_data(data, out_path)
+        if profile:
+            write_summary(build_summary(data, profile))
+    except Exception as e:
+        print(f"파싱 오류: {e}")
+        return False
+
+    n_teachers = sum(len(v) for v in data["teachers"].values())
+    print(f"✅ {out_path} — 과목 {len(data['curriculum'])}개 · 교사 {n_teachers}명")
+    return True
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="교육과정 엑셀 일괄 파싱")
+    ap.add_argument("src", help="단위배당표·교과배정표·교원정보 xlsx 가 있는 폴더")
+    ap.add_argument("-o", "--out", help="결과 파일 (.json 또는 .snap, 기본: data/curriculum_data.json 또는 학교별 폴더)")
+    ap.add_argument("--workers", type=int, default=min(3, os.cpu_count() or 1), help="파일 병렬 파싱 프로세스 수")
+    ap.add_argument("--force", action="store_true", help="입력이 그대로여도 다시 생성")
+    ap.add_argument("--school", help="학교 id (school.py 프로필) — 학교별 폴더에 저장 + 교과별 요약")
+    args = ap.parse_args()
+    sys.exit(0 if ingest(args.src, args.out, args.workers, args.force, args.school) else 1)
@@ -0,0 +1,100 @@
+"""
+parse_cache.py — 업로드 엑셀 파싱 결과 캐시
+키: 파일 바이트 해시 + 파서 함수명 + 파서 버전 (+ 학교별 양식 해시)
+메모리(LRU, 개수 제한) → 디스크(data/parse_cache/) 순으로 조회
+"""
+import copy
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+
+from parser import PARSER_VERSION
+
+CACHE_DIR = Path(__file__).parent / "data" / "parse_cache"
+MEMORY_MAX = 16     # 메모리에 유지할 결과 수
+DISK_MAX = 64       # 디스크에 유지할 결과 파일 수
+
+_memory = OrderedDict()
+
+
+def read_bytes(file_obj):
+    """업로드 파일 / 경로 → bytes (업로드 객체는 읽은 위치와 무관하게 전체 내용)"""
+    if hasattr(file_obj, "getvalue"):
+        return file_obj.getvalue()
+    if hasattr(file_obj, "read"):
+        return file_obj.read()
+    with open(file_obj, "rb") as f:
+        return f.read()
+
+
+def cache_key(parse_fn, content, profile=None):
+    digest = hashlib.sha256(content).hexdigest()
+    key = f"{parse_fn.__name__}-v{PARSER_VERSION}-{digest}"
+    return f"{key}-{profile.key()}" if profile else key
+
+
+def _remember(key, result):
+    _memory[key] = result
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_MAX:
+        _memory.popitem(last=False)
+
+
+def _load_disk(key):
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        with open(path, encoding="utf-8") as f:
+            d = json.load(f)
+        os.utime(path)   # 최근 사용 표시 (디스크 정리 기준)
+    except Exception:
+        return None
+    result = d["result"]
+    return tuple(result) if d.get("tuple") else result
+
+
+def _save_disk(key, result):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = CACHE_DIR / f"{key}.json"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"result": result, "tuple": isinstance(result, tuple)}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+        files = sorted(CACHE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for old in files[:-DISK_MAX]:
+            old.unlink(missing_ok=True)
+    except Exception as e:
+        print(f"캐시 저장 오류: {e}")
+
+
+def cached_parse(parse_fn, file_obj, profile=None):
+    """
+    parse_fn(file_obj) 결과를 캐시에서 찾고, 없으면 파싱 후 저장
+    반환값은 복사본이므로 호출 측에서 수정해도 캐시는 그대로
+    profile: 학교별 양식 — 있으면 parse_fn(file_obj, profile=profile), 양식 해시도 키에 포함
+    """
+    content = read_bytes(file_obj)
+    key = cache_key(parse_fn, content, profile)
+
+    if key in _memory:
+        _memory.move_to_end(key)
+        return copy.deepcopy(_memory[key])
+
+    result = _load_disk(key)
+    if result is None:
+        result = parse_fn(BytesIO(content), profile=profile) if profile else parse_fn(BytesIO(content))
+        _save_disk(key, result)
+    _remember(key, result)
+    return copy.deepcopy(result)
+
+
+def clear_cache(disk=False):
+    """메모리 캐시 비우기 (disk=True 면 디스크 캐시도 삭제)"""
+    _memory.clear()
+    if disk and CACHE_DIR.exists():
+        for p in CACHE_DIR.glob("*.json"):
+            p.unlink(missing_ok=True)
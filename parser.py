@@ -2,8 +2,22 @@
 parser.py — 교육과정 엑셀 파일 파싱 모듈
 단위배당표 / 교과배정표를 읽어 구조화된 데이터로 변환
 """
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 from io import BytesIO
+from openpyxl import load_workbook
+
+from curriculum_index import CurriculumIndex
+from timing import stage, timed
+
+# 파싱 결과가 달라지는 변경 시 올릴 것 — 파싱 캐시(parse_cache.py) 키에 포함됨
+PARSER_VERSION = "3"
+
+# 시트 병렬 파싱 프로세스 수 (0·1 이면 순차 파싱) — 함수 인자 workers 로 호출별 지정 가능
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", "0"))
 
 # ── 단위배당표 컬럼 맵 ─────────────────────────────────────────────────────────
 # 헤더 구조 (R4 기준):
@@ -31,6 +45,24 @@ COL_MAP = [
     (33, "3학년", "세무행정", "2학기"),
 ]
 
+# schedule 배열 축 (COL_MAP 에 나온 순서)
+SCHEDULE_AXES = tuple(
+    list(dict.fromkeys(entry[i] for entry in COL_MAP)) for i in (1, 2, 3)
+)   # (["1학년", "2학년", "3학년"], ["공통", "세무회계", "관세무역", "세무행정"], ["1학기", "2학기"])
+
+# 반 수 (학과별)
+TRACK_COUNTS = {"세무회계": 3, "관세무역": 3, "세무행정": 2}  # 2·3학년 공통
+G1_COUNT = 8  # 1학년 반 수
+CLASS_COUNTS = {("1학년", "공통"): G1_COUNT,
+                **{(g, tr): n for g in ("2학년", "3학년") for tr, n in TRACK_COUNTS.items()}}
+
+# 파싱 대상 연도 — 단위배당표 시트명의 입학년도, 교과배정표 시트명의 학년도
+CURRICULUM_YEARS = [2024, 2025, 2026]
+SCHOOL_YEARS = [2025, 2026, 2027, 2028]
+ALLOC_TOTAL_COL = 28   # 교과배정표 시수 합계 열
+
+# 다른 학교는 school.SchoolProfile 로 위 값들을 바꿔 parse_* / build_index 에 profile= 로 넘긴다.
+
 # 과목명 키워드 → 교과(과) 매핑
 DEPT_KEYWORD_MAP = {
     "공통국어": "국어과", "문학": "국어과", "화법": "국어과", "독서": "국어과",
@@ -50,6 +82,16 @@ DEPT_KEYWORD_MAP = {
 }
 
 
+def view_years(school_years=SCHOOL_YEARS):
+    """운영 현황(yearly_view)·학년도 선택 학년도 — 교과배정표 마지막 학년도는 뺌 (앱·ingest 공용)"""
+    return list(school_years[:-1] or school_years)
+
+
+def guidance_years(school_years=SCHOOL_YEARS):
+    """편성 가이드 대상 학년도 — 운영 현황 마지막 학년도부터 교과배정표 다음 학년도까지 (기본 2027~2029)"""
+    return list(range(view_years(school_years)[-1], max(school_years) + 2))
+
+
 def _g(rv, i, default=""):
     """행 값 안전 추출"""
     if i < len(rv) and pd.notna(rv[i]):
@@ -57,97 +99,212 @@ def _g(rv, i, default=""):
     return default
 
 
-def _float(s):
+# pd.read_excel 이 결측으로 처리하는 문자열 (엑셀 오류값 포함)
+_NA_STRINGS = {"", "nan", "NaN", "NA", "N/A", "n/a", "#N/A", "null", "NULL", "None",
+               "#REF!", "#VALUE!", "#DIV/0!", "#NAME?", "#NUM!", "#NULL!"}
+
+
+def _cell(v):
+    """openpyxl 셀 값 → pd.read_excel 과 같은 표현 (정수형 실수는 int, 결측은 None)"""
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    if isinstance(v, str) and v.strip() in _NA_STRINGS:
+        return None
+    return v
+
+
+@timed("read_workbook")
+def _read_sheets(content, pick, usecols):
+    """
+    읽기 전용(read-only) 모드로 워크북을 열어 필요한 시트·열만 스트리밍으로 읽기
+    pick(sheetnames) → {키: 시트명}  — 시트 이름만 보고 대상 시트를 먼저 고름
+    usecols 밖의 열은 None 으로 두어 열 위치는 원본과 동일하게 유지
+    """
+    wb = load_workbook(BytesIO(content), read_only=True, data_only=True, keep_links=False)
     try:
-        return float(str(s).split()[0])
-    except Exception:
-        return 0.0
+        targets = pick(wb.sheetnames)
+        width = max(usecols) + 1
+        keep = [c in usecols for c in range(width)]
+        frames = {}
+        for key, sheet_name in targets.items():
+            rows = [
+                [_cell(v) if k else None for v, k in zip(r, keep)]
+                for r in wb[sheet_name].iter_rows(max_col=width, values_only=True)
+            ]
+            frames[key] = pd.DataFrame(rows, columns=range(width)) if rows else pd.DataFrame(columns=range(width))
+        return frames
+    finally:
+        wb.close()
+
+
+def _compile_dept_matcher(keyword_map):
+    """
+    키워드 전체를 하나의 정규식으로 컴파일
+    전방탐색(?=…)으로 모든 시작 위치에서 겹치는 매칭까지 찾고,
+    길이 역순으로 나열해 같은 위치에서는 가장 긴 키워드가 잡히도록 함
+    """
+    kws = sorted(keyword_map, key=len, reverse=True)
+    return re.compile("(?=(" + "|".join(map(re.escape, kws)) + "))")
+
+
+_DEPT_RE = _compile_dept_matcher(DEPT_KEYWORD_MAP)
+_DEPT_MEMO = {}
+
+
+def refresh_dept_matcher():
+    """DEPT_KEYWORD_MAP 을 수정한 뒤 호출 — 매처 재컴파일 + 메모 초기화"""
+    global _DEPT_RE
+    _DEPT_RE = _compile_dept_matcher(DEPT_KEYWORD_MAP)
+    _DEPT_MEMO.clear()
 
 
 def guess_dept(subject_name):
-    for kw, dept in DEPT_KEYWORD_MAP.items():
-        if kw in subject_name:
-            return dept
-    return "기타"
+    """
+    과목명 → 교과(과)
+    여러 키워드가 들어 있으면 가장 긴 키워드 우선 (길이가 같으면 앞쪽 키워드)
+    """
+    dept = _DEPT_MEMO.get(subject_name)
+    if dept is None:
+        best = ""
+        for m in _DEPT_RE.finditer(subject_name):
+            if len(m.group(1)) > len(best):
+                best = m.group(1)
+        dept = DEPT_KEYWORD_MAP[best] if best else "기타"
+        _DEPT_MEMO[subject_name] = dept
+    return dept
 
 
 # ── 단위배당표 파싱 ────────────────────────────────────────────────────────────
-def _parse_sheet(df, entry_year):
-    subjects = []
-    current_area = None
-    current_group = None
-    skip_words = {"교과", "과목", "학년", "보통", "전문", "창의", "이수",
-                  "학기", "영역", "구분", "비고", "nan", ""}
+AREA_EXCLUDE = ["소계", "학점", "합계", "교과", "보통", "전문", "창의", "이수"]
+GROUP_EXCLUDE = {"보통 교과 (군)", "전문 교과 구분"}
+SKIP_WORDS = {"교과", "과목", "학년", "보통", "전문", "창의", "이수",
+              "학기", "영역", "구분", "비고", "nan", ""}
 
-    for idx, row in df.iterrows():
-        if idx < 5:
-            continue
-        rv = list(row)
 
-        area = _g(rv, 0)
-        group = _g(rv, 1)
-        name = _g(rv, 4)
+def schedule_keys(col_map):
+    return [f"{grade}|{track}|{sem}" for _, grade, track, sem in col_map]
 
-        if area and not any(x in area for x in ["소계", "학점", "합계", "교과", "보통", "전문", "창의", "이수"]):
-            current_area = area
-        if group and group not in {"보통 교과 (군)", "전문 교과 구분"}:
-            current_group = group
 
-        if not name or name in skip_words or len(name) < 2:
-            continue
+SCHEDULE_KEYS = schedule_keys(COL_MAP)
 
-        std = _float(_g(rv, 5)) if _g(rv, 5) else 0
-        op = _float(_g(rv, 6)) if _g(rv, 6) else 0
-        if std == 0 and op == 0:
-            continue
 
-        schedule = {}
-        for col, grade, track, sem in COL_MAP:
-            val_str = _g(rv, col)
-            if not val_str:
-                continue
-            v = _float(val_str)
-            if v > 0:
-                schedule[f"{grade}|{track}|{sem}"] = int(v)
-
-        if schedule:
-            subjects.append({
-                "entry_year": entry_year,
-                "area": (current_area or "기타").replace("\n", ""),
-                "group": (current_group or "").replace("\n", ""),
-                "name": name,
-                "std_credits": int(std),
-                "op_credits": int(op),
-                "schedule": schedule,
-            })
+def _clean_col(s):
+    """열 단위 _g: 문자열화 + 공백·줄바꿈·NBSP 제거, 결측은 빈 문자열"""
+    na = s.isna()
+    out = (s.astype(str).str.strip()
+           .str.replace("\n", "", regex=False)
+           .str.replace("\xa0", "", regex=False))
+    return out.mask(na, "")
+
+
+def _float_col(s):
+    """열 단위 _float: 첫 토큰을 숫자로 변환, 실패·빈칸은 0"""
+    first = s.str.replace(r"\s.*", "", regex=True)
+    return pd.to_numeric(first, errors="coerce").fillna(0.0)
+
+
+@timed("parse_sheet")
+def _parse_sheet(df, entry_year, col_map=COL_MAP):
+    """단위배당표 시트 → 과목 리스트 (행 반복 없이 열 단위로 정제·필터링)"""
+    keys = SCHEDULE_KEYS if col_map is COL_MAP else schedule_keys(col_map)
+    df = df.loc[df.index >= 5].reindex(columns=range(max(curriculum_cols(col_map)) + 1))
+    if df.empty:
+        return []
+
+    area = _clean_col(df[0])
+    group = _clean_col(df[1])
+    name = _clean_col(df[4])
+
+    # 영역·교과군은 값이 있는 행에서 아래로 채움 (병합 셀)
+    area_ok = (area != "") & ~area.str.contains("|".join(AREA_EXCLUDE), regex=True)
+    current_area = area.where(area_ok).ffill().fillna("기타")
+    group_ok = (group != "") & ~group.isin(GROUP_EXCLUDE)
+    current_group = group.where(group_ok).ffill().fillna("")
+
+    name_ok = (name != "") & ~name.isin(SKIP_WORDS) & (name.str.len() >= 2)
+    std = _float_col(_clean_col(df[5]))
+    op = _float_col(_clean_col(df[6]))
+    credit_ok = (std != 0) | (op != 0)
+
+    # COL_MAP 편성 열(기본 14개)을 한 번에 정제 → (행 × 열) 학점 배열
+    block = df[[col for col, _, _, _ in col_map]]
+    flat = _clean_col(pd.Series(block.to_numpy().ravel(), dtype=object))
+    values = _float_col(flat).to_numpy().reshape(block.shape)
+    has_credit = values > 0
+    credits = np.trunc(values).astype(np.int64)
+
+    keep = (name_ok & credit_ok).to_numpy() & has_credit.any(axis=1)
+    rows = np.flatnonzero(keep)
+
+    subjects = []
+    for mask, cred, a, g, n, s, o in zip(has_credit[rows].tolist(), credits[rows].tolist(),
+                                         current_area.to_numpy()[rows], current_group.to_numpy()[rows],
+                                         name.to_numpy()[rows], std.to_numpy()[rows], op.to_numpy()[rows]):
+        subjects.append({
+            "entry_year": entry_year,
+            "area": str(a),
+            "group": str(g),
+            "name": str(n),
+            "std_credits": int(s),
+            "op_credits": int(o),
+            "schedule": {k: c for k, m, c in zip(keys, mask, cred) if m},
+        })
 
     return subjects
 
 
-def parse_curriculum_file(file_obj):
-    """단위배당표 xlsx → 과목 리스트"""
-    content = file_obj.read() if hasattr(file_obj, "read") else open(file_obj, "rb").read()
-    sheets = pd.read_excel(BytesIO(content), sheet_name=None, header=None)
+def curriculum_cols(col_map):
+    """단위배당표에서 읽는 열: 0~6(영역·교과군·과목·학점) + 편성 열"""
+    return set(range(7)) | {col for col, _, _, _ in col_map}
 
+
+CURRICULUM_COLS = curriculum_cols(COL_MAP)
+
+
+def _pick_curriculum_sheets(sheet_names, entry_years=CURRICULUM_YEARS):
+    """시트명에 입학년도(기본 2024~2026)가 들어간 시트만 선택 (여러 연도가 들어 있으면 가장 늦은 연도)"""
     sheet_map = {}
-    for name in sheets.keys():
-        if "2026" in name:
-            sheet_map[2026] = name
-        elif "2025" in name:
-            sheet_map[2025] = name
-        elif "2024" in name:
-            sheet_map[2024] = name
+    for name in sheet_names:
+        year = next((y for y in sorted(entry_years, reverse=True) if str(y) in name), None)
+        if year is not None:
+            sheet_map[year] = name
+    return sheet_map
+
+
+def parse_curriculum_file(file_obj, workers=None, profile=None, sheets=None):
+    """
+    단위배당표 xlsx → 과목 리스트 (대상 시트·열만 스트리밍으로 읽음)
+    workers: 시트별 병렬 파싱 프로세스 수 (None 이면 PARSE_WORKERS)
+    profile: 학교별 양식 (school.SchoolProfile, None 이면 이 모듈의 기본값)
+    sheets: 이 시트명들만 파싱 (None 이면 대상 시트 전체) — 바뀐 시트만 다시 파싱할 때
+    """
+    content = file_obj.read() if hasattr(file_obj, "read") else open(file_obj, "rb").read()
+    col_map = profile.col_map if profile else COL_MAP
+    entry_years = profile.entry_years if profile else CURRICULUM_YEARS
+
+    def pick(names):
+        targets = _pick_curriculum_sheets(names, entry_years)
+        return targets if sheets is None else {y: n for y, n in targets.items() if n in sheets}
+
+    results = None
+    if _worker_count(workers) > 1:
+        targets = pick(_sheet_names(content))
+        tasks = [("curriculum", content, name, year, col_map) for year, name in sorted(targets.items())]
+        results = _run_parallel(tasks, workers)
+    if results is None:
+        frames = _read_sheets(content, pick, curriculum_cols(col_map))
+        results = [_parse_sheet(df, entry_year, col_map) for entry_year, df in sorted(frames.items())]
 
     all_subjects = []
-    for entry_year, sheet_name in sorted(sheet_map.items()):
-        subs = _parse_sheet(sheets[sheet_name], entry_year)
+    for subs in results:
         all_subjects.extend(subs)
 
     return all_subjects
 
 
 # ── 교과배정표 파싱 ────────────────────────────────────────────────────────────
-def _parse_alloc_sheet(df, school_year):
+@timed("parse_alloc_sheet")
+def _parse_alloc_sheet(df, school_year, total_col=ALLOC_TOTAL_COL):
     teachers = []
     current_dept = "미분류"
     current_group = {"dept": "미분류", "subject_names": [], "total_hours": 0, "teachers": []}
@@ -169,7 +326,7 @@ def _parse_alloc_sheet(df, school_year):
                 in_teacher_section = False
 
             try:
-                grand = float(rv[28]) if pd.notna(rv[28]) else 0
+                grand = float(rv[total_col]) if pd.notna(rv[total_col]) else 0
             except Exception:
                 grand = 0
 
@@ -188,7 +345,7 @@ def _parse_alloc_sheet(df, school_year):
         elif is_teacher:
             in_teacher_section = True
             try:
-                total = float(rv[28]) if pd.notna(rv[28]) else 0
+                total = float(rv[total_col]) if pd.notna(rv[total_col]) else 0
             except Exception:
                 total = 0
 
@@ -210,90 +367,284 @@ def _parse_alloc_sheet(df, school_year):
     return teachers
 
 
-def parse_allocation_file(file_obj):
-    """교과배정표 xlsx → (교사 dict, 교과군 dict)"""
+def _alloc_year(sheet_name, school_years=SCHOOL_YEARS):
+    """교과배정표 시트명 → 학년도 (대상 아님이면 None)"""
+    try:
+        year = int(sheet_name)
+    except ValueError:
+        return None
+    return year if year in school_years else None
+
+
+def parse_allocation_file(file_obj, workers=None, profile=None, sheets=None):
+    """
+    교과배정표 xlsx → (교사 dict, 교과군 dict)
+    workers: 시트별 병렬 파싱 프로세스 수 (None 이면 PARSE_WORKERS)
+    profile: 학교별 양식 (school.SchoolProfile, None 이면 이 모듈의 기본값)
+    sheets: 이 시트명들만 파싱 (None 이면 대상 시트 전체) — 바뀐 시트만 다시 파싱할 때
+    """
     content = file_obj.read() if hasattr(file_obj, "read") else open(file_obj, "rb").read()
-    sheets = pd.read_excel(BytesIO(content), sheet_name=None, header=None)
+    school_years = profile.school_years if profile else SCHOOL_YEARS
+    total_col = profile.alloc_total_col if profile else ALLOC_TOTAL_COL
+
+    results = None
+    if _worker_count(workers) > 1:
+        names = _sheet_names(content) if sheets is None else [n for n in _sheet_names(content) if n in sheets]
+        targets = {_alloc_year(name, school_years): name for name in names}
+        targets.pop(None, None)
+        tasks = [("allocation", content, name, year, total_col) for year, name in sorted(targets.items())]
+        results = _run_parallel(tasks, workers)
+        if results is not None:
+            results = list(zip(sorted(targets), results))
+    if results is None:
+        wanted = None if sheets is None else [n for n in sheets if _alloc_year(n, school_years) is not None]
+        with stage("read_workbook"):
+            frames = pd.read_excel(BytesIO(content), sheet_name=wanted, header=None) if wanted != [] else {}
+        targets = {_alloc_year(name, school_years): df for name, df in frames.items()}
+        targets.pop(None, None)
+        results = [(year, _parse_alloc_sheet(df, year, total_col)) for year, df in sorted(targets.items())]
 
     teachers_by_year = {}
     dept_groups_by_year = {}
 
-    for sheet_name, df in sheets.items():
-        try:
-            year = int(sheet_name)
-        except ValueError:
-            continue
-        if 2025 <= year <= 2028:
-            teachers_by_year[str(year)] = _parse_alloc_sheet(df, year)
-            dept_groups_by_year[str(year)] = []   # 필요 시 확장
+    for year, teachers in results:
+        teachers_by_year[str(year)] = teachers
+        dept_groups_by_year[str(year)] = []   # 필요 시 확장
 
     return teachers_by_year, dept_groups_by_year
 
 
-# ── 연도별 운영 현황 ───────────────────────────────────────────────────────────
-def build_yearly_view(school_year, curriculum):
-    grade_map = {0: "1학년", 1: "2학년", 2: "3학년"}
-    items = []
-    seen = set()
-
-    for sub in curriculum:
-        diff = school_year - sub["entry_year"]
-        grade = grade_map.get(diff)
-        if not grade:
-            continue
+# ── 시트 병렬 파싱 ─────────────────────────────────────────────────────────────
+def _worker_count(workers):
+    return PARSE_WORKERS if workers is None else workers
 
-        tracks = {}
-        total = 0
-        for key, credits in sub["schedule"].items():
-            parts = key.split("|")
-            if len(parts) != 3:
-                continue
-            g, track, sem = parts
-            if g == grade:
-                tk = f"{track}_{sem}"
-                tracks[tk] = credits
-                total += credits
 
-        if tracks:
+def _sheet_names(content):
+    wb = load_workbook(BytesIO(content), read_only=True, keep_links=False)
+    try:
+        return wb.sheetnames
+    finally:
+        wb.close()
+
+
+def _parse_sheet_task(task):
+    """
+    프로세스 풀 작업 단위 — 워크북 바이트에서 시트 하나만 읽어 파싱
+    task = (종류, 워크북 bytes, 시트명, 입학년도/학년도, 양식 — 단위배당표는 COL_MAP, 교과배정표는 합계 열)
+    """
+    kind, content, sheet_name, year, layout = task
+    if kind == "curriculum":
+        df = _read_sheets(content, lambda names: {year: sheet_name}, curriculum_cols(layout))[year]
+        return _parse_sheet(df, year, layout)
+    df = pd.read_excel(BytesIO(content), sheet_name=sheet_name, header=None)
+    return _parse_alloc_sheet(df, year, layout)
+
+
+def _run_parallel(tasks, workers):
+    """
+    시트별 작업을 프로세스 풀에서 실행, 결과는 tasks 순서 그대로
+    시트가 하나 이하이거나 풀을 쓸 수 없으면 None (호출 측에서 순차 파싱)
+    """
+    n = min(_worker_count(workers), len(tasks))
+    if n <= 1:
+        return None
+    try:
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            return list(pool.map(_parse_sheet_task, tasks))
+    except Exception as e:
+        print(f"병렬 파싱 실패, 순차 파싱으로 전환: {e}")
+        return None
+
+
+# ── 연도별 운영 현황 ───────────────────────────────────────────────────────────
+GRADE_BY_OFFSET = {0: "1학년", 1: "2학년", 2: "3학년"}   # 학년도 - 입학년도 → 학년
+
+
+@timed("build_index")
+def build_index(curriculum, profile=None):
+    """curriculum → CurriculumIndex (COL_MAP 축 기준, profile 이 있으면 그 학교 양식의 축)"""
+    return CurriculumIndex(curriculum, profile.axes if profile else SCHEDULE_AXES)
+
+
+def _yearly_item(sub, grade, entries):
+    tracks = {}
+    total = 0
+    for track, sem, credits in entries:
+        tracks[f"{track}_{sem}"] = credits
+        total += credits
+    return {
+        "name": sub["name"],
+        "group": sub.get("group", ""),
+        "area": sub.get("area", ""),
+        "grade": grade,
+        "entry_year": sub["entry_year"],
+        "tracks": tracks,
+        "weekly_credits": total,
+    }
+
+
+def _bucket_subjects(sids, curriculum, index, years, views, seen):
+    """과목을 한 번씩만 훑어 해당 과목이 걸치는 모든 (학년도, 학년) 보기에 추가"""
+    for sid in sids:
+        sub = curriculum[sid]
+        for diff, grade in GRADE_BY_OFFSET.items():
+            sy = sub["entry_year"] + diff
+            if sy not in years:
+                continue
+            entries = index.grade_entries(sid, grade)
+            if not entries:
+                continue
             uid = f"{sub['entry_year']}_{sub['name']}_{grade}"
-            if uid not in seen:
-                seen.add(uid)
-                items.append({
-                    "name": sub["name"],
-                    "group": sub.get("group", ""),
-                    "area": sub.get("area", ""),
-                    "grade": grade,
-                    "entry_year": sub["entry_year"],
-                    "tracks": tracks,
-                    "weekly_credits": total,
-                })
+            if uid not in seen[sy]:
+                seen[sy].add(uid)
+                views[str(sy)].append(_yearly_item(sub, grade, entries))
+
+
+@timed("build_yearly_views")
+def build_yearly_views(years, curriculum, index=None):
+    """
+    여러 학년도 운영 현황을 과목 1회 순회로 생성 → {"학년도": [항목]}
+    학년도 수가 늘어도 과목당 (학년 수)만큼만 확인
+    """
+    index = index or build_index(curriculum)
+    years = set(years)
+    views = {str(sy): [] for sy in sorted(years)}
+    seen = {sy: set() for sy in years}
+    # 대상 학년도에 걸치는 코호트의 과목만 (각 과목 1회, curriculum 순서)
+    sids = sorted({sid for sy in years for diff, grade in GRADE_BY_OFFSET.items()
+                   for sid in index.subjects(sy - diff, grade)})
+    _bucket_subjects(sids, curriculum, index, years, views, seen)
+    return views
+
+
+def update_yearly_views(views, curriculum, entry_year, index=None):
+    """
+    한 입학년도(코호트) 시트만 바뀌었을 때 views 를 부분 갱신 (제자리 수정 후 반환)
+    해당 코호트 항목만 지우고 다시 만든 뒤 입학년도 순서에 맞춰 끼워 넣음
+    """
+    index = index or build_index(curriculum)
+    years = {int(sy) for sy in views}
+    fresh = {sy: [] for sy in views}
+    seen = {sy: set() for sy in years}
+    sids = [sid for sid, sub in enumerate(curriculum) if sub["entry_year"] == entry_year]
+    _bucket_subjects(sids, curriculum, index, years, fresh, seen)
+
+    for sy, items in views.items():
+        kept = [it for it in items if it["entry_year"] != entry_year]
+        # 다른 코호트 항목은 그대로 두고 입학년도 기준으로 안정 정렬
+        views[sy] = sorted(kept + fresh[sy], key=lambda it: it["entry_year"])
+    return views
+
 
-    return items
+def build_yearly_view(school_year, curriculum, index=None):
+    return build_yearly_views([school_year], curriculum, index)[str(school_year)]
 
 
-# ── 2027 가이드 ───────────────────────────────────────────────────────────────
-def build_guidance_2027(curriculum):
-    items = []
-    for sub in curriculum:
-        for key, credits in sub["schedule"].items():
+# ── 편성 가이드 (학년도별 예측) ──────────────────────────────────────────────────
+GUIDANCE_COLUMNS = ["name", "grade", "cohort", "entry_year", "group", "area", "track", "sem", "credits"]
+
+
+def default_template(target_year, curriculum):
+    """신입생 교육과정 예측 기준 — target_year 이전 가장 최근 입학년도"""
+    past = [sub["entry_year"] for sub in curriculum if sub["entry_year"] < target_year]
+    return max(past) if past else None
+
+
+def _extra_entries(arr, sids, grade):
+    """과목들의 축에 없는 "학년|학과|학기" 키 중 해당 학년 → [(과목 id, 학과, 학기, 학점)]"""
+    out = []
+    for sid in sids.tolist():
+        for key, credits in arr.extra.get(sid, {}).items():
             parts = key.split("|")
-            if len(parts) != 3:
-                continue
-            g, track, sem = parts
-            if (sub["entry_year"] == 2025 and g == "3학년") or \
-               (sub["entry_year"] == 2026 and g == "2학년"):
-                items.append({
-                    "name": sub["name"],
-                    "grade": g,
-                    "cohort": f"{sub['entry_year']}입학",
-                    "entry_year": sub["entry_year"],
-                    "group": sub.get("group", ""),
-                    "area": sub.get("area", ""),
-                    "track": track,
-                    "sem": sem,
-                    "credits": credits,
-                })
-    return items
+            if len(parts) == 3 and parts[0] == grade:
+                out.append((sid, parts[1], parts[2], credits))
+    return out
+
+
+@timed("build_guidance")
+def build_guidance(target_year, curriculum, new_cohort_template=None, index=None):
+    """
+    target_year 학년도 예상 운영 과목 → DataFrame (학년·과목·학과·학기별 1행)
+    3학년 = (target-2)입학, 2학년 = (target-1)입학 교육과정 그대로
+    1학년 = target 입학 교육과정이 있으면 그대로, 없으면 new_cohort_template 입학년도
+            (기본: 가장 최근 코호트)의 1학년 편성을 옮겨 예측 — projected=True
+    """
+    index = index or build_index(curriculum)
+    arr = index.array
+    years = index.entry_years
+    if new_cohort_template is None:
+        new_cohort_template = default_template(target_year, curriculum)
+
+    plan = [
+        ("3학년", target_year - 2, target_year - 2),
+        ("2학년", target_year - 1, target_year - 1),
+        ("1학년", target_year, target_year if (years == target_year).any() else new_cohort_template),
+    ]
+    tracks = np.asarray(arr.tracks, dtype=object)
+    sems = np.asarray(arr.sems, dtype=object)
+
+    frames = []
+    for grade, cohort, source in plan:
+        if source is None:
+            continue
+        sids = np.flatnonzero(years == source)
+        if grade in arr.grade_pos:
+            gi = arr.grade_pos[grade]
+            loc, ti, si = np.nonzero(arr.present[sids, gi])    # 코호트 과목 × 학과 × 학기 한 번에
+            sid, track, sem = sids[loc], tracks[ti], sems[si]
+            credits = arr.credits[sid, gi, ti, si].astype(np.int64)
+        else:
+            sid, track, sem, credits = (np.empty(0, dtype=np.int64), np.empty(0, dtype=object),
+                                        np.empty(0, dtype=object), np.empty(0, dtype=np.int64))
+        off = _extra_entries(arr, sids, grade)
+        if off:
+            # 축에 없는 키 (index.array.extra) 를 합친 뒤 과목 순서로 다시 정렬
+            x_sid, x_track, x_sem, x_credits = zip(*off)
+            sid = np.concatenate([sid, np.asarray(x_sid, dtype=np.int64)])
+            track = np.concatenate([track, np.asarray(x_track, dtype=object)])
+            sem = np.concatenate([sem, np.asarray(x_sem, dtype=object)])
+            credits = np.concatenate([credits, np.asarray(x_credits, dtype=np.int64)])
+            order = np.argsort(sid, kind="stable")
+            sid, track, sem, credits = sid[order], track[order], sem[order], credits[order]
+        if not len(sid):
+            continue
+        label = f"{cohort}입학" if source == cohort else f"{cohort}입학(←{source}입학)"
+        frames.append(pd.DataFrame({
+            "sid": sid,
+            "name": index.attrs["name"][sid],
+            "grade": grade,
+            "cohort": label,
+            "entry_year": cohort,
+            "group": index.attrs["group"][sid],
+            "area": index.attrs["area"][sid],
+            "track": track,
+            "sem": sem,
+            "credits": credits,
+            "source_year": source,
+            "projected": source != cohort,
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=["sid"] + GUIDANCE_COLUMNS + ["source_year", "projected"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def guidance_summary(df):
+    """학년·학과·학기별 주당 학점 합계 / 과목 수"""
+    return (df.groupby(["grade", "track", "sem"], sort=False)
+              .agg(credits=("credits", "sum"), subjects=("name", "nunique"))
+              .reset_index())
+
+
+def guidance_rows(target_year, curriculum, index=None):
+    """target_year 학년도 고2·고3 예상 운영 과목 (dict 리스트, curriculum_data.json 의 guidance)"""
+    df = build_guidance(target_year, curriculum, index=index)
+    return df.loc[df["grade"] != "1학년", GUIDANCE_COLUMNS].to_dict("records")
+
+
+def build_guidance_2027(curriculum, index=None):
+    """2027학년도 예상 운영 과목 (기본 양식 — guidance_rows(2027, …))"""
+    return guidance_rows(2027, curriculum, index)
 
 # ── 교원정보 입력양식 파싱 ────────────────────────────────────────────────────
 def parse_teacher_form(file_obj):
@@ -303,7 +654,8 @@ def parse_teacher_form(file_obj):
           주요과목 / 상치교과 / 상치과목 / 상치시수 / 학년도 / 메모
     """
     content = file_obj.read() if hasattr(file_obj, "read") else open(file_obj, "rb").read()
-    df = pd.read_excel(BytesIO(content), sheet_name="교원정보", header=None)
+    with stage("read_workbook"):
+        df = pd.read_excel(BytesIO(content), sheet_name="교원정보", header=None)
 
     teachers_by_year = {}
 
@@ -0,0 +1,389 @@
+"""
+scenario.py — What-if 시나리오 (기본 데이터 + 변경분)
+시나리오는 기본 교육과정·반 수·교사 명단을 복사하지 않고 바뀐 부분만 들고 있다.
+  classes  : {(학년, 학과): 반 수}                      — 바뀐 칸만
+  subjects : {(입학년도, 과목명): schedule dict | None}  — 편성 변경·추가, None 은 삭제
+  teachers : {학년도: {"add": [교사 dict], "remove": [이름], "update": {이름: {필드: 값}}}}
+
+ScenarioEngine 은 기본 데이터의 과목별 시수·교과별 수요·공급을 한 번 계산해 두고,
+시나리오마다 변경분이 닿는 과목·교과만 다시 계산해 더한다.
+  반 수 변경  → 바뀐 (학년, 학과) 칸에 편성된 과목만
+  과목 변경   → 해당 과목의 시수만 빼고 새로 더함
+  교사 변경   → 해당 학년도의 빠진·바뀐·추가된 교사만
+결과는 demand.demand_supply 와 같은 형식(DEMAND_COLUMNS)이라 semester_view 등을 그대로 쓴다.
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from curriculum_index import ScheduleArray
+from demand import DEMAND_COLUMNS, _status, dept_codes, supply_table
+from parser import CLASS_COUNTS, build_index, guess_dept
+
+BASE_NAME = "기준"    # 변경 없는 기본 데이터의 시나리오 이름
+
+
+# ── 시나리오 (변경분) ─────────────────────────────────────────────────────────
+class Scenario:
+    def __init__(self, name, classes=None, subjects=None, teachers=None):
+        self.name = name
+        self.classes = dict(classes or {})
+        self.subjects = dict(subjects or {})
+        self.teachers = {str(y): dict(v) for y, v in (teachers or {}).items()}
+
+    # 반 수
+    def set_classes(self, grade, track, n):
+        self.classes[(grade, track)] = int(n)
+        return self
+
+    # 과목
+    def set_schedule(self, entry_year, name, schedule):
+        """과목 편성 교체 (없는 과목이면 추가)"""
+        self.subjects[(int(entry_year), name)] = dict(schedule)
+        return self
+
+    def drop_subject(self, entry_year, name):
+        self.subjects[(int(entry_year), name)] = None
+        return self
+
+    def move_semester(self, curriculum, name, src, dst, entry_years=None):
+        """
+        과목명이 name 인 과목의 src 학기 편성을 dst 학기로 옮김 (예: 회계 1학기 → 2학기)
+        entry_years 로 입학년도 제한. 옮긴 과목 수 반환
+        """
+        moved = 0
+        for sub in curriculum:
+            if sub["name"] != name or (entry_years and sub["entry_year"] not in entry_years):
+                continue
+            key = (sub["entry_year"], name)
+            sched = self.subjects.get(key, sub["schedule"])
+            if sched is None:
+                continue
+            new = {}
+            for k, v in sched.items():
+                parts = k.split("|")
+                if len(parts) == 3 and parts[2] == src:
+                    k = f"{parts[0]}|{parts[1]}|{dst}"
+                new[k] = new.get(k, 0) + v
+            if new != sched:
+                self.subjects[key] = new
+                moved += 1
+        return moved
+
+    # 교사
+    def _teacher_patch(self, school_year):
+        return self.teachers.setdefault(str(school_year), {})
+
+    def add_teacher(self, school_year, teacher):
+        self._teacher_patch(school_year).setdefault("add", []).append(dict(teacher))
+        return self
+
+    def remove_teacher(self, school_year, name):
+        self._teacher_patch(school_year).setdefault("remove", []).append(name)
+        return self
+
+    def update_teacher(self, school_year, name, **fields):
+        self._teacher_patch(school_year).setdefault("update", {}).setdefault(name, {}).update(fields)
+        return self
+
+    def is_empty(self):
+        return not (self.classes or self.subjects or self.teachers)
+
+    # JSON (edits["scenarios"] 저장용) — tuple 키는 "a|b" 문자열로
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "classes": {f"{g}|{t}": n for (g, t), n in self.classes.items()},
+            "subjects": {f"{ey}|{name}": s for (ey, name), s in self.subjects.items()},
+            "teachers": self.teachers,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        classes = {tuple(k.split("|", 1)): n for k, n in (d.get("classes") or {}).items()}
+        subjects = {}
+        for k, s in (d.get("subjects") or {}).items():
+            ey, name = k.split("|", 1)
+            subjects[(int(ey), name)] = s
+        return cls(d.get("name", ""), classes, subjects, d.get("teachers"))
+
+    def key(self):
+        """변경분 내용 해시 (이름 제외 — 같은 변경분이면 계산 결과 재사용)"""
+        d = self.to_dict()
+        d.pop("name")
+        raw = json.dumps(d, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def materialize(scenario, curriculum, teachers_by_year, class_counts=None):
+    """
+    시나리오를 적용한 (curriculum, class_counts, teachers_by_year)
+    바뀌지 않은 과목·학년도 교사 목록은 기본 데이터의 객체를 그대로 공유한다 (수정 금지).
+    """
+    class_counts = {**(class_counts or CLASS_COUNTS), **scenario.classes}
+    subjects = dict(scenario.subjects)
+    out = []
+    for sub in curriculum:
+        key = (sub["entry_year"], sub["name"])
+        if key not in subjects:
+            out.append(sub)
+            continue
+        sched = subjects.pop(key)
+        if sched is not None:
+            out.append({**sub, "schedule": sched})
+    for (ey, name), sched in subjects.items():
+        if sched is not None:
+            out.append({"entry_year": ey, "area": "", "group": "", "name": name, "schedule": sched})
+
+    teachers = dict(teachers_by_year)
+    for y, patch in scenario.teachers.items():
+        teachers[y] = _patched_teachers(teachers_by_year.get(y, []), patch)
+    return out, class_counts, teachers
+
+
+def _patched_teachers(base, patch):
+    remove = set(patch.get("remove", []))
+    update = patch.get("update", {})
+    out = [({**t, **update[t["name"]]} if t["name"] in update else t) for t in base if t["name"] not in remove]
+    return out + list(patch.get("add", []))
+
+
+# ── 증분 계산 ─────────────────────────────────────────────────────────────────
+class ScenarioEngine:
+    """
+    기본 데이터의 수요·공급을 한 번 계산해 두고 시나리오별 변경분만 반영
+    evaluate() 결과는 시나리오 key() 로 보관 — 같은 변경분은 다시 계산하지 않는다.
+    """
+
+    def __init__(self, curriculum, teachers_by_year, years, class_counts=None, overrides=None, index=None):
+        self.curriculum = curriculum
+        self.teachers_by_year = teachers_by_year
+        self.years = list(years)
+        self.class_counts = class_counts or CLASS_COUNTS
+        self.overrides = overrides or {}
+        self.index = index or build_index(curriculum)
+        arr = self.index.array
+        self.sems = arr.sems
+
+        codes, depts = dept_codes(curriculum, self.overrides)
+        supply = supply_table(teachers_by_year, self.years)
+        # 교과 축: 교육과정 교과 + 교사만 있는 교과 (시나리오에서 새 교과가 나오면 뒤에 추가)
+        self.depts = sorted(set(depts) | set(supply["dept"]))
+        self._dept_pos = {d: i for i, d in enumerate(self.depts)}
+        remap = np.asarray([self._dept_pos[d] for d in depts], dtype=np.int64)
+        self.codes = remap[codes] if len(codes) else codes
+
+        self.counts = arr.count_matrix(self.class_counts).astype(np.int64)                    # (G, T)
+        self.credits = arr.credits.astype(np.int64)                                             # (S, G, T, M)
+        self.grade_of = self._grade_of(self.index.entry_years)                                  # (S, Y, G)
+        # 과목별 학년도·학기 시수 (S, Y, M) 와 교과별 합계 (Y, D, M)
+        self.subject_hours = np.einsum("sgtm,gt,syg->sym", self.credits, self.counts, self.grade_of)
+        self.demand = self._by_dept(self.subject_hours, self.codes)
+        self.supply, self.teachers = self._supply_arrays(supply)                                # (Y, D)
+
+        self.sid = {}     # (입학년도, 과목명) → 과목 id (처음 나온 것)
+        for sid, sub in enumerate(curriculum):
+            self.sid.setdefault((sub["entry_year"], sub["name"]), sid)
+        self._memo = {}
+
+    # 내부 계산
+    def _grade_of(self, entry_years):
+        offsets = np.asarray(self.years, dtype=np.int64)[None, :] - np.asarray(entry_years, dtype=np.int64)[:, None]
+        return (offsets[:, :, None] == np.arange(len(self.index.array.grades))[None, None, :]).astype(np.int64)
+
+    def _dept(self, name, depts, pos):
+        """과목명 → 교과 위치 (depts·pos 는 evaluate 안에서만 쓰는 교과 목록 사본)"""
+        return _dept_slot(self.overrides.get(name) or guess_dept(name), depts, pos)
+
+    def _by_dept(self, hours, codes, width=None):
+        """(과목, Y, M) 시수 → (Y, D, M) 교과 합계 (D = width, 기본은 기준 교과 수)"""
+        out = np.zeros((width or len(self.depts), len(self.years), len(self.sems)), dtype=np.int64)
+        np.add.at(out, codes, hours)
+        return out.transpose(1, 0, 2)
+
+    def _supply_arrays(self, df, depts=None, pos=None):
+        """교사 공급 표 → (Y, D) 공급·교사 수 — 처음 보는 교과는 depts 뒤에 추가"""
+        depts = self.depts if depts is None else depts
+        pos = self._dept_pos if pos is None else pos
+        supply = np.zeros((len(self.years), len(depts)), dtype=np.int64)
+        teachers = np.zeros_like(supply)
+        ypos = {y: i for i, y in enumerate(self.years)}
+        for r in df.itertuples():
+            d = pos.get(r.dept)
+            if d is None:
+                d = _dept_slot(r.dept, depts, pos)
+                supply = _pad(supply, len(depts), axis=1)
+                teachers = _pad(teachers, len(depts), axis=1)
+            supply[ypos[r.school_year], d] += r.supply
+            teachers[ypos[r.school_year], d] += r.teachers
+        return supply, teachers
+
+    def _schedule_hours(self, schedules, entry_years, counts):
+        """schedule dict 목록 → (과목, Y, M) 시수 (반 수 counts 기준)"""
+        arr = self.index.array
+        small = ScheduleArray.from_curriculum([{"schedule": s} for s in schedules], (arr.grades, arr.tracks, arr.sems))
+        return np.einsum("sgtm,gt,syg->sym", small.credits.astype(np.int64), counts, self._grade_of(entry_years))
+
+    # 시나리오 평가
+    def evaluate(self, scenario):
+        """
+        시나리오 → {"demand": (Y, D, M), "supply": (Y, D), "teachers": (Y, D), "subjects": {(입학년도, 과목명): (Y, M)},
+                   "depts": D 축 교과 목록}
+        subjects 는 시수가 바뀐 과목의 시나리오 시수 (기준 대비 비교용)
+        시나리오에서 새 교과가 나오면 이 결과의 depts 에만 추가 — 엔진(캐시 공유)의 교과 목록은 바꾸지 않음
+        """
+        key = scenario.key()
+        hit = self._memo.get(key)
+        if hit is not None:
+            return hit
+
+        arr = self.index.array
+        depts, pos = list(self.depts), dict(self._dept_pos)
+        demand = self.demand.copy()
+        counts = self.counts.copy()
+        for (grade, track), n in scenario.classes.items():
+            if grade in arr.grade_pos and track in arr.track_pos:
+                counts[arr.grade_pos[grade], arr.track_pos[track]] = n
+        patched = {self.sid[k] for k in scenario.subjects if k in self.sid}
+        changed = {}
+
+        # 1) 반 수가 바뀐 칸 — 그 칸에 편성된 과목만 (편성을 바꾼 과목은 2) 에서 통째로)
+        for g, t in zip(*np.nonzero(counts != self.counts)):
+            diff = counts[g, t] - self.counts[g, t]
+            rows = np.nonzero(arr.present[:, g, t, :].any(axis=1))[0]
+            rows = rows[~np.isin(rows, list(patched))]
+            if not len(rows):
+                continue
+            delta = self.credits[rows, g, t, :][:, None, :] * diff * self.grade_of[rows, :, g][:, :, None]
+            demand += self._by_dept(delta, self.codes[rows], demand.shape[1])
+            for sid, h in zip(rows.tolist(), delta):
+                if h.any():
+                    k = (self.curriculum[sid]["entry_year"], self.curriculum[sid]["name"])
+                    changed[k] = changed.get(k, self.subject_hours[sid]) + h
+
+        # 2) 편성 변경·추가·삭제 과목 — 기존 시수를 빼고 새 시수를 더함
+        if scenario.subjects:
+            keys = list(scenario.subjects)
+            new = self._schedule_hours([scenario.subjects[k] or {} for k in keys], [k[0] for k in keys], counts)
+            codes = np.asarray([self._dept(name, depts, pos) for _, name in keys], dtype=np.int64)
+            demand = _pad(demand, len(depts), axis=1)
+            old = np.stack([self.subject_hours[self.sid[k]] if k in self.sid else np.zeros_like(new[0])
+                            for k in keys])
+            demand += self._by_dept(new - old, codes, len(depts))
+            for k, h in zip(keys, new):
+                changed[k] = h
+
+        # 3) 교사 변경 — 해당 학년도의 빠진·바뀐 교사 공급을 빼고 새 목록 공급을 더함
+        supply, teachers = self.supply.copy(), self.teachers.copy()
+        for y, patch in scenario.teachers.items():
+            if int(y) not in self.years:
+                continue
+            touched = set(patch.get("remove", [])) | set(patch.get("update", {}))
+            before = [t for t in self.teachers_by_year.get(y, []) if t["name"] in touched]
+            after = _patched_teachers(before, patch)
+            for sign, rows in ((-1, before), (1, after)):
+                s, n = self._supply_arrays(supply_table({y: rows}, [int(y)]), depts, pos)
+                supply, teachers = _pad(supply, s.shape[1], 1), _pad(teachers, s.shape[1], 1)
+                supply[:, :s.shape[1]] += sign * s
+                teachers[:, :s.shape[1]] += sign * n
+
+        n_depts = len(depts)
+        result = {
+            "demand": _pad(demand, n_depts, axis=1),
+            "supply": _pad(supply, n_depts, axis=1),
+            "teachers": _pad(teachers, n_depts, axis=1),
+            "subjects": changed,
+            "depts": depts,
+        }
+        self._memo[key] = result
+        return result
+
+    def base(self):
+        return Scenario(BASE_NAME)
+
+    def compare(self, scenarios, include_base=True):
+        """
+        여러 시나리오를 나란히 → DataFrame (DEMAND_COLUMNS, demand_supply 와 같은 형식)
+        include_base 면 기준(변경 없음)을 맨 앞에 넣음
+        """
+        scenarios = ([self.base()] if include_base else []) + list(scenarios)
+        results = [self.evaluate(s) for s in scenarios]
+        # 교과 축: 기준 교과 + 시나리오마다 새로 생긴 교과 (결과별 depts 를 합친 순서)
+        depts = list(self.depts)
+        pos = dict(self._dept_pos)
+        for r in results:
+            for d in r["depts"][len(self.depts):]:
+                _dept_slot(d, depts, pos)
+        n_depts = len(depts)
+
+        def widen(a, r):
+            out = np.zeros(a.shape[:1] + (n_depts,) + a.shape[2:], dtype=a.dtype)
+            out[:, [pos[d] for d in r["depts"]]] = a
+            return out
+
+        hours = np.stack([widen(r["demand"], r) for r in results])                                # (K, Y, D, M)
+        supply = np.stack([widen(r["supply"], r) for r in results])                               # (K, Y, D)
+        teachers = np.stack([widen(r["teachers"], r) for r in results])
+
+        names = [s.name for s in scenarios]
+        k, y, d, m = np.meshgrid(np.arange(len(names)), np.arange(len(self.years)),
+                                 np.arange(n_depts), np.arange(len(self.sems)), indexing="ij")
+        k, y, d, m = k.ravel(), y.ravel(), d.ravel(), m.ravel()
+        df = pd.DataFrame({
+            "scenario": np.asarray(names, dtype=object)[k],
+            "school_year": np.asarray(self.years, dtype=np.int64)[y],
+            "dept": np.asarray(depts, dtype=object)[d],
+            "sem": np.asarray(self.sems, dtype=object)[m],
+            "demand": hours.ravel(),
+            "supply": supply[k, y, d],
+            "teachers": teachers[k, y, d],
+        })
+        df = df[(df["demand"] > 0) | (df["supply"] > 0)].copy()
+        df["balance"] = df["supply"] - df["demand"]
+        df["status"] = _status(df["balance"].to_numpy())
+        df["_k"] = k[df.index]
+        df = df.sort_values(["_k", "school_year", "dept", "sem"], kind="stable")
+        return df[DEMAND_COLUMNS].reset_index(drop=True)
+
+    def subject_changes(self, scenario):
+        """시나리오에서 시수가 바뀐 과목 → DataFrame(입학년도, 과목명, 학년도, 학기, 기준, 시나리오, 증감)"""
+        rows = []
+        for (ey, name), h in self.evaluate(scenario)["subjects"].items():
+            sid = self.sid.get((ey, name))
+            base = self.subject_hours[sid] if sid is not None else np.zeros_like(h)
+            for yi, mi in zip(*np.nonzero(h != base)):
+                rows.append({"입학년도": ey, "과목명": name, "학년도": self.years[yi], "학기": self.sems[mi],
+                             "기준": int(base[yi, mi]), "시나리오": int(h[yi, mi]),
+                             "증감": int(h[yi, mi] - base[yi, mi])})
+        return pd.DataFrame(rows)
+
+
+def _dept_slot(dept, depts, pos):
+    """교과 → depts 안의 위치 (없으면 뒤에 추가)"""
+    if dept not in pos:
+        pos[dept] = len(depts)
+        depts.append(dept)
+    return pos[dept]
+
+
+def _pad(a, n, axis):
+    """axis 길이가 n 이 되도록 뒤를 0 으로 채움 (시나리오에서 새 교과가 생긴 경우)"""
+    if a.shape[axis] >= n:
+        return a
+    width = [(0, 0)] * a.ndim
+    width[axis] = (0, n - a.shape[axis])
+    return np.pad(a, width)
+
+
+def balance_table(df, school_year):
+    """compare() 결과 → 한 학년도의 교과(과) × 시나리오 과부족 표 (학기 중 가장 부족한 값)"""
+    part = df[df["school_year"] == school_year]
+    if part.empty:
+        return pd.DataFrame()
+    order = list(dict.fromkeys(part["scenario"]))
+    wide = part.pivot_table(index="dept", columns="scenario", values="balance", aggfunc="min", fill_value=0)
+    wide = wide[order]
+    wide.index.name = "교과(과)"
+    return wide.reset_index()
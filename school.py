@@ -0,0 +1,184 @@
+"""
+school.py — 학교별 양식(프로필)과 학교별 데이터 보관 위치
+단위배당표 편성 열(COL_MAP)·학과·반 수·대상 연도는 학교마다 다르므로 프로필로 지정한다.
+프로필이 없으면 parser.py 의 기본값(대동세무고) 그대로.
+
+학교별 데이터 (교육지원청 단위로 여러 학교를 한 번에 운영할 때):
+  data/schools/<학교 id>/profile.json          학교 양식
+  data/schools/<학교 id>/curriculum_data.json  ingest.py --school 결과 (.snap 도 가능)
+  data/schools/<학교 id>/summary.json          교과별 수요·공급 요약 (district.py 집계용)
+
+사용:
+  python school.py init hanbit --name 한빛고등학교 --tracks 경영:4 회계:4 --g1 8
+  python school.py init daedong --name 대동세무고등학교 --tracks 세무회계:3 관세무역:3 세무행정:2
+  python school.py list
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from demand import demand_supply
+from parser import (COL_MAP, CLASS_COUNTS, CURRICULUM_YEARS, SCHOOL_YEARS, ALLOC_TOTAL_COL,
+                    PARSER_VERSION, build_index)
+from snapshot import newest_data_file
+
+SCHOOLS_DIR = Path(__file__).parent / "data" / "schools"
+SUMMARY_COLUMNS = ["school_year", "dept", "sem", "demand", "supply", "teachers"]
+
+
+# ── 프로필 ────────────────────────────────────────────────────────────────────
+class SchoolProfile:
+    def __init__(self, school_id, name, col_map=None, class_counts=None, entry_years=None,
+                 school_years=None, alloc_total_col=ALLOC_TOTAL_COL):
+        self.school_id = school_id
+        self.name = name
+        self.col_map = [tuple(c) for c in (col_map or COL_MAP)]      # [(열 번호, 학년, 학과, 학기)]
+        self.class_counts = dict(class_counts or CLASS_COUNTS)       # {(학년, 학과): 반 수}
+        self.entry_years = list(entry_years or CURRICULUM_YEARS)     # 단위배당표 시트 입학년도
+        self.school_years = list(school_years or SCHOOL_YEARS)       # 교과배정표 시트 학년도
+        self.alloc_total_col = alloc_total_col
+
+    @property
+    def axes(self):
+        """(학년, 학과, 학기) 축 — parser.SCHEDULE_AXES 와 같은 방식으로 편성 열 순서대로"""
+        return tuple(list(dict.fromkeys(entry[i] for entry in self.col_map)) for i in (1, 2, 3))
+
+    @property
+    def tracks(self):
+        """1학년 '공통' 을 뺀 학과 목록"""
+        return [t for t in self.axes[1] if t != "공통"]
+
+    def to_dict(self):
+        return {
+            "school_id": self.school_id,
+            "name": self.name,
+            "col_map": [list(c) for c in self.col_map],
+            "class_counts": {f"{g}|{t}": n for (g, t), n in self.class_counts.items()},
+            "entry_years": self.entry_years,
+            "school_years": self.school_years,
+            "alloc_total_col": self.alloc_total_col,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        counts = {tuple(k.split("|", 1)): n for k, n in (d.get("class_counts") or {}).items()}
+        return cls(d["school_id"], d.get("name", d["school_id"]), d.get("col_map"), counts or None,
+                   d.get("entry_years"), d.get("school_years"), d.get("alloc_total_col", ALLOC_TOTAL_COL))
+
+    def key(self):
+        """파싱 결과가 달라지는 항목의 해시 (parse_cache 키용 — 반 수·이름은 제외)"""
+        raw = json.dumps([[list(c) for c in self.col_map], self.entry_years, self.school_years,
+                          self.alloc_total_col], ensure_ascii=False).encode("utf-8")
+        return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def make_col_map(tracks, first_col=7, step=2, sems=("1학기", "2학기")):
+    """
+    단위배당표 편성 열 배치 생성 — 1학년 공통 학기별 열 다음에 2·3학년 학과별 학기 열이 step 간격으로 이어지는 양식
+    tracks: 2·3학년 학과 목록 (기본 양식이면 parser.COL_MAP 과 같음)
+    """
+    cols = [("1학년", "공통", sem) for sem in sems]
+    cols += [(grade, tr, sem) for grade in ("2학년", "3학년") for tr in tracks for sem in sems]
+    return [(first_col + i * step, g, t, s) for i, (g, t, s) in enumerate(cols)]
+
+
+def default_profile():
+    return SchoolProfile("default", "대동세무고등학교")
+
+
+# ── 학교별 데이터 위치 ─────────────────────────────────────────────────────────
+def school_dir(school_id):
+    return SCHOOLS_DIR / school_id
+
+
+def data_path(school_id):
+    """학교 데이터 파일 — JSON·스냅샷 중 최근에 만든 쪽"""
+    return newest_data_file(school_dir(school_id) / "curriculum_data.json")
+
+
+def list_schools():
+    """프로필이 있는 학교 id 목록"""
+    if not SCHOOLS_DIR.exists():
+        return []
+    return sorted(p.parent.name for p in SCHOOLS_DIR.glob("*/profile.json"))
+
+
+def load_profile(school_id):
+    with open(school_dir(school_id) / "profile.json", encoding="utf-8") as f:
+        return SchoolProfile.from_dict(json.load(f))
+
+
+def _write_json(obj, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def save_profile(profile):
+    _write_json(profile.to_dict(), school_dir(profile.school_id) / "profile.json")
+
+
+# ── 교과별 요약 (district.py 집계용) ────────────────────────────────────────────
+def build_summary(data, profile):
+    """
+    학교 데이터 → 학년도·교과(과)·학기별 수요·공급 요약 (행 리스트, SUMMARY_COLUMNS 순서)
+    집계 때 원본 데이터를 다시 읽지 않도록 ingest 시점에 한 번 계산해 둔다.
+    """
+    curriculum = data["curriculum"]
+    ds = demand_supply(curriculum, data["teachers"], profile.school_years,
+                       scenarios={"현재": profile.class_counts}, index=build_index(curriculum, profile))
+    return {
+        "school_id": profile.school_id,
+        "name": profile.name,
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "parser_version": PARSER_VERSION,
+        "columns": SUMMARY_COLUMNS,
+        "rows": [[int(r.school_year), r.dept, r.sem, int(r.demand), int(r.supply), int(r.teachers)]
+                 for r in ds.itertuples()],
+    }
+
+
+def write_summary(summary):
+    _write_json(summary, school_dir(summary["school_id"]) / "summary.json")
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+def _init(args):
+    counts = {}
+    tracks = []
+    for spec in args.tracks:
+        track, _, n = spec.partition(":")
+        tracks.append(track)
+        counts.update({(g, track): int(n or 1) for g in ("2학년", "3학년")})
+    counts[("1학년", "공통")] = args.g1
+    profile = SchoolProfile(args.school_id, args.name or args.school_id, make_col_map(tracks), counts)
+    save_profile(profile)
+    print(f"✅ {school_dir(args.school_id) / 'profile.json'} — 학과 {', '.join(tracks)}")
+    return True
+
+
+def _list(args):
+    for sid in list_schools():
+        p = load_profile(sid)
+        state = "데이터 있음" if data_path(sid).exists() else "데이터 없음"
+        print(f"  {sid:<16}{p.name:<16}{', '.join(p.tracks):<30}{state}")
+    return True
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="학교별 양식(프로필) 관리")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_init = sub.add_parser("init", help="새 학교 프로필 생성")
+    p_init.add_argument("school_id", help="학교 id (폴더 이름)")
+    p_init.add_argument("--name", help="학교 이름")
+    p_init.add_argument("--tracks", nargs="+", required=True, help="2·3학년 학과:반 수 (예: 세무회계:3)")
+    p_init.add_argument("--g1", type=int, default=8, help="1학년 반 수")
+    sub.add_parser("list", help="학교 목록")
+    args = ap.parse_args()
+    sys.exit(0 if {"init": _init, "list": _list}[args.cmd](args) else 1)
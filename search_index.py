@@ -0,0 +1,134 @@
+"""
+search_index.py — 과목명·교과군·교사명 검색 색인 (데이터마다 한 번 생성, 화면 공용)
+검색어는 공백을 무시하고 대소문자를 구분하지 않으며, 한글 초성(ㄱㅇ → 공통국어)과 섞어 써도 된다.
+
+색인: 서로 다른 문자열(term)마다
+  - 정규화 문자열의 1·2글자 n-gram → term id 집합
+  - 초성 문자열(공통국어1 → ㄱㅌㄱㅇ1)의 1·2글자 n-gram → term id 집합
+검색어의 n-gram 후보 집합을 교집합한 뒤 후보만 실제로 확인하므로 term 수가 늘어도 빠르다.
+결과는 일치한 원래 문자열 집합 — 화면에서는 `item["name"] in hits` 로 거른다.
+(일치 여부는 문자열에만 달려 있으므로 과목명·교과군 결과를 한 집합에 섞어도 된다)
+"""
+from timing import timed
+
+KINDS = ("subject", "group", "teacher")
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHO_SET = set(_CHO)
+
+
+# ── 정규화 ────────────────────────────────────────────────────────────────────
+def norm(text):
+    """검색용 문자열 — 공백 제거 + 소문자"""
+    return "".join(str(text).split()).lower()
+
+
+def chosung(text):
+    """한글 음절 → 초성 (그 밖의 글자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        out.append(_CHO[code // 588] if 0 <= code < 11172 else ch)
+    return "".join(out)
+
+
+def _grams(key):
+    """1·2글자 n-gram (검색어가 한 글자일 때는 1-gram, 그 밖에는 2-gram 으로 찾음)"""
+    return set(key) | {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+def _query_grams(q):
+    return {q} if len(q) == 1 else {q[i:i + 2] for i in range(len(q) - 1)}
+
+
+def _mixed_in(q, key):
+    """초성이 섞인 검색어가 key 의 어느 위치에서든 맞는지 (초성 글자는 그 초성으로 시작하는 음절과 일치)"""
+    n = len(q)
+    for start in range(len(key) - n + 1):
+        for qc, kc in zip(q, key[start:start + n]):
+            if qc != kc and not (qc in _CHO_SET and chosung(kc) == qc):
+                break
+        else:
+            return True
+    return False
+
+
+# ── 색인 ─────────────────────────────────────────────────────────────────────
+class SearchIndex:
+    def __init__(self):
+        self.terms = []            # term id → 원래 문자열
+        self.keys = []             # term id → 정규화 문자열
+        self.cho_keys = []         # term id → 초성 문자열
+        self.kinds = []            # term id → 종류 집합 (subject / group / teacher)
+        self._ids = {}             # 원래 문자열 → term id
+        self._grams = {}           # n-gram → term id 집합
+        self._cho_grams = {}       # 초성 n-gram → term id 집합
+        self._memo = {}            # (검색어, 종류) → 결과 — 입력 중 같은 검색어가 반복되므로
+
+    def add(self, kind, text):
+        if not text:
+            return
+        tid = self._ids.get(text)
+        if tid is None:
+            tid = self._ids[text] = len(self.terms)
+            key = norm(text)
+            cho = chosung(key)
+            self.terms.append(text)
+            self.keys.append(key)
+            self.cho_keys.append(cho)
+            self.kinds.append({kind})
+            for g in _grams(key):
+                self._grams.setdefault(g, set()).add(tid)
+            for g in _grams(cho):
+                self._cho_grams.setdefault(g, set()).add(tid)
+        else:
+            self.kinds[tid].add(kind)
+        self._memo.clear()
+
+    @classmethod
+    @timed("build_search_index")
+    def build(cls, curriculum, teachers_by_year=None):
+        """curriculum 과목명·교과군 + 전 학년도 교사명"""
+        index = cls()
+        for sub in curriculum:
+            index.add("subject", sub["name"])
+            index.add("group", sub.get("group"))
+        for teachers in (teachers_by_year or {}).values():
+            for t in teachers:
+                index.add("teacher", t.get("name"))
+        return index
+
+    def match(self, query, kinds=None):
+        """
+        검색어 → 일치하는 원래 문자열 frozenset (앞부분·중간 일치, 초성 포함)
+        kinds: 찾을 종류 (None 이면 전부)
+        """
+        q = norm(query)
+        memo_key = (q, tuple(kinds or KINDS))
+        hit = self._memo.get(memo_key)
+        if hit is None:
+            hit = self._memo[memo_key] = self._match(q, set(memo_key[1]))
+            if len(self._memo) > 1024:
+                self._memo.clear()
+        return hit
+
+    def _match(self, q, kinds):
+        if not q:
+            return frozenset()
+        mixed = any(ch in _CHO_SET for ch in q)
+        postings = self._cho_grams if mixed else self._grams
+        cand = None
+        for g in sorted(_query_grams(chosung(q) if mixed else q), key=lambda g: len(postings.get(g, ()))):
+            ids = postings.get(g)
+            if not ids:
+                return frozenset()
+            cand = set(ids) if cand is None else cand & ids
+            if not cand:
+                return frozenset()
+
+        if not mixed:
+            ok = lambda t: q in self.keys[t]
+        elif all(ch in _CHO_SET for ch in q):
+            ok = lambda t: q in self.cho_keys[t]          # 초성만 입력
+        else:
+            ok = lambda t: _mixed_in(q, self.keys[t])     # 초성 + 글자 섞어 입력
+        return frozenset(self.terms[t] for t in cand if self.kinds[t] & kinds and ok(t))
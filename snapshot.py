@@ -0,0 +1,298 @@
+"""
+snapshot.py — 파싱 데이터 바이너리 스냅샷 (curriculum_data.json 대체)
+
+파일 구조:
+  MAGIC | 헤더 길이(uint32) | 헤더 JSON | 열 데이터 블록…
+헤더에는 표(group) → 부분표(part, 학년도별) → 열(column)별 위치·인코딩이 들어 있어
+필요한 표·학년도의 열 블록만 찾아 읽을 수 있다. 열 블록은 각각 zlib 압축.
+
+열 인코딩:
+  int   — 값 범위에 맞춘 정수 배열 (int8~int64)
+  float — float64 배열
+  bool  — uint8 배열
+  str   — 사전(vocab) + 코드 배열
+  map   — {문자열: 정수} (schedule, tracks) → 행별 오프셋 + 키 코드 + 값 배열
+  json  — 그 밖의 값(리스트 등)을 JSON 문자열로 사전 인코딩
+일부 행에 없는 열은 present 비트마스크를 함께 저장한다.
+
+사용:
+  python snapshot.py data/curriculum_data.json data/curriculum_data.snap   # JSON → 스냅샷
+  python snapshot.py data/curriculum_data.snap data/curriculum_data.json   # 스냅샷 → JSON
+"""
+import json
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"DDSNAP1\n"
+_LEN = struct.Struct("<I")
+
+# 리스트 표를 학년도별 부분표로 나눌 때 쓰는 열
+_PARTITION_KEY = {"curriculum": "entry_year", "guidance": "entry_year", "guidance_2027": "entry_year"}
+
+
+# ── 열 인코딩 ─────────────────────────────────────────────────────────────────
+def _int_dtype(arr):
+    lo, hi = (int(arr.min()), int(arr.max())) if len(arr) else (0, 0)
+    for dt in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dt)
+        if info.min <= lo and hi <= info.max:
+            return dt
+    return np.int64
+
+
+def _codes_dtype(n):
+    return np.uint8 if n <= 0xFF else np.uint16 if n <= 0xFFFF else np.uint32
+
+
+def _pack_vocab(values):
+    """문자열 리스트 → 사전 + 코드 (bytes)"""
+    vocab, codes = {}, []
+    for v in values:
+        codes.append(vocab.setdefault(v, len(vocab)))
+    head = json.dumps(list(vocab), ensure_ascii=False).encode("utf-8")
+    return _LEN.pack(len(head)) + head + np.asarray(codes, dtype=_codes_dtype(len(vocab))).tobytes()
+
+
+def _unpack_vocab(buf, n):
+    (hl,) = _LEN.unpack_from(buf)
+    vocab = json.loads(buf[_LEN.size:_LEN.size + hl].decode("utf-8"))
+    codes = np.frombuffer(buf, dtype=_codes_dtype(len(vocab)), count=n, offset=_LEN.size + hl)
+    return np.asarray(vocab, dtype=object)[codes].tolist() if vocab else []
+
+
+def _kind(values):
+    if all(type(v) is bool for v in values):
+        return "bool"
+    if all(type(v) is int for v in values):
+        return "int"
+    if all(type(v) is float for v in values):
+        return "float"
+    if all(type(v) is str for v in values):
+        return "str"
+    if all(type(v) is dict and all(type(x) is int for x in v.values()) for v in values):
+        return "map"
+    return "json"
+
+
+def _encode(values):
+    """열 값 리스트 → (kind, dtype, bytes)"""
+    kind = _kind(values)
+    if kind == "bool":
+        return kind, "u1", np.asarray(values, dtype=np.uint8).tobytes()
+    if kind == "int":
+        arr = np.asarray(values, dtype=np.int64)
+        dt = np.dtype(_int_dtype(arr))
+        return kind, dt.str, arr.astype(dt).tobytes()
+    if kind == "float":
+        return kind, "<f8", np.asarray(values, dtype="<f8").tobytes()
+    if kind == "str":
+        return kind, None, _pack_vocab(values)
+    if kind == "map":
+        offsets = np.zeros(len(values) + 1, dtype="<i4")
+        offsets[1:] = np.cumsum([len(v) for v in values])
+        keys = _pack_vocab([k for v in values for k in v])
+        vals = np.asarray([x for v in values for x in v.values()], dtype=np.int64)
+        dt = np.dtype(_int_dtype(vals))
+        return kind, dt.str, (_LEN.pack(len(keys)) + keys + offsets.tobytes() + vals.astype(dt).tobytes())
+    return kind, None, _pack_vocab([json.dumps(v, ensure_ascii=False) for v in values])
+
+
+def _decode(kind, dtype, buf, n):
+    if kind == "bool":
+        return [bool(x) for x in np.frombuffer(buf, dtype=np.uint8, count=n)]
+    if kind in ("int", "float"):
+        return np.frombuffer(buf, dtype=dtype, count=n).tolist()
+    if kind == "str":
+        return _unpack_vocab(buf, n)
+    if kind == "map":
+        (kl,) = _LEN.unpack_from(buf)
+        offsets = np.frombuffer(buf, dtype="<i4", count=n + 1, offset=_LEN.size + kl).tolist()
+        total = offsets[-1]
+        keys = _unpack_vocab(buf[_LEN.size:_LEN.size + kl], total)
+        vals = np.frombuffer(buf, dtype=dtype, count=total, offset=_LEN.size + kl + 4 * (n + 1)).tolist()
+        return [dict(zip(keys[a:b], vals[a:b])) for a, b in zip(offsets, offsets[1:])]
+    return [json.loads(s) for s in _unpack_vocab(buf, n)]
+
+
+# ── 쓰기 ─────────────────────────────────────────────────────────────────────
+def _is_rows(v):
+    return isinstance(v, list) and all(isinstance(r, dict) for r in v)
+
+
+def _is_table(value):
+    """행(dict) 리스트 또는 {학년도: 행 리스트} 형태인지"""
+    if isinstance(value, dict):
+        return all(_is_rows(v) for v in value.values())
+    return _is_rows(value)
+
+
+def _split_parts(name, value):
+    """표 값 → (group 정보, [(part 이름, 학년도, 행 리스트)])"""
+    if isinstance(value, dict):
+        parts = [(f"{name}/{k}", int(k) if str(k).isdigit() else None, rows, k) for k, rows in value.items()]
+        return {"type": "dict", "keys": [p[3] for p in parts]}, [p[:3] for p in parts]
+
+    key = _PARTITION_KEY.get(name)
+    if key and value and all(isinstance(r, dict) and key in r for r in value):
+        # 같은 학년도 행이 연속일 때만 나눔 (이어 붙였을 때 원래 순서 보장)
+        years = [r[key] for r in value]
+        order = list(dict.fromkeys(years))
+        if sum(1 for a, b in zip(years, years[1:]) if a != b) == len(order) - 1:
+            parts = [(f"{name}/{y}", y, [r for r in value if r[key] == y]) for y in order]
+            return {"type": "list"}, parts
+    return {"type": "list"}, [(name, None, value)]
+
+
+def write_snapshot(data: dict, path) -> None:
+    """curriculum_data.json 과 같은 구조의 dict → 스냅샷 파일"""
+    header = {"groups": {}, "parts": {}}
+    blobs, offset = [], 0
+
+    for name, value in data.items():
+        if not _is_table(value):
+            header["groups"][name] = {"type": "json", "value": value}   # meta 등은 헤더에 그대로
+            continue
+
+        group, parts = _split_parts(name, value)
+        group["parts"] = [p[0] for p in parts]
+        header["groups"][name] = group
+
+        for part_name, year, rows in parts:
+            cols = list(dict.fromkeys(k for r in rows for k in r))
+            col_meta = []
+            for col in cols:
+                present = [col in r for r in rows]
+                values = [r[col] for r in rows if col in r]
+                kind, dtype, raw = _encode(values)
+                blob = zlib.compress(raw, 6)
+                meta = {"name": col, "kind": kind, "dtype": dtype, "n": len(values),
+                        "offset": offset, "length": len(blob)}
+                blobs.append(blob)
+                offset += len(blob)
+                if not all(present):
+                    mask = zlib.compress(np.packbits(np.asarray(present, dtype=bool)).tobytes(), 6)
+                    meta["present"] = [offset, len(mask)]
+                    blobs.append(mask)
+                    offset += len(mask)
+                col_meta.append(meta)
+            header["parts"][part_name] = {"year": year, "rows": len(rows), "columns": col_meta}
+
+    head = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(_LEN.pack(len(head)))
+        f.write(head)
+        for b in blobs:
+            f.write(b)
+    tmp.replace(path)
+
+
+# ── 읽기 ─────────────────────────────────────────────────────────────────────
+def read_header(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("스냅샷 파일 형식이 아닙니다")
+    (hl,) = _LEN.unpack(f.read(_LEN.size))
+    header = json.loads(f.read(hl).decode("utf-8"))
+    return header, len(MAGIC) + _LEN.size + hl
+
+
+def _read_part(f, base, part):
+    n = part["rows"]
+    names, columns, masks = [], [], []
+    for col in part["columns"]:
+        f.seek(base + col["offset"])
+        names.append(col["name"])
+        columns.append(_decode(col["kind"], col["dtype"], zlib.decompress(f.read(col["length"])), col["n"]))
+        if "present" in col:
+            off, length = col["present"]
+            f.seek(base + off)
+            masks.append(np.unpackbits(np.frombuffer(zlib.decompress(f.read(length)), dtype=np.uint8), count=n))
+        else:
+            masks.append(None)
+
+    if all(m is None for m in masks):
+        return [dict(zip(names, vals)) for vals in zip(*columns)] if names else [{} for _ in range(n)]
+
+    rows = [{} for _ in range(n)]
+    for name, values, mask in zip(names, columns, masks):
+        idx = range(n) if mask is None else np.flatnonzero(mask).tolist()
+        for i, v in zip(idx, values):
+            rows[i][name] = v
+    return rows
+
+
+def load_snapshot(path, tables=None, years=None) -> dict:
+    """
+    스냅샷 → dict (curriculum_data.json 과 같은 구조)
+    tables: 읽을 표 이름 목록 (None 이면 전체)
+    years:  읽을 학년도/입학년도 목록 (None 이면 전체, 학년도 구분 없는 부분표는 항상 읽음)
+    """
+    years = None if years is None else {int(y) for y in years}
+    out = {}
+    with open(path, "rb") as f:
+        header, base = read_header(f)
+        for name, group in header["groups"].items():
+            if tables is not None and name not in tables:
+                continue
+            if group["type"] == "json":
+                out[name] = group["value"]
+                continue
+            wanted = [
+                (i, p) for i, p in enumerate(group["parts"])
+                if years is None or header["parts"][p]["year"] is None or header["parts"][p]["year"] in years
+            ]
+            if group["type"] == "dict":
+                out[name] = {group["keys"][i]: _read_part(f, base, header["parts"][p]) for i, p in wanted}
+            else:
+                out[name] = [r for _, p in wanted for r in _read_part(f, base, header["parts"][p])]
+    return out
+
+
+# ── JSON 호환 ────────────────────────────────────────────────────────────────
+def json_to_snapshot(json_path, snap_path) -> None:
+    with open(json_path, encoding="utf-8") as f:
+        write_snapshot(json.load(f), snap_path)
+
+
+def snapshot_to_json(snap_path, json_path) -> None:
+    data = load_snapshot(snap_path)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_data(path, tables=None) -> dict:
+    """
+    확장자에 따라 스냅샷 또는 JSON 불러오기
+    tables: 읽을 표 이름 목록 — 스냅샷은 그 표 블록만 읽고, JSON 은 전체를 읽은 뒤 골라냄
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if tables is None else {k: v for k, v in data.items() if k in tables}
+    return load_snapshot(path, tables=tables)
+
+
+def newest_data_file(json_path) -> Path:
+    """
+    curriculum_data.json 과 같은 이름의 .snap 중 더 최근에 만든 파일
+    (하나만 있으면 그 파일, 둘 다 없으면 json 경로) — 오래된 스냅샷이 새로 만든 JSON 을 가리지 않도록
+    """
+    json_path = Path(json_path)
+    found = [p for p in (json_path, json_path.with_suffix(".snap")) if p.exists()]
+    return max(found, key=lambda p: p.stat().st_mtime_ns) if found else json_path
+
+
+if __name__ == "__main__":
+    src, dst = sys.argv[1], sys.argv[2]
+    if src.endswith(".json"):
+        json_to_snapshot(src, dst)
+    else:
+        snapshot_to_json(src, dst)
+    print(f"{src} → {dst}")
@@ -1,31 +1,356 @@
 """
 storage.py — 수기 편집 데이터 저장/불러오기
-로컬: data/edits.json
+로컬: data/edits.json (압축 스냅샷) + data/edits.journal.jsonl (변경분 저널)
+다중 사용자: EDITS_BACKEND=sqlite → data/edits.db (WAL, 행 단위 버전 관리)
+
+저장 시 직전 저장 상태와 비교해 바뀐 값만 저널에 한 줄씩 추가하고,
+불러올 때 스냅샷 위에 저널을 순서대로 재적용한다.
+저널 레코드: {"path": [섹션, 학년도, 행, 필드], "value": 값}
+           {"path": [...], "len": n}   — 리스트를 n 행으로 줄임
+           {"path": [...], "delete": true}
+저널이 COMPACT_EVERY 건을 넘으면 스냅샷으로 합치고 저널을 비운다.
 """
+import copy
+import hashlib
 import json
+import os
+import sqlite3
 from pathlib import Path
 
+from timing import timed
+
 EDITS_PATH = Path(__file__).parent / "data" / "edits.json"
+JOURNAL_PATH = EDITS_PATH.with_name("edits.journal.jsonl")
+COMPACT_EVERY = 200
 
+BACKEND = os.environ.get("EDITS_BACKEND", "json")     # "json" | "sqlite"
+DB_PATH = EDITS_PATH.with_name("edits.db")
+VERSIONS_KEY = "_versions"     # sqlite: 불러온 시점의 행 버전 (저장 시 충돌 검사용)
 
-def load_edits() -> dict:
-    """저장된 편집 데이터 불러오기"""
+_saved_state = None     # 디스크(스냅샷 + 저널)에 반영된 상태 — 변경분 계산 기준
+_journal_len = 0
+
+
+def _same(a, b):
+    # data_editor 빈 칸은 NaN 으로 들어오므로 NaN 끼리는 같은 값으로 취급
+    return a == b or (a != a and b != b)
+
+
+def _diff(old, new, path, out):
+    """old → new 로 가는 최소 변경 레코드를 out 에 추가"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        for k, v in new.items():
+            if k in old:
+                _diff(old[k], v, path + [k], out)
+            else:
+                out.append({"path": path + [k], "value": v})
+        for k in old:
+            if k not in new:
+                out.append({"path": path + [k], "delete": True})
+    elif isinstance(old, list) and isinstance(new, list):
+        if len(new) < len(old):
+            out.append({"path": path, "len": len(new)})
+        for i, v in enumerate(new):
+            if i < len(old):
+                _diff(old[i], v, path + [i], out)
+            else:
+                out.append({"path": path + [i], "value": v})
+    elif type(old) is not type(new) or not _same(old, new):
+        out.append({"path": path, "value": new})
+
+
+def _apply(state, rec):
+    """저널 레코드 하나를 state 에 적용 (반복 적용해도 결과 동일)"""
+    path = rec["path"]
+    if "len" in rec:
+        target = state
+        for k in path:
+            target = target[k]
+        del target[rec["len"]:]
+        return
+    if not path:
+        state.clear()
+        state.update(rec["value"])
+        return
+
+    parent = state
+    for k in path[:-1]:
+        parent = parent[k]
+    last = path[-1]
+    if rec.get("delete"):
+        if isinstance(parent, dict):
+            parent.pop(last, None)
+        elif last < len(parent):
+            del parent[last]
+    elif isinstance(parent, list) and last >= len(parent):
+        parent.append(rec["value"])
+    else:
+        parent[last] = rec["value"]
+
+
+def _atomic_write(path, text):
+    """임시 파일에 쓴 뒤 rename — 저장 중 중단돼도 기존 파일은 온전함"""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_journal():
+    """저널 레코드 목록, 깨진 줄 존재 여부 (마지막 줄이 쓰다 만 경우)"""
+    records, broken = [], False
+    if JOURNAL_PATH.exists():
+        with open(JOURNAL_PATH, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    broken = True
+                    break
+    return records, broken
+
+
+def compact_edits() -> bool:
+    """현재 상태를 스냅샷으로 기록하고 저널 비우기"""
+    global _journal_len
+    try:
+        EDITS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(EDITS_PATH, json.dumps(_saved_state or {}, ensure_ascii=False, indent=2))
+        _atomic_write(JOURNAL_PATH, "")
+        _journal_len = 0
+        return True
+    except Exception as e:
+        print(f"압축 오류: {e}")
+        return False
+
+
+def _json_load() -> dict:
+    """스냅샷 + 저널 재적용"""
+    global _saved_state, _journal_len
+    state = {}
     try:
         if EDITS_PATH.exists():
             with open(EDITS_PATH, encoding="utf-8") as f:
-                return json.load(f)
+                state = json.load(f)
+        records, broken = _read_journal()
+        for rec in records:
+            _apply(state, rec)
     except Exception:
-        pass
-    return {}
+        return {}
 
+    _saved_state = copy.deepcopy(state)
+    _journal_len = len(records)
+    if broken:
+        compact_edits()
+    return state
 
-def save_edits(edits: dict) -> bool:
-    """편집 데이터 저장"""
+
+def _json_save(edits: dict) -> bool:
+    """직전 저장 대비 바뀐 값만 저널에 추가"""
+    global _saved_state, _journal_len
+    edits = {k: v for k, v in edits.items() if k != VERSIONS_KEY}
     try:
+        if _saved_state is None:
+            _json_load()
+        records = []
+        _diff(_saved_state, edits, [], records)
+        if not records:
+            return True
+
         EDITS_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(EDITS_PATH, "w", encoding="utf-8") as f:
-            json.dump(edits, f, ensure_ascii=False, indent=2)
+        with open(JOURNAL_PATH, "a", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        _saved_state = copy.deepcopy(edits)
+        _journal_len += len(records)
+
+        if _journal_len >= COMPACT_EVERY:
+            compact_edits()
         return True
     except Exception as e:
         print(f"저장 오류: {e}")
         return False
+
+
+# ── SQLite (WAL) 백엔드 ───────────────────────────────────────────────────────
+# 섹션별 테이블: (키 열, 값 열). 모든 테이블에 version 열 — 행 수정 시 +1
+_TABLES = {
+    "cross_teaching": (("year", "row"), ("data",)),     # {학년도: [행 dict]}
+    "teacher_memos":  (("year",), ("memo",)),           # {학년도: 메모}
+    "checklist":      (("row",), ("done", "text")),     # [{done, text}]
+    "extra":          (("section",), ("data",)),        # 그 밖의 섹션 (통째로 JSON)
+}
+
+
+class EditConflict(Exception):
+    """다른 사용자가 먼저 수정한 행을 덮어쓰려 할 때"""
+
+
+def _connect():
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for table, (keys, values) in _TABLES.items():
+        cols = ", ".join(f"{c}" for c in keys + values)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({cols}, version INTEGER NOT NULL, "
+                     f"PRIMARY KEY ({', '.join(keys)}))")
+    return conn
+
+
+def _flatten(edits):
+    """edits dict → {테이블: {키 tuple: 값 tuple}}"""
+    out = {t: {} for t in _TABLES}
+    for section, value in edits.items():
+        if section == VERSIONS_KEY:
+            continue
+        if section == "cross_teaching":
+            for year, rows in value.items():
+                for i, r in enumerate(rows):
+                    out[section][(year, i)] = (json.dumps(r, ensure_ascii=False),)
+        elif section == "teacher_memos":
+            for year, memo in value.items():
+                out[section][(year,)] = (memo,)
+        elif section == "checklist":
+            for i, item in enumerate(value):
+                out[section][(i,)] = (int(bool(item.get("done"))), item.get("text", ""))
+        else:
+            out["extra"][(section,)] = (json.dumps(value, ensure_ascii=False),)
+    return out
+
+
+def _unflatten(table, key, value, edits):
+    if table == "cross_teaching":
+        edits.setdefault(table, {}).setdefault(key[0], []).append(json.loads(value[0]))
+    elif table == "teacher_memos":
+        edits.setdefault(table, {})[key[0]] = value[0]
+    elif table == "checklist":
+        edits.setdefault(table, []).append({"done": bool(value[0]), "text": value[1]})
+    else:
+        edits[key[0]] = json.loads(value[0])
+
+
+def _vkey(key):
+    return "/".join(str(k) for k in key)
+
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def _read_tables(conn):
+    """{테이블: {키 tuple: (값 tuple, version)}} — 키 순서대로 정렬"""
+    out = {}
+    for table, (keys, values) in _TABLES.items():
+        rows = conn.execute(f"SELECT {', '.join(keys + values)}, version FROM {table} "
+                            f"ORDER BY {', '.join(keys)}").fetchall()
+        n = len(keys)
+        out[table] = {tuple(r[:n]): (tuple(r[n:-1]), r[-1]) for r in rows}
+    return out
+
+
+def _sqlite_load() -> dict:
+    """edits[VERSIONS_KEY][테이블][행 키] = [불러온 version, 불러온 값 digest]"""
+    conn = _connect()
+    try:
+        db = _read_tables(conn)
+    finally:
+        conn.close()
+    edits = {VERSIONS_KEY: {}}
+    for table, rows in db.items():
+        for key, (value, version) in rows.items():
+            _unflatten(table, key, value, edits)
+            edits[VERSIONS_KEY].setdefault(table, {})[_vkey(key)] = [version, _digest(value)]
+    return edits
+
+
+def _sqlite_save(edits: dict) -> bool:
+    """
+    세션이 바꾼 행만 upsert/delete. 세션이 불러온 뒤 다른 사용자가 먼저 고친 행을
+    수정·삭제하려 하면 전체 롤백 후 False (낙관적 동시성 제어)
+    """
+    seen = edits.setdefault(VERSIONS_KEY, {})
+    mine = _flatten(edits)
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        db = _read_tables(conn)
+        new_versions = {}
+        for table, (keys, values) in _TABLES.items():
+            loaded = seen.get(table, {})
+            current = db[table]
+            versions = new_versions[table] = {}
+            upsert = (f"INSERT INTO {table} ({', '.join(keys + values)}, version) "
+                      f"VALUES ({', '.join('?' * (len(keys) + len(values) + 1))}) "
+                      f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET "
+                      + ", ".join(f"{c}=excluded.{c}" for c in values + ("version",)))
+
+            for key, value in mine[table].items():
+                vk = _vkey(key)
+                base = loaded.get(vk)
+                if base and base[1] == _digest(value):
+                    versions[vk] = base          # 이 세션이 고치지 않은 행 — 건드리지 않음
+                    continue
+                if key not in current:
+                    if base:
+                        raise EditConflict(f"{table} {vk}: 다른 사용자가 삭제함")
+                    conn.execute(upsert, key + value + (1,))
+                    versions[vk] = [1, _digest(value)]
+                    continue
+                db_value, db_version = current[key]
+                if db_value == value:
+                    versions[vk] = [db_version, _digest(value)]
+                    continue
+                if not base or base[0] != db_version:
+                    raise EditConflict(f"{table} {vk}: 다른 사용자가 먼저 수정함")
+                conn.execute(upsert, key + value + (db_version + 1,))
+                versions[vk] = [db_version + 1, _digest(value)]
+
+            for key, (_, db_version) in current.items():
+                vk = _vkey(key)
+                if key in mine[table] or vk not in loaded:
+                    continue                     # 다른 사용자가 새로 추가한 행은 유지
+                if loaded[vk][0] != db_version:
+                    raise EditConflict(f"{table} {vk}: 다른 사용자가 먼저 수정함")
+                conn.execute(f"DELETE FROM {table} WHERE "
+                             + " AND ".join(f"{c}=?" for c in keys), key)
+        conn.execute("COMMIT")
+    except EditConflict as e:
+        conn.execute("ROLLBACK")
+        print(f"저장 충돌: {e}")
+        return False
+    except Exception as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        print(f"저장 오류: {e}")
+        return False
+    finally:
+        conn.close()
+
+    edits[VERSIONS_KEY] = new_versions
+    return True
+
+
+# ── 공개 API ─────────────────────────────────────────────────────────────────
+def load_edits() -> dict:
+    """저장된 편집 데이터 불러오기"""
+    if BACKEND == "sqlite":
+        try:
+            return _sqlite_load()
+        except Exception:
+            return {}
+    return _json_load()
+
+
+@timed("save_edits")
+def save_edits(edits: dict) -> bool:
+    """편집 데이터 저장"""
+    if BACKEND == "sqlite":
+        return _sqlite_save(edits)
+    return _json_save(edits)
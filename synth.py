@@ -0,0 +1,216 @@
+"""
+synth.py — 벤치마크용 합성 엑셀 생성
+parser.py 가 읽는 배치를 그대로 따르는 단위배당표 / 교과배정표 / 교원정보 양식을 만든다.
+  단위배당표 — 헤더 5행, col0~6(영역·교과군·과목·학점) + COL_MAP 편성 열, 소계·합계 행 포함
+  교과배정표 — 학년도 시트, 과목 행(col2) + 교사 행(col1), col28 = 시수 합계
+  교원정보   — '교원정보' 시트, 헤더 5행
+규모는 scale 배수(과목 수·교사 수)와 학년도 시트 수·잡(junk) 시트 수로 조절.
+학년도 시트 수를 바꾸면 그 연도를 읽는 프로필(synth_profile)로 파싱해야 모든 시트가 읽힌다.
+
+사용:
+  python synth.py 출력폴더/ --scale 10
+  python synth.py 출력폴더/ --sheets 8          # 입학년도 시트 8개 (교과배정표 학년도 시트 9개)
+"""
+import argparse
+import random
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from parser import COL_MAP, DEPT_KEYWORD_MAP
+from school import SchoolProfile
+
+SUBJECTS_PER_COHORT = 45     # scale=1 기준 — 현재 학교 데이터 규모
+TEACHERS_PER_YEAR = 50
+CURRICULUM_YEARS = [2024, 2025, 2026]          # parser 가 읽는 입학년도 시트
+ALLOCATION_YEARS = [2025, 2026, 2027, 2028]    # parser 가 읽는 학년도 시트
+
+# (영역, 교과군, 과목명 키워드)
+_AREAS = [
+    ("기초", "국어", ["공통국어", "문학", "화법과 작문", "독서"]),
+    ("기초", "수학", ["공통수학", "대수", "미적분", "확률과 통계"]),
+    ("기초", "영어", ["공통영어", "영어I", "영어II", "비즈니스영어"]),
+    ("탐구", "사회", ["통합사회", "한국사"]),
+    ("탐구", "과학", ["통합과학"]),
+    ("체육·예술", "체육", ["체육", "스포츠 생활"]),
+    ("체육·예술", "예술", ["음악", "미술"]),
+    ("전공필수", "고시과목", ["회계 원리", "세무 일반", "기업 자원 통합 관리", "무역 실무", "원산지 관리"]),
+    ("전공필수", "고시외과목", ["관세 실무", "예산 회계", "빅데이터 분석", "프로그래밍"]),
+]
+_GRADE_SLOTS = {}   # 학년 → [(열, 학과, 학기)]
+for _col, _grade, _track, _sem in COL_MAP:
+    _GRADE_SLOTS.setdefault(_grade, []).append((_col, _track, _sem))
+
+
+def sheet_years(sheets=None):
+    """
+    입학년도 시트 수 → (단위배당표 입학년도, 교과배정표 학년도)
+    학년도는 입학년도 다음 해부터 한 해 더 (기본 3 → 2024~2026 / 2025~2028), None 이면 기본 연도
+    """
+    if sheets is None:
+        return list(CURRICULUM_YEARS), list(ALLOCATION_YEARS)
+    first = CURRICULUM_YEARS[0]
+    return list(range(first, first + sheets)), list(range(first + 1, first + sheets + 2))
+
+
+def synth_profile(sheets=None):
+    """합성 엑셀의 모든 학년도 시트를 읽는 학교 프로필"""
+    entry_years, school_years = sheet_years(sheets)
+    return SchoolProfile("synth", "합성 데이터", entry_years=entry_years, school_years=school_years)
+
+
+_SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+_GIVEN = "민서지현수영준우진혜윤경희선미은동찬종"
+
+
+def _teacher_name(rng, i):
+    return rng.choice(_SURNAMES) + rng.choice(_GIVEN) + rng.choice(_GIVEN) + (str(i // 400) if i >= 400 else "")
+
+
+def _junk_sheets(wb, n, rng):
+    """파싱 대상이 아닌 시트 (안내·인쇄용 등) — 읽기 전용 파서가 건너뛰는지 확인용"""
+    for j in range(n):
+        ws = wb.create_sheet(f"인쇄용{j + 1}")
+        for r in range(200):
+            ws.append([rng.randint(0, 99) for _ in range(40)])
+
+
+# ── 단위배당표 ─────────────────────────────────────────────────────────────────
+def curriculum_workbook(path, scale=1, years=CURRICULUM_YEARS, junk_sheets=2, seed=0):
+    """단위배당표 xlsx 생성. 입학년도(years) 시트당 과목 SUBJECTS_PER_COHORT × scale 개"""
+    rng = random.Random(seed)
+    wb = Workbook()
+    wb.active.title = "표지"
+    wb.active.append(["교육과정 단위배당표"])
+
+    n_subjects = SUBJECTS_PER_COHORT * scale
+    for ey in years:
+        ws = wb.create_sheet(f"{ey}입학 단위배당표")
+        ws.append([f"{ey}학년도 입학생 교육과정 단위배당표"])
+        ws.append(["교과 영역", "교과(군)", None, None, "과목", "기준\n학점", "운영\n학점"]
+                  + [g for _, g, _, _ in COL_MAP for _ in (0, 1)])
+        ws.append([None] * 7 + [t for _, _, t, _ in COL_MAP for _ in (0, 1)])
+        ws.append([None] * 7 + [s for _, _, _, s in COL_MAP for _ in (0, 1)])
+        ws.append(["보통 교과 (군)"])
+
+        for i in range(n_subjects):
+            area, group, names = _AREAS[i * len(_AREAS) // n_subjects]
+            row = [None] * (COL_MAP[-1][0] + 2)
+            if i == 0 or _AREAS[(i - 1) * len(_AREAS) // n_subjects][1] != group:
+                row[0], row[1] = area + ("\n" if rng.random() < 0.3 else ""), group   # 병합 셀 첫 행만 값
+            row[4] = f"{rng.choice(names)}{i // len(names) + 1}" + ("\xa0" if rng.random() < 0.1 else "")
+            grade = "1학년" if group in ("국어", "수학", "영어", "사회", "과학") and rng.random() < 0.6 \
+                else rng.choice(["2학년", "3학년"])
+            total = 0
+            for col, _, _ in rng.sample(_GRADE_SLOTS[grade], k=min(2, len(_GRADE_SLOTS[grade]))):
+                v = rng.choice([2, 3, 4])
+                row[col] = v if rng.random() < 0.8 else f"{v} "   # 문자열·공백 섞인 셀
+                total += v
+            row[5], row[6] = total, float(total) if rng.random() < 0.5 else str(total)
+            ws.append(row)
+            if rng.random() < 0.05:
+                ws.append(["소계", None, None, None, None, 10, 10] + [4] * 27)
+        ws.append(["합계", None, None, None, "학점 합계", 192, 192])
+
+    _junk_sheets(wb, junk_sheets, rng)
+    wb.save(path)
+    return Path(path)
+
+
+# ── 교과배정표 ─────────────────────────────────────────────────────────────────
+def allocation_workbook(path, scale=1, years=ALLOCATION_YEARS, junk_sheets=2, seed=0):
+    """교과배정표 xlsx 생성. 학년도(years) 시트당 교사 TEACHERS_PER_YEAR × scale 명"""
+    rng = random.Random(seed)
+    wb = Workbook()
+    wb.active.title = "안내"
+    wb.active.append(["교과배정표 작성 안내"])
+
+    keywords = list(DEPT_KEYWORD_MAP)
+    n_teachers = TEACHERS_PER_YEAR * scale
+    for year in years:
+        ws = wb.create_sheet(str(year))
+        ws.append([f"{year}학년도 교과배정표"])
+        ws.append(["구분", "교사", "과목"] + [None] * 25 + ["계"])
+        t = 0
+        while t < n_teachers:
+            n_group = min(rng.randint(2, 6), n_teachers - t)
+            subjects = [f"{rng.choice(keywords)} {k + 1}" for k in range(rng.randint(1, 4))]
+            hours = [rng.randint(8, 20) for _ in range(n_group)]
+            for k, sn in enumerate(subjects):
+                row = [None] * 30
+                row[2], row[28] = sn, (sum(hours) if k == 0 else None)
+                ws.append(row)
+            for h in hours:
+                row = [None] * 30
+                row[1], row[28] = _teacher_name(rng, t), h
+                row[rng.randint(3, 27)] = h
+                ws.append(row)
+                t += 1
+            row = [None] * 30
+            row[2] = rng.randint(1, 8)   # 반 번호 행 (과목 아님)
+            ws.append(row)
+
+    _junk_sheets(wb, junk_sheets, rng)
+    wb.save(path)
+    return Path(path)
+
+
+# ── 교원정보 양식 ──────────────────────────────────────────────────────────────
+def teacher_form_workbook(path, scale=1, years=ALLOCATION_YEARS[1:3], seed=0):
+    """교원정보 양식 xlsx 생성. 학년도(years)당 교사 TEACHERS_PER_YEAR × scale 명"""
+    rng = random.Random(seed)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "교원정보"
+    ws.append(["교원정보 입력양식"])
+    ws.append(["※ 학년도별로 한 행씩 입력"])
+    ws.append([])
+    ws.append(["No", "교사명", "교원유형", "소속교과", "기본시수", "주요과목", "상치교과", "상치과목", "상치시수", "학년도", "메모"])
+    ws.append(["No.", "예) 홍길동"])
+
+    depts = sorted(set(DEPT_KEYWORD_MAP.values()))
+    no = 0
+    for year in years:
+        for t in range(TEACHERS_PER_YEAR * scale):
+            no += 1
+            dept = rng.choice(depts)
+            cross = rng.random() < 0.15
+            ws.append([
+                no, _teacher_name(rng, t), rng.choice(["정교사", "정교사", "정교사", "기간제교사", "시간강사"]),
+                dept, rng.randint(10, 20), rng.choice(list(DEPT_KEYWORD_MAP)),
+                rng.choice([d for d in depts if d != dept]) if cross else "없음",
+                rng.choice(list(DEPT_KEYWORD_MAP)) if cross else None,
+                rng.randint(2, 6) if cross else None,
+                year, None,
+            ])
+    wb.save(path)
+    return Path(path)
+
+
+def write_set(out_dir, scale=1, junk_sheets=2, seed=0, sheets=None):
+    """
+    폴더에 세 종류 파일 생성 (ingest.py 가 인식하는 파일명) → {종류: 경로}
+    sheets: 입학년도 시트 수 (sheet_years 참고, None 이면 기본 연도)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    entry_years, school_years = sheet_years(sheets)
+    return {
+        "curriculum": curriculum_workbook(out_dir / f"단위배당표_x{scale}.xlsx", scale, entry_years,
+                                          junk_sheets=junk_sheets, seed=seed),
+        "allocation": allocation_workbook(out_dir / f"교과배정표_x{scale}.xlsx", scale, school_years,
+                                          junk_sheets=junk_sheets, seed=seed),
+        "teacher_form": teacher_form_workbook(out_dir / f"교원정보_x{scale}.xlsx", scale, school_years[1:3], seed=seed),
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="벤치마크용 합성 엑셀 생성")
+    ap.add_argument("out", help="출력 폴더")
+    ap.add_argument("--scale", type=int, default=1, help="과목·교사 수 배수")
+    ap.add_argument("--junk", type=int, default=2, help="파싱 대상이 아닌 시트 수")
+    ap.add_argument("--sheets", type=int, help="입학년도 시트 수 (교과배정표는 한 개 더, 기본 3)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    for kind, path in write_set(args.out, args.scale, args.junk, args.seed, args.sheets).items():
+        print(f"{kind}: {path}")
@@ -0,0 +1,61 @@
+"""assign.py — 상치교과 배정 제약 테스트"""
+import random
+
+import pytest
+
+from assign import MAX_LOAD, propose
+
+DEPTS = ["국어과", "수학과", "영어과", "상업과"]
+SEMS = ["1학기", "2학기"]
+
+
+def _instance(seed):
+    rng = random.Random(seed)
+    teachers = [{"name": f"교사{i}", "dept": rng.choice(DEPTS), "total_credits": rng.randint(1, 17),
+                 "cross_dept": rng.choice(DEPTS + ["없음"]), "main_subjects": ""}
+                for i in range(rng.randint(1, 12))]
+    deficits = {(d, s): rng.randint(1, 20) for d in DEPTS for s in SEMS if rng.random() < 0.6}
+    return teachers, deficits
+
+
+def _hours_by(rows, sems, key):
+    """배정 행 → {key(행): {학기: 시수}} ('연간' 은 모든 학기에 같은 시수)"""
+    out = {}
+    for r in rows:
+        for sem in (sems if r["학기"] == "연간" else [r["학기"]]):
+            by_sem = out.setdefault(key(r), {})
+            by_sem[sem] = by_sem.get(sem, 0) + r["시수"]
+    return out
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_proposal_respects_capacity_and_deficit(seed):
+    teachers, deficits = _instance(seed)
+    rows, summary = propose(teachers, deficits)
+    sems = sorted({s for _, s in deficits})
+    load = {t["name"]: t["total_credits"] for t in teachers}
+
+    for name, by_sem in _hours_by(rows, sems, lambda r: r["교사명"]).items():
+        for hours in by_sem.values():
+            assert hours <= MAX_LOAD - load[name]            # 교사·학기마다 max_load − 현재 시수 이내
+    for dept, by_sem in _hours_by(rows, sems, lambda r: r["상치담당과목"].split(" / ")[0]).items():
+        for sem, hours in by_sem.items():
+            assert hours <= deficits[(dept, sem)]            # 교과·학기마다 부족 시수 이내
+
+    assert 0 <= summary["covered"] <= summary["deficit"] == sum(deficits.values())
+    assert summary["remaining"] == summary["deficit"] - summary["covered"]
+    assert sum(h for by_sem in _hours_by(rows, sems, lambda r: r["교사명"]).values()
+               for h in by_sem.values()) == summary["covered"]
+
+
+def test_expired_time_budget_returns_empty_plan():
+    teachers, deficits = _instance(7)
+    rows, summary = propose(teachers, deficits, time_budget=-1)
+    assert not summary["complete"] and summary["covered"] == 0 and rows == []
+
+
+def test_covers_up_to_donor_capacity():
+    teachers = [{"name": "가", "dept": "국어과", "total_credits": 10, "cross_dept": "상업과"},
+                {"name": "나", "dept": "수학과", "total_credits": 16, "cross_dept": "상업과"}]   # 14 이상: 후보 아님
+    rows, summary = propose(teachers, {("상업과", "1학기"): 20})
+    assert summary["covered"] == MAX_LOAD - 10 and {r["교사명"] for r in rows} == {"가"}
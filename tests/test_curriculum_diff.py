@@ -0,0 +1,18 @@
+"""curriculum_diff.py — 비교 표 회귀 테스트"""
+from curriculum_diff import credit_table, subject_table
+
+OLD = [{"entry_year": 2026, "group": "국어", "name": "문학", "op_credits": 4,
+        "schedule": {"2학년|세무회계|1학기": 2, "2학년|세무회계|2학기": 2}}]
+NEW = [{"entry_year": 2026, "group": "국어", "name": "문학", "op_credits": 4,
+        "schedule": {"2학년|세무회계|1학기": 4, "2학년|세무회계": 1}}]     # 2단 키: 잘못된 편성 키
+
+
+def test_credit_table_skips_malformed_keys():
+    df = credit_table(OLD, NEW)
+    assert df[["학년", "학과", "학기", "증감"]].values.tolist() == [
+        ["2학년", "세무회계", "1학기", 2], ["2학년", "세무회계", "2학기", -2]]
+
+
+def test_subject_table_delta_is_schedule_sum():
+    df = subject_table(OLD, NEW)
+    assert df["증감"].tolist() == [1]       # (4 + 1) - (2 + 2)
@@ -0,0 +1,19 @@
+"""incremental.py — 변경 내역 회귀 테스트"""
+from incremental import teacher_diff
+
+
+def _temps(*hours):
+    return [{"name": "기간제", "dept": "상업과", "total_credits": h} for h in hours]
+
+
+def test_duplicate_temp_teachers_hours_change():
+    old = {"2026": _temps(10, 12)}
+    new = {"2026": _temps(10, 14)}
+    rows = teacher_diff(old, new)
+    assert [(r["구분"], r["이름"], r["내용"]) for r in rows] == [("시수 변경", "기간제", "12 → 14")]
+
+
+def test_duplicate_temp_teachers_added_and_removed():
+    assert [r["구분"] for r in teacher_diff({"2026": _temps(10)}, {"2026": _temps(10, 12)})] == ["교사 추가"]
+    rows = teacher_diff({"2026": _temps(10, 12)}, {"2026": _temps(10)})
+    assert [(r["구분"], r["내용"]) for r in rows] == [("교사 삭제", "12시수")]
@@ -0,0 +1,49 @@
+"""parser.py — 연도별 운영 현황 회귀 테스트"""
+from curriculum_index import CurriculumIndex
+from parser import build_guidance_2027, build_index, build_yearly_views, update_yearly_views
+
+YEARS = [2025, 2026, 2027]
+CURRICULUM = [
+    {"entry_year": 2024, "area": "기초", "group": "국어", "name": "문학", "std_credits": 4, "op_credits": 4,
+     "schedule": {"2학년|세무회계|1학기": 2, "2학년|신설학과|1학기": 3}},      # 신설학과: COL_MAP 에 없는 학과
+    {"entry_year": 2025, "area": "전공필수", "group": "고시외과목", "name": "인공지능 기초", "std_credits": 3,
+     "op_credits": 3, "schedule": {"2학년|신설학과|2학기": 3}},                  # 축 밖 키만 있는 과목
+    {"entry_year": 2025, "area": "기초", "group": "수학", "name": "공통수학1", "std_credits": 4, "op_credits": 4,
+     "schedule": {"1학년|공통|1학기": 4}},
+]
+
+
+def _tracks(views, sy, name):
+    return next(it["tracks"] for it in views[str(sy)] if it["name"] == name)
+
+
+def test_off_axis_track_kept_in_yearly_views():
+    views = build_yearly_views(YEARS, CURRICULUM, build_index(CURRICULUM))
+    assert _tracks(views, 2025, "문학") == {"세무회계_1학기": 2, "신설학과_1학기": 3}
+    assert _tracks(views, 2026, "인공지능 기초") == {"신설학과_2학기": 3}
+    # 축을 데이터에서 만든 색인(모든 학과 포함)과 결과가 같아야 함
+    assert views == build_yearly_views(YEARS, CURRICULUM, CurriculumIndex(CURRICULUM))
+
+
+def test_off_axis_track_kept_in_partial_update():
+    index = build_index(CURRICULUM)
+    views = build_yearly_views(YEARS, CURRICULUM, index)
+    assert update_yearly_views({sy: list(items) for sy, items in views.items()}, CURRICULUM, 2025, index) == views
+
+
+def test_off_axis_track_lookup():
+    index = build_index(CURRICULUM)
+    assert index.credit(0, "2학년", "신설학과", "1학기") == 3
+    assert index.lookup(2025, "2학년", "신설학과", "2학기") == [(1, 3)]
+    assert index.grade_totals[(2024, "2학년")] == 5
+
+
+def test_off_axis_track_kept_in_guidance():
+    curriculum = CURRICULUM + [
+        {"entry_year": 2026, "area": "전공필수", "group": "고시외과목", "name": "데이터 분석", "std_credits": 3,
+         "op_credits": 3, "schedule": {"2학년|세무회계|1학기": 2, "2학년|신설학과|2학기": 3}},
+    ]
+    rows = build_guidance_2027(curriculum)
+    got = [(r["name"], r["grade"], r["track"], r["sem"], r["credits"]) for r in rows]
+    assert got == [("데이터 분석", "2학년", "세무회계", "1학기", 2), ("데이터 분석", "2학년", "신설학과", "2학기", 3)]
+    assert rows == build_guidance_2027(curriculum, CurriculumIndex(curriculum))
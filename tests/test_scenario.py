@@ -0,0 +1,41 @@
+"""scenario.py — 시나리오 증분 계산 회귀 테스트"""
+import pandas as pd
+
+from demand import demand_supply
+from scenario import Scenario, ScenarioEngine, materialize
+
+YEARS = [2025, 2026]
+CURRICULUM = [
+    {"entry_year": 2024, "area": "기초", "group": "국어", "name": "문학", "std_credits": 4, "op_credits": 4,
+     "schedule": {"2학년|세무회계|1학기": 2, "3학년|세무회계|1학기": 2}},
+    {"entry_year": 2025, "area": "기초", "group": "수학", "name": "공통수학1", "std_credits": 4, "op_credits": 4,
+     "schedule": {"1학년|공통|1학기": 4}},
+]
+TEACHERS = {
+    "2025": [{"name": "가", "dept": "국어과", "total_credits": 16}],
+    "2026": [{"name": "나", "dept": "수학과", "total_credits": 18}],
+}
+
+
+def _reference(engine, scenario):
+    curriculum, counts, teachers = materialize(scenario, CURRICULUM, TEACHERS, engine.class_counts)
+    ref = demand_supply(curriculum, teachers, YEARS, scenarios={scenario.name: counts})
+    return ref.sort_values(["school_year", "dept", "sem"]).reset_index(drop=True)
+
+
+def test_new_dept_does_not_break_later_class_change():
+    engine = ScenarioEngine(CURRICULUM, TEACHERS, YEARS)
+    n_depts = len(engine.depts)
+
+    new_dept = Scenario("정보과 추가")
+    new_dept.add_teacher(2026, {"name": "다", "dept": "정보과", "total_credits": 10})
+    engine.evaluate(new_dept)
+    assert len(engine.depts) == n_depts          # 엔진(캐시 공유) 상태는 그대로
+
+    fewer = Scenario("반 감축", classes={("3학년", "세무회계"): 1})
+    engine.evaluate(fewer)                       # 이전에는 broadcast ValueError
+
+    df = engine.compare([new_dept, fewer], include_base=False)
+    for sc in (new_dept, fewer):
+        got = df[df["scenario"] == sc.name].sort_values(["school_year", "dept", "sem"]).reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, _reference(engine, sc), check_dtype=False)
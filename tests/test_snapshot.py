@@ -0,0 +1,73 @@
+"""snapshot.py — 스냅샷 ↔ JSON 변환 테스트"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from snapshot import json_to_snapshot, load_data, load_snapshot, newest_data_file, snapshot_to_json, write_snapshot
+
+DATA = {
+    "curriculum": [
+        {"entry_year": 2025, "area": "기초", "group": "국어", "name": "공통국어1", "std_credits": 4, "op_credits": 4.0,
+         "schedule": {"1학년|공통|1학기": 4}},
+        {"entry_year": 2025, "area": "", "group": "", "name": "화법과 작문 Ⅱ", "std_credits": 0, "op_credits": 0.5,
+         "schedule": {}},                                                     # 빈 문자열·빈 schedule
+        {"entry_year": 2026, "area": "전공필수", "group": "고시과목", "name": "회계 원리", "std_credits": 3,
+         "op_credits": 3.0, "schedule": {"2학년|세무회계|1학기": 3, "2학년|관세무역|2학기": 2}},
+    ],
+    "teachers": {
+        "2026": [
+            {"name": "김민서", "dept": "국어과", "total_credits": 16, "is_temp": False},
+            {"name": "기간제", "dept": "상업과", "total_credits": 12, "is_temp": True, "notes": "🙂 육아휴직 대체"},
+        ],
+        "2027": [],                                                           # 빈 학년도
+    },
+    "dept_groups": {"2026": [{"dept": "상업과", "subjects": ["회계 원리", "세무 일반"]}]},   # 리스트 값 (json)
+    "yearly_view": {"2026": [{"name": "회계 원리", "grade": "2학년", "tracks": {"세무회계_1학기": 3},
+                              "weekly_credits": 3, "big": 2 ** 40}]},
+    "guidance": [],
+    "meta": {"parser_version": 3, "inputs": {"단위배당표.xlsx": "abc"}, "note": ""},
+}
+
+
+def _normal(data):
+    return json.loads(json.dumps(data, ensure_ascii=False))
+
+
+def test_snapshot_json_round_trip(tmp_path):
+    src = tmp_path / "data.json"
+    src.write_text(json.dumps(DATA, ensure_ascii=False), encoding="utf-8")
+    json_to_snapshot(src, tmp_path / "data.snap")
+    snapshot_to_json(tmp_path / "data.snap", tmp_path / "back.json")
+    back = json.loads((tmp_path / "back.json").read_text(encoding="utf-8"))
+    assert back == _normal(DATA)
+    assert list(back) == list(DATA)
+    assert list(back["curriculum"][2]["schedule"]) == ["2학년|세무회계|1학기", "2학년|관세무역|2학기"]
+
+
+def test_partial_reads(tmp_path):
+    write_snapshot(DATA, tmp_path / "data.snap")
+    got = load_snapshot(tmp_path / "data.snap", tables=["curriculum", "meta"], years=[2026])
+    assert sorted(got) == ["curriculum", "meta"]
+    assert _normal(got["curriculum"]) == _normal(DATA["curriculum"][2:])
+    assert _normal(load_data(tmp_path / "data.snap", tables=["teachers"])) == {"teachers": _normal(DATA["teachers"])}
+
+
+@pytest.mark.skipif(not (Path(__file__).parent.parent / "data" / "curriculum_data.json").exists(),
+                    reason="기본 데이터 없음")
+def test_default_data_round_trip(tmp_path):
+    src = Path(__file__).parent.parent / "data" / "curriculum_data.json"
+    json_to_snapshot(src, tmp_path / "data.snap")
+    assert _normal(load_snapshot(tmp_path / "data.snap")) == load_data(src)
+
+
+def test_newest_data_file(tmp_path):
+    j, s = tmp_path / "curriculum_data.json", tmp_path / "curriculum_data.snap"
+    assert newest_data_file(j) == j
+    j.write_text("{}", encoding="utf-8")
+    write_snapshot({}, s)
+    os.utime(j, ns=(1_000_000_000, 1_000_000_000))
+    assert newest_data_file(j) == s
+    os.utime(j, ns=(s.stat().st_mtime_ns + 1, s.stat().st_mtime_ns + 1))
+    assert newest_data_file(j) == j
@@ -0,0 +1,72 @@
+"""storage.py — 편집 저널 저장·재적용·압축 테스트 (JSON 백엔드)"""
+import copy
+import json
+
+import pytest
+
+import storage
+
+
+@pytest.fixture
+def edits_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "BACKEND", "json")
+    monkeypatch.setattr(storage, "EDITS_PATH", tmp_path / "edits.json")
+    monkeypatch.setattr(storage, "JOURNAL_PATH", tmp_path / "edits.journal.jsonl")
+    monkeypatch.setattr(storage, "_saved_state", None)
+    monkeypatch.setattr(storage, "_journal_len", 0)
+    return tmp_path
+
+
+def _reload():
+    """다른 프로세스에서 새로 불러오는 것처럼 메모리 상태를 비우고 읽기"""
+    storage._saved_state = None
+    storage._journal_len = 0
+    return storage.load_edits()
+
+
+EDITS = {
+    "cross_teaching": {"2026": [{"교사명": "김민서", "시수": 3}, {"교사명": "기간제", "시수": 4}]},
+    "teacher_memos": {"2026": "세무회계 1반 증설 검토"},
+    "checklist": [{"done": False, "text": "교과협의회"}],
+}
+
+
+def test_save_reload_round_trip(edits_dir):
+    edits = copy.deepcopy(EDITS)
+    assert storage.save_edits(edits)
+    assert _reload() == edits
+
+    edits["cross_teaching"]["2026"] = edits["cross_teaching"]["2026"][:1]     # 행 삭제 (len)
+    edits["cross_teaching"]["2026"][0]["시수"] = 5                              # 값 변경
+    del edits["teacher_memos"]                                                  # 섹션 삭제
+    edits["checklist"].append({"done": True, "text": "시간표 확정"})             # 행 추가
+    assert storage.save_edits(edits)
+    assert _reload() == edits
+    assert not (edits_dir / "edits.json").exists()        # 아직 저널만 있음
+
+
+def test_unchanged_save_writes_nothing(edits_dir):
+    storage.save_edits(copy.deepcopy(EDITS))
+    size = (edits_dir / "edits.journal.jsonl").stat().st_size
+    storage.save_edits(copy.deepcopy(EDITS))
+    assert (edits_dir / "edits.journal.jsonl").stat().st_size == size
+
+
+def test_compaction_keeps_state(edits_dir, monkeypatch):
+    monkeypatch.setattr(storage, "COMPACT_EVERY", 5)
+    edits = copy.deepcopy(EDITS)
+    for i in range(8):
+        edits["teacher_memos"]["2026"] = f"메모 {i}"
+        assert storage.save_edits(edits)
+    assert storage._journal_len < 5
+    with open(edits_dir / "edits.json", encoding="utf-8") as f:
+        assert json.load(f)["checklist"] == EDITS["checklist"]
+    assert _reload() == edits
+
+
+def test_broken_last_journal_line_is_dropped(edits_dir):
+    storage.save_edits(copy.deepcopy(EDITS))
+    with open(edits_dir / "edits.journal.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"path": ["teacher_memos", "2026"], "val')       # 쓰다 만 줄
+    assert _reload() == EDITS
+    assert (edits_dir / "edits.journal.jsonl").read_text(encoding="utf-8") == ""     # 읽으면서 압축
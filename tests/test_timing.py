@@ -0,0 +1,33 @@
+"""timing.py — 세션별 기록 테스트"""
+import threading
+
+import timing
+
+
+def _run(session, on, names):
+    def work():
+        timing.bind(session)
+        timing.enable(on)
+        for name in names:
+            with timing.stage(name):
+                pass
+    th = threading.Thread(target=work)
+    th.start()
+    th.join()
+
+
+def _stages(session):
+    out = []
+    th = threading.Thread(target=lambda: (timing.bind(session), out.extend(r["stage"] for r in timing.records())))
+    th.start()
+    th.join()
+    return out
+
+
+def test_sessions_do_not_share_flag_or_buffer():
+    _run("a", True, ["parse", "render"])
+    _run("b", False, ["parse"])
+    _run("c", True, ["export"])
+    assert _stages("a") == ["parse", "render"]
+    assert _stages("b") == []
+    assert _stages("c") == ["export"]
@@ -0,0 +1,125 @@
+"""
+timing.py — 단계별 소요 시간 기록 (성능 진단용)
+워크북 읽기·시트 파싱·뷰 계산·탭 렌더링·편집 저장 등 단계마다 걸린 시간을
+최근 BUFFER_MAX 건까지 순환 버퍼에 쌓는다. 앱 사이드바 '성능 진단'에서 확인·JSON 내보내기.
+
+꺼져 있을 때는 기록하지 않고 바로 통과 (stage 는 공용 빈 컨텍스트, timed 는 플래그 확인 한 번).
+켜기: 환경변수 TIMING=1 (모든 세션 기본값) 또는 enable(True)
+
+세션 단위 — Streamlit 은 세션마다 스크립트를 자기 스레드에서 실행하므로, 앱은 실행 시작 때
+bind(세션 id) 로 이 스레드의 세션을 정한다. 켜기/끄기와 버퍼는 세션마다 따로라서
+한 사용자가 진단을 켜도 다른 세션은 기록하지 않고, 기록도 섞이지 않는다.
+bind 하지 않은 곳(CLI·bench)은 세션 None 하나를 쓴다.
+프로세스 풀 작업(시트 병렬 파싱) 안의 기록은 모이지 않는다.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+BUFFER_MAX = 2000   # 세션당
+
+_default = os.environ.get("TIMING", "0") == "1"
+_enabled = {}       # 세션 id → 켜짐 여부 (없으면 _default)
+_buffers = {}       # 세션 id → 순환 버퍼
+_local = threading.local()
+_NULL = nullcontext()
+
+
+def bind(session):
+    """이 스레드(= Streamlit 스크립트 실행)의 기록을 session 에 모음"""
+    _local.session = session
+
+
+def _session():
+    return getattr(_local, "session", None)
+
+
+def enable(on=True):
+    """현재 세션의 기록 켜기/끄기"""
+    _enabled[_session()] = bool(on)
+
+
+def is_enabled():
+    return _enabled.get(_session(), _default)
+
+
+def _record(name, t0, info):
+    buf = _buffers.get(_session())
+    if buf is None:
+        buf = _buffers.setdefault(_session(), deque(maxlen=BUFFER_MAX))
+    buf.append({"stage": name, "at": time.time(), "ms": round((time.perf_counter() - t0) * 1000, 3), **info})
+
+
+@contextmanager
+def _timing(name, info):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, t0, info)
+
+
+def stage(name, **info):
+    """with stage("read_workbook", sheets=3): … — 블록 소요 시간 기록 (info 는 함께 저장할 값)"""
+    return _timing(name, info) if is_enabled() else _NULL
+
+
+def mark():
+    """구간 시작 시각 (꺼져 있으면 None) — with 블록으로 감싸기 어려운 구간용, since() 와 짝"""
+    return time.perf_counter() if is_enabled() else None
+
+
+def since(name, t0, **info):
+    """mark() 이후 소요 시간 기록 (t0 가 None 이면 무시)"""
+    if t0 is not None:
+        _record(name, t0, info)
+
+
+def timed(name):
+    """함수 호출 시간 기록 데코레이터"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record(name, t0, {})
+        return wrapper
+    return deco
+
+
+def records():
+    """현재 세션 기록 목록 (오래된 순)"""
+    return list(_buffers.get(_session(), ()))
+
+
+def clear():
+    _buffers.pop(_session(), None)
+
+
+def summary():
+    """현재 세션 단계별 집계 → [{stage, count, total_ms, mean_ms, max_ms, last_ms}] (총 시간 큰 순)"""
+    agg = {}
+    for r in records():
+        a = agg.setdefault(r["stage"], {"stage": r["stage"], "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        a["count"] += 1
+        a["total_ms"] += r["ms"]
+        a["max_ms"] = max(a["max_ms"], r["ms"])
+        a["last_ms"] = r["ms"]
+    out = sorted(agg.values(), key=lambda a: -a["total_ms"])
+    for a in out:
+        a["total_ms"] = round(a["total_ms"], 3)
+        a["mean_ms"] = round(a["total_ms"] / a["count"], 3)
+    return out
+
+
+def export_json():
+    """현재 세션 버퍼 전체 → JSON 문자열 (집계 포함)"""
+    return json.dumps({"summary": summary(), "records": records()}, ensure_ascii=False, indent=2)